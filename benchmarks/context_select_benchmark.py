@@ -0,0 +1,382 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""Headless Context Select benchmarks.
+
+Generates grids, cylinders, tori, capped (pole) spheres and wire circles at several sizes and times loop, ring and
+bounded selections through the add-on's real context_*_select functions. Results are written as JSON.
+
+    blender --background --factory-startup --python benchmarks/context_select_benchmark.py -- \\
+        --sizes 1000 16000 250000 --repeat 5 --output context_select_bench.json
+
+With --labeling-processes it also times labeling every loop and ring of each mesh (what bounded selections start
+with) in each number of processes, and reports the smallest size where splitting it across processes pays off:
+
+    blender --background --factory-startup --python benchmarks/context_select_benchmark.py -- \\
+        --meshes GRID TORUS --sizes 16000 62500 250000 1000000 --labeling-processes 1 2 4 8 --only-labeling
+
+--addon picks the add-on module to time, so older versions can be compared against the same cases. It is looked up
+in Blender's add-on paths and in the root of this checkout, where the single file ContextSelect.py of versions
+before the context_select package would be:
+
+    blender --background --factory-startup --python benchmarks/context_select_benchmark.py -- --addon ContextSelect
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+
+import addon_utils
+import bmesh
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ADDON = "context_select"
+DEFAULT_SIZES = [1000, 16000, 250000, 1000000, 4000000]
+MESH_KINDS = ['GRID', 'CYLINDER', 'TORUS', 'POLES', 'WIRE']
+VERT, EDGE, FACE = (True, False, False), (False, True, False), (False, False, True)
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Benchmark Context Select on generated meshes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Approximate face counts (vertex counts for wire circles)")
+    parser.add_argument("--meshes", nargs="+", default=MESH_KINDS, choices=MESH_KINDS)
+    parser.add_argument("--repeat", type=int, default=5, help="Warm runs per case, after the cold run")
+    parser.add_argument("--output", default="context_select_bench.json")
+    parser.add_argument("--labeling-processes", type=int, nargs="+", default=[],
+                        help="Process counts to time whole-mesh loop and ring labeling in")
+    parser.add_argument("--only-labeling", action="store_true", help="Skip the selection cases")
+    parser.add_argument("--addon", default=ADDON,
+                        help="Module name of the add-on to benchmark, e.g. ContextSelect for versions before the "
+                             "context_select package")
+    return parser.parse_args(argv)
+
+
+# ##################### Mesh Generation ##################### #
+
+class QuadLayout:
+    """Index arithmetic for the generated quad surfaces, so cases can pick components without searching."""
+
+    def __init__(self, rows, cols, wrap_rows, wrap_cols):
+        self.rows = rows
+        self.cols = cols
+        self.wrap_rows = wrap_rows
+        self.wrap_cols = wrap_cols
+        self.vert_rows = rows if wrap_rows else rows + 1
+        self.vert_cols = cols if wrap_cols else cols + 1
+
+    def vert(self, r, c):
+        return (r % self.vert_rows) * self.vert_cols + (c % self.vert_cols)
+
+    def face(self, r, c):
+        return (r % self.rows) * self.cols + (c % self.cols)
+
+
+def quad_surface(rows, cols, wrap_rows, wrap_cols):
+    layout = QuadLayout(rows, cols, wrap_rows, wrap_cols)
+    r, c = np.meshgrid(np.arange(layout.vert_rows), np.arange(layout.vert_cols), indexing='ij')
+    if wrap_rows and wrap_cols:  # Torus
+        u = 2 * math.pi * c / cols
+        v = 2 * math.pi * r / rows
+        co = np.stack(((2 + np.cos(v)) * np.cos(u), (2 + np.cos(v)) * np.sin(u), np.sin(v)), axis=-1)
+    elif wrap_cols:  # Cylinder
+        u = 2 * math.pi * c / cols
+        co = np.stack((np.cos(u), np.sin(u), r / rows * 2.0 - 1.0), axis=-1)
+    else:  # Grid
+        co = np.stack((c / cols, r / rows, np.zeros_like(r, dtype=float)), axis=-1)
+
+    fr, fc = np.meshgrid(np.arange(rows), np.arange(cols), indexing='ij')
+    corners = np.stack((layout.vert(fr, fc), layout.vert(fr, fc + 1),
+                        layout.vert(fr + 1, fc + 1), layout.vert(fr + 1, fc)), axis=-1)
+    return layout, co.reshape(-1, 3), corners.reshape(-1, 4)
+
+
+# Cylinder closed with a triangle fan pole at each end, like a UV sphere.
+def pole_surface(rows, cols):
+    layout, co, quads = quad_surface(rows, cols, False, True)
+    co = co.copy()
+    ring = np.arange(layout.vert_cols)
+    radius = np.sqrt(1.0 - 0.9 * co[:, 2] ** 2)  # Pinch the ends in towards the poles.
+    co[:, 0] *= radius
+    co[:, 1] *= radius
+    poles = len(co) + np.arange(2)
+    co = np.vstack((co, [[0, 0, -1.2], [0, 0, 1.2]]))
+    bottom = np.stack((ring, np.full_like(ring, poles[0]), np.roll(ring, -1)), axis=-1)
+    top_ring = ring + rows * layout.vert_cols
+    top = np.stack((top_ring, np.roll(top_ring, -1), np.full_like(ring, poles[1])), axis=-1)
+    return layout, co, [quads, bottom, top]
+
+
+def build_mesh(name, co, face_blocks=(), edges=None):
+    me = bpy.data.meshes.new(name)
+    me.vertices.add(len(co))
+    me.vertices.foreach_set("co", np.ascontiguousarray(co, dtype=np.float32).ravel())
+    if edges is not None:
+        me.edges.add(len(edges))
+        me.edges.foreach_set("vertices", np.ascontiguousarray(edges, dtype=np.int32).ravel())
+    blocks = [np.asarray(b, dtype=np.int32) for b in face_blocks]
+    if blocks:
+        loop_verts = np.concatenate([b.ravel() for b in blocks])
+        sizes = np.concatenate([np.full(len(b), b.shape[1], dtype=np.int32) for b in blocks])
+        starts = np.cumsum(sizes) - sizes
+        me.loops.add(len(loop_verts))
+        me.loops.foreach_set("vertex_index", loop_verts)
+        me.polygons.add(len(sizes))
+        me.polygons.foreach_set("loop_start", starts.astype(np.int32))
+        try:
+            me.polygons.foreach_set("loop_total", sizes)
+        except (AttributeError, TypeError, RuntimeError):
+            pass  # Read-only in newer Blender versions, where the loop starts alone define the faces.
+    me.update(calc_edges=True)
+    me.validate()
+    obj = bpy.data.objects.new(name, me)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def generate(kind, size):
+    if kind == 'WIRE':
+        n = max(size, 8)
+        angle = np.linspace(0, 2 * math.pi, n, endpoint=False)
+        co = np.stack((np.cos(angle), np.sin(angle), np.zeros(n)), axis=-1)
+        edges = np.stack((np.arange(n), np.roll(np.arange(n), -1)), axis=-1)
+        return build_mesh("bench_wire", co, edges=edges), QuadLayout(1, n, False, True)
+    side = max(int(math.sqrt(size)), 8)
+    if kind == 'GRID':
+        layout, co, faces = quad_surface(side, side, False, False)
+    elif kind == 'CYLINDER':
+        layout, co, faces = quad_surface(side, side, False, True)
+    elif kind == 'TORUS':
+        layout, co, faces = quad_surface(side, side, True, True)
+    elif kind == 'POLES':
+        rows = max(int(math.sqrt(size / 2)), 8)
+        layout, co, blocks = pole_surface(rows, rows * 2)
+        return build_mesh("bench_poles", co, blocks), layout
+    return build_mesh("bench_" + kind.lower(), co, [faces]), layout
+
+
+# ##################### Cases ##################### #
+
+# Each case returns (select mode, context function, [previous component, active component]).
+# Components are ('VERT', index), ('EDGE', (vert, vert)) or ('FACE', index).
+def cases_for(kind, layout):
+    r = layout.rows // 2
+    c = layout.cols // 2
+    d = max(layout.cols // 4, 2)
+    v = layout.vert
+    f = layout.face
+    if kind == 'WIRE':
+        return {
+            'wire_vert_loop': (VERT, 'vert', [('VERT', 1), ('VERT', 0)]),
+            'wire_edge_loop': (EDGE, 'edge', [('EDGE', (0, 1)), ('EDGE', (0, 1))]),
+            'wire_bounded_vert': (VERT, 'vert', [('VERT', d), ('VERT', 0)]),
+        }
+    cases = {
+        'vert_loop': (VERT, 'vert', [('VERT', v(r, c + 1)), ('VERT', v(r, c))]),
+        'edge_loop': (EDGE, 'edge', [('EDGE', (v(r, c), v(r, c + 1)))] * 2),
+        'edge_ring': (EDGE, 'edge', [('EDGE', (v(r + 1, c), v(r + 1, c + 1))), ('EDGE', (v(r, c), v(r, c + 1)))]),
+        'face_loop': (FACE, 'face', [('FACE', f(r, c + 1)), ('FACE', f(r, c))]),
+        'bounded_vert': (VERT, 'vert', [('VERT', v(r, c + d)), ('VERT', v(r, c))]),
+        'bounded_edge': (EDGE, 'edge', [('EDGE', (v(r, c + d), v(r, c + d + 1))), ('EDGE', (v(r, c), v(r, c + 1)))]),
+        'bounded_ring': (EDGE, 'edge', [('EDGE', (v(r + d, c), v(r + d, c + 1))), ('EDGE', (v(r, c), v(r, c + 1)))]),
+        'bounded_face': (FACE, 'face', [('FACE', f(r, c + d)), ('FACE', f(r, c))]),
+    }
+    if kind in ('GRID', 'CYLINDER'):
+        cases['boundary_vert_loop'] = (VERT, 'vert', [('VERT', v(0, c + 1)), ('VERT', v(0, c))])
+        cases['boundary_edge_loop'] = (EDGE, 'edge', [('EDGE', (v(0, c), v(0, c + 1)))] * 2)
+    if kind == 'POLES':
+        # Meridian loops run into the triangle fans at the poles.
+        cases['pole_edge_loop'] = (EDGE, 'edge', [('EDGE', (v(r, c), v(r + 1, c)))] * 2)
+    return cases
+
+
+def resolve(bm, component):
+    kind, key = component
+    if kind == 'VERT':
+        return bm.verts[key]
+    if kind == 'FACE':
+        return bm.faces[key]
+    v0, v1 = bm.verts[key[0]], bm.verts[key[1]]
+    return next(e for e in v0.link_edges if e.other_vert(v0) is v1)
+
+
+def run_case(context, cs, obj, select_mode, function, components):
+    context.tool_settings.mesh_select_mode = select_mode
+    bpy.ops.mesh.select_all(action='DESELECT')
+    bm = bmesh.from_edit_mesh(obj.data)
+    bm.select_mode = {('VERT', 'EDGE', 'FACE')[select_mode.index(True)]}
+    for seq in (bm.verts, bm.edges, bm.faces):
+        seq.ensure_lookup_table()
+    bm.select_history.clear()
+    for component in components:
+        element = resolve(bm, component)
+        element.select = True
+        bm.select_history.add(element)
+
+    select = getattr(cs, "context_{}_select".format(function))
+    mode = 'SET' if components[0] == components[1] else 'ADD'
+    start = time.perf_counter()
+    result = select(context, mode)
+    elapsed = time.perf_counter() - start
+    me = obj.data
+    selected = (me.total_vert_sel, me.total_edge_sel, me.total_face_sel)[select_mode.index(True)]
+    return elapsed, selected, sorted(result)
+
+
+def run_mesh(context, cs, obj, kind, layout, repeat):
+    bpy.ops.object.mode_set(mode='EDIT')
+    me = obj.data
+    results = []
+    for name, (select_mode, function, components) in cases_for(kind, layout).items():
+        # Cold: nothing cached, so this includes building the topology index. Warm: repeated identical clicks.
+        for cache in (getattr(cs, 'topology_cache', None), getattr(cs, 'result_cache', None)):
+            if cache is not None:  # Versions before the caches have nothing to clear.
+                cache.clear()
+        cold, selected, status = run_case(context, cs, obj, select_mode, function, components)
+        warm = [run_case(context, cs, obj, select_mode, function, components)[0] for _ in range(repeat)]
+        results.append({
+            'mesh': kind,
+            'case': name,
+            'verts': len(me.vertices),
+            'edges': len(me.edges),
+            'faces': len(me.polygons),
+            'cold_s': cold,
+            'warm_median_s': statistics.median(warm) if warm else None,
+            'warm_min_s': min(warm) if warm else None,
+            'selected': selected,
+            'status': status,
+        })
+        print("{:>9} {:>9} faces  {:<20} cold {:8.4f}s  warm {:8.4f}s  {} selected".format(
+            kind, len(me.polygons), name, cold, results[-1]['warm_median_s'] or 0.0, selected))
+    bpy.ops.object.mode_set(mode='OBJECT')
+    return results
+
+
+# Times labeling every loop and ring of the mesh, with the chain walkers and with the link table in each number of
+# processes. Labeling doesn't depend on the edit mesh, so this runs on the object mode mesh.
+def run_labeling(cs, obj, kind, process_counts, repeat):
+    index = cs.topology.TopologyIndex.from_mesh(obj.data)
+    labels = cs.edge_labels
+    parallel = cs.parallel_labels
+    loop_mask = index.edge_face_count == 2
+    ring_mask = (index.edge_face_count == 1) | (index.edge_face_count == 2)
+
+    def walkers():
+        labels._label_chains(index, loop_mask, labels._loop_chain)
+        labels._label_chains(index, ring_mask, labels._ring_chain)
+
+    def link_table(count):
+        parallel.label_chains(index, loop_mask, parallel.LOOP, count)
+        parallel.label_chains(index, ring_mask, parallel.RING, count)
+
+    runs = [('labeling_walkers', 0, walkers)]
+    runs += [('labeling', count, lambda count=count: link_table(count)) for count in process_counts]
+    results = []
+    for name, count, label in runs:
+        times = []
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            label()
+            times.append(time.perf_counter() - start)
+        results.append({
+            'mesh': kind,
+            'case': name,
+            'processes': count,
+            'verts': index.vert_count,
+            'edges': index.edge_count,
+            'faces': index.face_count,
+            'warm_median_s': statistics.median(times),
+            'warm_min_s': min(times),
+        })
+        print("{:>9} {:>9} edges  {:<20} {:>2} processes {:8.4f}s".format(
+            kind, index.edge_count, name, count, results[-1]['warm_median_s']))
+    return results
+
+
+# Returns, per mesh kind, the smallest edge count at which labeling in some number of processes beat labeling in one,
+# or None if it never did.
+def labeling_crossover(results):
+    crossover = {}
+    timings = {}
+    for result in results:
+        if result['case'] == 'labeling':
+            key = (result['mesh'], result['edges'])
+            timings.setdefault(key, {})[result['processes']] = result['warm_median_s']
+    for (kind, edges), by_count in sorted(timings.items()):
+        crossover.setdefault(kind, None)
+        single = by_count.get(1)
+        split = [seconds for count, seconds in by_count.items() if count > 1]
+        if crossover[kind] is None and single is not None and split and min(split) < single:
+            crossover[kind] = edges
+    for kind, edges in crossover.items():
+        print("{:>9} labeling in processes pays off from {} edges".format(kind, edges if edges else "(never)"))
+    return crossover
+
+
+def benchmark(args):
+    addon_utils.enable(args.addon, default_set=True)
+    cs = sys.modules[args.addon]
+    context = bpy.context
+    prefs = context.preferences.addons[args.addon].preferences
+    labeling = args.labeling_processes and getattr(cs, 'parallel_labels', None) is not None
+    if args.labeling_processes and not labeling:
+        print("{} has no loop and ring labeling, skipping --labeling-processes".format(args.addon))
+    prefs.select_linked_on_double_click = False  # The fallback needs a mouse position, which we don't have.
+
+    results = []
+    for kind in args.meshes:
+        for size in args.sizes:
+            obj, layout = generate(kind, size)
+            context.view_layer.objects.active = obj
+            obj.select_set(True)
+            if labeling and kind != 'WIRE':
+                results.extend(run_labeling(cs, obj, kind, args.labeling_processes, args.repeat))
+            if not args.only_labeling:
+                results.extend(run_mesh(context, cs, obj, kind, layout, args.repeat))
+            bpy.data.meshes.remove(obj.data)
+    return results
+
+
+def main():
+    args = parse_args()
+    results = benchmark(args)
+    cs_version = sys.modules[args.addon].bl_info['version']
+    report = {
+        'addon': args.addon,
+        'addon_version': ".".join(str(n) for n in cs_version),
+        'blender': bpy.app.version_string,
+        'python': sys.version.split()[0],
+        'repeat': args.repeat,
+        'results': results,
+    }
+    if any(result['case'] == 'labeling' for result in results):
+        report['labeling_crossover'] = labeling_crossover(results)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print("Wrote {} results to {}".format(len(results), os.path.abspath(args.output)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2069 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+bl_info = {
+    "name": "Context Select",
+    "description": "Context-aware loop selection for vertices, edges, and faces.",
+    "author": "Andreas Strømberg, Chris Kohl",
+    "version": (1, 6, 1),
+    "blender": (2, 80, 0),
+    "location": "",
+    "warning": "",
+    "wiki_url": "https://github.com/Stromberg90/Scripts/tree/master/Blender",
+    "tracker_url": "https://github.com/Stromberg90/Scripts/issues",
+    "category": "Mesh"
+}
+
+import bpy
+import bmesh
+import json
+import numpy as np
+from bpy_extras import view3d_utils
+from mathutils.bvhtree import BVHTree
+from mathutils.geometry import intersect_point_line
+from collections import deque
+from itertools import repeat
+from operator import attrgetter, itemgetter
+
+from importlib import reload
+if 'topology' in globals():
+    reload(profiling)
+    reload(topology)
+    reload(parallel_labels)
+    reload(edge_labels)
+    reload(cache)
+    reload(cache_manager)
+    reload(sidecar)
+    reload(islands)
+    reload(uv)
+    reload(symmetry)
+    reload(preview)
+    reload(selection_history)
+    reload(api)
+
+from . import profiling
+from . import topology
+from . import parallel_labels
+from . import edge_labels
+from . import cache
+from . import sidecar
+from . import cache_manager
+from . import islands
+from . import uv
+from . import symmetry
+from . import preview
+from . import selection_history
+from . import api
+
+classes = []
+mouse_keymap = []
+topology_cache = cache_manager.topology_cache  # Per-mesh topology indexes, kept in step with edits.
+result_cache = cache.ResultCache()
+loop_growths = {}  # Mesh pointer -> (LoopGrowth, index version, the selection it left behind)
+selection_histories = {}  # Mesh pointer -> SelectionHistory
+selected_log = []  # Everything select_elements() selected during the running operator, for the selection history.
+
+BULK_SELECT_THRESHOLD = 1000  # Selections at least this big are written with map() instead of a Python loop.
+REGION_FLUSH_FACTOR = 32  # Flush around the new selection only while it's this many times smaller than the mesh.
+
+
+def cs_register_keymap_keys():
+    kc = bpy.context.window_manager.keyconfigs.addon
+    addon = bpy.context.preferences.addons.get(__name__)
+    if addon is None or addon.preferences.undo_selections:
+        select_op = "object.context_select"
+    else:
+        select_op = "object.context_select_no_undo"
+    if kc:
+        km = kc.keymaps.new(name="Mesh", space_type='EMPTY')
+
+#        kmi = km.keymap_items.new("object.context_select", 'LEFTMOUSE', 'DOUBLE_CLICK', ctrl=True)
+#        kmi.properties.mode = 'SUB'
+#        mouse_keymap.append((km, kmi))
+
+        kmi = km.keymap_items.new(select_op, 'LEFTMOUSE', 'DOUBLE_CLICK', shift=True)
+        kmi.properties.mode = 'ADD'
+        mouse_keymap.append((km, kmi))
+
+        kmi = km.keymap_items.new(select_op, 'LEFTMOUSE', 'DOUBLE_CLICK')
+        kmi.properties.mode = 'SET'
+        mouse_keymap.append((km, kmi))
+
+        kmi = km.keymap_items.new("object.context_select_preview", 'MOUSEMOVE', 'ANY', any=True)
+        mouse_keymap.append((km, kmi))
+
+        km = kc.keymaps.new(name="UV Editor", space_type='EMPTY')
+
+        kmi = km.keymap_items.new(select_op, 'LEFTMOUSE', 'DOUBLE_CLICK', shift=True)
+        kmi.properties.mode = 'ADD'
+        mouse_keymap.append((km, kmi))
+
+        kmi = km.keymap_items.new(select_op, 'LEFTMOUSE', 'DOUBLE_CLICK')
+        kmi.properties.mode = 'SET'
+        mouse_keymap.append((km, kmi))
+
+        kmi = km.keymap_items.new(select_op, 'LEFTMOUSE', 'DOUBLE_CLICK', ctrl=True)
+        kmi.properties.mode = 'SET'
+        kmi.properties.ring = True
+        mouse_keymap.append((km, kmi))
+
+
+def cs_unregister_keymap_keys():
+    for km, kmi in mouse_keymap:
+        km.keymap_items.remove(kmi)
+    mouse_keymap.clear()
+
+
+def cs_update_keymap(self, context):
+    prefs = context.preferences.addons[__name__].preferences
+    
+    if prefs.add_keys_to_keymap:
+        cs_register_keymap_keys()
+    else:
+        cs_unregister_keymap_keys()
+
+
+def cs_update_select_op(self, context):
+    if self.add_keys_to_keymap:
+        cs_unregister_keymap_keys()
+        cs_register_keymap_keys()
+
+
+def cs_update_profiling(self, context):
+    profiler = profiling.profiler
+    profiler.enabled = self.profiling
+    profiler.resize(self.profiling_buffer_size)
+    profiler.set_capture(self.profiling and self.profiling_capture)
+
+
+def cs_update_persistence(self, context):
+    topology_cache.persist = self.persist_topology
+
+
+def cs_update_labeling(self, context):
+    parallel_labels.processes = self.labeling_processes
+
+
+def cs_update_preview(self, context):
+    if not self.hover_preview:
+        preview.preview_batch.clear()
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+class ContextSelectPreferences(bpy.types.AddonPreferences):
+    # this must match the addon name, use '__package__'
+    # when defining this in a submodule of a python package.
+    bl_idname = __name__
+
+    add_keys_to_keymap: bpy.props.BoolProperty(
+        name="Add Keys to Key Map",
+        description="Automatically append the add-on's keys to Blender's key map.",
+        default=True,
+        update=cs_update_keymap)
+
+    select_linked_on_double_click: bpy.props.BoolProperty(
+        name="Select Linked On Double Click",
+        description="Double clicking on a face or a vertex (if not part of a loop selection) "
+                    + "will select all components for that contiguous mesh piece",
+        default=True)
+
+    select_linked_delimit: bpy.props.EnumProperty(
+        name="Delimit",
+        description="Stop the linked selection from crossing these edges",
+        items=[
+            ("SEAM", "Seam", "Delimit by edge seams"),
+            ("SHARP", "Sharp", "Delimit by sharp edges"),
+            ("MATERIAL", "Material", "Delimit by face material"),
+        ],
+        options={'ENUM_FLAG'},
+        default=set())
+
+    mirror_selections: bpy.props.BoolProperty(
+        name="Mirror Selections",
+        description="Also select the mirror image of every loop, ring and bounded selection, "
+                    + "across the mesh's local mirror axis",
+        default=False)
+
+    mirror_axis: bpy.props.EnumProperty(
+        name="Mirror Axis",
+        items=[('X', "X", "Mirror across the local X axis"),
+               ('Y', "Y", "Mirror across the local Y axis"),
+               ('Z', "Z", "Mirror across the local Z axis")],
+        default='X')
+
+    mirror_tolerance: bpy.props.FloatProperty(
+        name="Mirror Tolerance",
+        description="How far a vertex may be from the mirrored position of another and still count as its mirror "
+                    + "image",
+        subtype='DISTANCE',
+        default=0.0001,
+        min=0.0,
+        precision=5)
+
+    hover_preview: bpy.props.BoolProperty(
+        name="Preview Loop Under Cursor",
+        description="Highlight the loop a double-click would select while hovering over the mesh in edit mode, "
+                    + "once a selection has been made on it",
+        default=False,
+        update=cs_update_preview)
+
+    hover_preview_color: bpy.props.FloatVectorProperty(
+        name="Preview Color",
+        subtype='COLOR',
+        size=4,
+        min=0.0,
+        max=1.0,
+        default=(1.0, 0.6, 0.1, 0.8),
+        update=cs_update_preview)
+
+    persist_topology: bpy.props.BoolProperty(
+        name="Save Topology Indexes Next To .blend",
+        description="When saving, also save the topology index of every big mesh that has one to a folder next to "
+                    + "the .blend, and load it from there next session instead of indexing the mesh again. "
+                    + "A saved index is only used if the mesh's topology still matches it",
+        default=False,
+        update=cs_update_persistence)
+
+    labeling_processes: bpy.props.IntProperty(
+        name="Labeling Processes",
+        description="How many processes to split labeling the loops and rings of a whole mesh across, "
+                    + "for bounded selections on meshes with {:,} edges or more. ".format(parallel_labels.MIN_EDGES)
+                    + "Each runs in a separate Python process; 1 labels them in Blender's own process",
+        default=1,
+        min=1,
+        max=64,
+        update=cs_update_labeling)
+
+    undo_selections: bpy.props.BoolProperty(
+        name="Undo Steps For Selections",
+        description="Push an undo step for every double-click selection. Turning this off makes selecting on very "
+                    + "large meshes faster; step through the selection history instead to go back",
+        default=True,
+        update=cs_update_select_op)
+
+    selection_history_size: bpy.props.IntProperty(
+        name="Selection History Size",
+        description="How many recent selections of each mesh to keep for stepping back and forward through "
+                    + "(0 turns the selection history off)",
+        default=0,
+        min=0)
+
+    profiling: bpy.props.BoolProperty(
+        name="Record Timings",
+        description="Time every selection phase by phase, count walker steps and selected components, "
+                    + "and show the result in the status bar",
+        default=False,
+        update=cs_update_profiling)
+
+    profiling_buffer_size: bpy.props.IntProperty(
+        name="Timing Records",
+        description="How many of the most recent selections to keep timings of",
+        default=100,
+        min=1,
+        update=cs_update_profiling)
+
+    profiling_capture: bpy.props.BoolProperty(
+        name="Capture cProfile",
+        description="Also run every recorded selection under cProfile, saved next to the timings",
+        default=False,
+        update=cs_update_profiling)
+
+    allow_non_quads_at_ends: bpy.props.BoolProperty(
+        name="Allow Non-Quads At Start/End Of Face Loops",
+        description="If a loop of faces terminates at a triangle or n-gon, "
+                    + "allow that non-quad face to be added to the final loop selection, "
+                    + "and allow using that non-quad face to begin a loop selection. "
+                    + "NOTE: For bounded face selection the starting OR ending face must be a quad",
+        default=True)
+
+    terminate_self_intersects: bpy.props.BoolProperty(
+        name="Terminate Self-Intersects At Intersection",
+        description="If a loop or ring of vertices, edges, or faces circles around and crosses over itself, "
+                    + "stop the selection at that location",
+        default=False)
+
+    ignore_boundary_wires: bpy.props.BoolProperty(
+        name="Ignore Wire Edges On Boundaries",
+        description="If wire edges are attached to a boundary vertex the selection will ignore it, "
+                    + "pass through, and continue selecting the boundary loop",
+        default=False)
+
+    leave_edge_active: bpy.props.BoolProperty(
+        name="Leave Edge Active After Selections",
+        description="When selecting edge loops or edge rings, the active edge will remain active. "
+                    + "NOTE: This changes the behavior of chained neighbour selections",
+        default=False)
+
+    ignore_hidden_geometry: bpy.props.BoolProperty(
+        name="Ignore Hidden Geometry",
+        description="Loop selections will ignore hidden components and continue through to the other side",
+        default=False)
+
+    return_single_loop: bpy.props.BoolProperty(
+        name="Select Single Bounded Loop",
+        description="For bounded selections, if there are multiple equal-length paths between the start and "
+                    + "end component, select only one loop instead of all possible loops",
+        default=False)
+
+    bounded_waypoints: bpy.props.BoolProperty(
+        name="Bounded Selections Through Every Waypoint",
+        description="For bounded selections, also walk back through the earlier components of the same type in the "
+                    + "selection history, selecting one path through all of them in order instead of only the path "
+                    + "from the previous component",
+        default=False)
+
+    result_cache_size: bpy.props.IntProperty(
+        name="Loop Cache Size",
+        description="Maximum number of components kept from recent full loop and ring selections, "
+                    + "so reselecting them on an unchanged mesh is instant (0 disables the cache)",
+        default=1000000,
+        min=0)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "add_keys_to_keymap")
+        layout.label(text="General Selection:")
+        layout.prop(self, "select_linked_on_double_click")
+        layout.prop(self, "select_linked_delimit")
+        layout.prop(self, "terminate_self_intersects")
+        layout.prop(self, "ignore_hidden_geometry")
+        layout.prop(self, "return_single_loop")
+        layout.prop(self, "bounded_waypoints")
+        layout.prop(self, "mirror_selections")
+        if self.mirror_selections:
+            layout.prop(self, "mirror_axis")
+            layout.prop(self, "mirror_tolerance")
+        layout.prop(self, "hover_preview")
+        if self.hover_preview:
+            layout.prop(self, "hover_preview_color")
+        layout.label(text="Vertex Selection:")
+        layout.prop(self, "ignore_boundary_wires")
+        layout.label(text="Edge Selection:")
+        layout.prop(self, "leave_edge_active")
+        layout.prop(self, "ignore_boundary_wires")
+        layout.label(text="Face Selection:")
+        layout.prop(self, "allow_non_quads_at_ends")
+        layout.label(text="Performance:")
+        layout.prop(self, "result_cache_size")
+        layout.prop(self, "persist_topology")
+        layout.prop(self, "labeling_processes")
+        layout.prop(self, "undo_selections")
+        layout.prop(self, "selection_history_size")
+        layout.prop(self, "profiling")
+        if self.profiling:
+            layout.prop(self, "profiling_buffer_size")
+            layout.prop(self, "profiling_capture")
+            last = profiling.profiler.last()
+            if last is not None:
+                layout.label(text=last.summary())
+            layout.operator("object.context_select_profile_dump")
+        layout.label(text="Loop cache: {hits} hits, {misses} misses, {evictions} evictions, "
+                          "{components} components stored".format(**result_cache.stats()))
+classes.append(ContextSelectPreferences)
+
+
+class ObjectMode:
+    OBJECT = 'OBJECT'
+    EDIT = 'EDIT'
+    POSE = 'POSE'
+    SCULPT = 'SCULPT'
+    VERTEX_PAINT = 'VERTEX_PAINT'
+    WEIGHT_PAINT = 'WEIGHT_PAINT'
+    TEXTURE_PAINT = 'TEXTURE_PAINT'
+    PARTICLE_EDIT = 'PARTICLE_EDIT'
+    GPENCIL_EDIT = 'GPENCIL_EDIT'
+
+
+class ReportErr(bpy.types.Operator):
+    bl_idname = 'wm.report_err'
+    bl_label = 'Custom Error Reporter'
+    bl_description = 'Mini Operator for using self.report outside of an operator'
+
+    err_type: bpy.props.StringProperty(name="Error Type")
+    err_message: bpy.props.StringProperty(name="Error Message")
+
+    def execute(self, context):
+        self.report({self.err_type}, self.err_message)
+        return {'CANCELLED'}
+classes.append(ReportErr)
+
+
+class OBJECT_OT_context_select(bpy.types.Operator):
+    bl_idname = "object.context_select"
+    bl_label = "Context Select"
+    bl_description = ('Contextually select vertex loops, edge loops, face loops, partial vertex loops, '
+                     + 'partial edge loops, partial face loops, edge rings, partial edge rings, '
+                     + 'vertex boundaries, edge boundaries, partial vertex boundaries, and partial edge boundaries')
+    bl_options = {'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return context.active_object is not None and context.active_object.type == 'MESH'
+
+    select_modes = [
+    ("SET", "Set", "Set a new selection (deselects any existing selection)", 1),
+    ("ADD", "Extend", "Extend selection instead of deselecting everything first", 2),
+    ]
+#    ("SUB", "Subtract", "Subtract from the existing selection", 3),
+
+    mode: bpy.props.EnumProperty(items=select_modes, name="Selection Mode",
+    description="Choose whether to set or extend selection", default="SET")
+
+    # Where the UV editor was clicked, in UV space.
+    location: bpy.props.FloatVectorProperty(size=2, options={'HIDDEN', 'SKIP_SAVE'})
+
+    ring: bpy.props.BoolProperty(name="Ring", description="In the UV editor, select the edge ring instead of the loop",
+    default=False)
+
+    def invoke(self, context, event):
+        if context.area.type == 'IMAGE_EDITOR':
+            self.location = context.region.view2d.region_to_view(event.mouse_region_x, event.mouse_region_y)
+        return self.execute(context)
+
+    def execute(self, context):
+        if context.object.mode == ObjectMode.EDIT:
+            prune_topology_cache(context)
+            return run_selection(self, context, lambda: self.context_select(context))
+        return {'FINISHED'}
+
+    def context_select(self, context):
+        if context.area.type == 'IMAGE_EDITOR':
+            return context_uv_select(context, self.mode, self.location, self.ring)
+
+        # Checks if we are in vertex selection mode.
+        if context.tool_settings.mesh_select_mode[0]:
+            return context_vert_select(context, self.mode)
+
+        # Checks if we are in edge selection mode.
+        if context.tool_settings.mesh_select_mode[1]:
+            return context_edge_select(context, self.mode)
+
+        # Checks if we are in face selection mode.
+        if context.tool_settings.mesh_select_mode[2]:
+            return context_face_select(context, self.mode)
+        return {'FINISHED'}
+classes.append(OBJECT_OT_context_select)
+
+
+# The same operator without an undo step, bound in its place when the Undo Steps For Selections preference is off.
+class OBJECT_OT_context_select_no_undo(OBJECT_OT_context_select):
+    bl_idname = "object.context_select_no_undo"
+    bl_label = "Context Select (No Undo)"
+    bl_options = set()
+classes.append(OBJECT_OT_context_select_no_undo)
+
+
+class OBJECT_OT_context_select_ring_loops(bpy.types.Operator):
+    bl_idname = "object.context_select_ring_loops"
+    bl_label = "Select Loops Across Ring"
+    bl_description = ('Select the edge loop through every edge, or every Nth edge, of the edge ring '
+                      + 'running through the active edge')
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return (context.active_object is not None and context.active_object.type == 'MESH'
+                and context.active_object.mode == ObjectMode.EDIT)
+
+    mode: bpy.props.EnumProperty(items=OBJECT_OT_context_select.select_modes, name="Selection Mode",
+    description="Choose whether to set or extend selection", default="SET")
+
+    nth: bpy.props.IntProperty(name="Every Nth",
+    description="Select the loop through every Nth edge of the ring, counting from the active edge", default=1, min=1)
+
+    def execute(self, context):
+        return run_selection(self, context, lambda: context_ring_loops_select(context, self.mode, self.nth))
+classes.append(OBJECT_OT_context_select_ring_loops)
+
+
+class OBJECT_OT_context_select_preview(bpy.types.Operator):
+    bl_idname = "object.context_select_preview"
+    bl_label = "Context Select Preview"
+    bl_description = "Highlight the loop Context Select would select under the cursor"
+    bl_options = {'INTERNAL'}
+
+    @classmethod
+    def poll(cls, context):
+        return (context.mode == 'EDIT_MESH' and context.area is not None and context.area.type == 'VIEW_3D'
+                and context.preferences.addons[__name__].preferences.hover_preview)
+
+    # Runs on every mouse move and passes the event on, so it never gets in the way of anything else.
+    def invoke(self, context, event):
+        if context_preview(context, event.mouse_region_x, event.mouse_region_y):
+            context.area.tag_redraw()
+        return {'PASS_THROUGH'}
+classes.append(OBJECT_OT_context_select_preview)
+
+
+class OBJECT_OT_context_select_grow_loop(bpy.types.Operator):
+    bl_idname = "object.context_select_grow_loop"
+    bl_label = "Grow Loop Selection"
+    bl_description = ('Extend the partial vertex, edge or face loop through the active component '
+                      + 'by a number of steps at both ends')
+    bl_options = {'REGISTER', 'UNDO'}
+
+    steps: bpy.props.IntProperty(name="Steps", description="How many components to add at each end", default=1, min=1)
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'EDIT_MESH'
+
+    def execute(self, context):
+        return run_selection(self, context, lambda: context_grow_loop(context, self.steps))
+classes.append(OBJECT_OT_context_select_grow_loop)
+
+
+class OBJECT_OT_context_select_shrink_loop(bpy.types.Operator):
+    bl_idname = "object.context_select_shrink_loop"
+    bl_label = "Shrink Loop Selection"
+    bl_description = ('Retract the partial vertex, edge or face loop through the active component '
+                      + 'by a number of steps at both ends')
+    bl_options = {'REGISTER', 'UNDO'}
+
+    steps: bpy.props.IntProperty(name="Steps", description="How many components to remove at each end", default=1,
+    min=1)
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'EDIT_MESH'
+
+    def execute(self, context):
+        return run_selection(self, context, lambda: context_grow_loop(context, -self.steps))
+classes.append(OBJECT_OT_context_select_shrink_loop)
+
+
+class OBJECT_OT_context_select_history(bpy.types.Operator):
+    bl_idname = "object.context_select_history"
+    bl_label = "Step Selection History"
+    bl_description = ("Step back or forward through the active mesh's recent selections, "
+                      + "without going through the undo history")
+    bl_options = {'REGISTER'}
+
+    direction: bpy.props.EnumProperty(
+        name="Direction",
+        items=[
+            ("BACK", "Back", "Go to the previous selection"),
+            ("FORWARD", "Forward", "Go to the next selection"),
+        ],
+        default='BACK')
+
+    steps: bpy.props.IntProperty(name="Steps", default=1, min=1)
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'EDIT_MESH' and context.object is not None and context.object.type == 'MESH'
+
+    def execute(self, context):
+        return context_selection_history_step(context, -self.steps if self.direction == 'BACK' else self.steps)
+classes.append(OBJECT_OT_context_select_history)
+
+
+class OBJECT_OT_context_select_profile_dump(bpy.types.Operator):
+    bl_idname = "object.context_select_profile_dump"
+    bl_label = "Save Timings"
+    bl_description = "Save the recorded selection timings as JSON, and the cProfile capture (if any) next to them"
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "context_select_timings.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        if not profiling.profiler.records:
+            self.report({'WARNING'}, "No timings recorded yet")
+            return {'CANCELLED'}
+        written = profiling.profiler.dump(bpy.path.abspath(self.filepath))
+        self.report({'INFO'}, "Saved " + ", ".join(written))
+        return {'FINISHED'}
+classes.append(OBJECT_OT_context_select_profile_dump)
+
+
+class OBJECT_OT_context_select_loop_report(bpy.types.Operator):
+    bl_idname = "object.context_select_loop_report"
+    bl_label = "Loop Report"
+    bl_description = ("Save a JSON report of the edge loops, face loops, poles and self-intersecting loops "
+                      + "of the selected meshes, for checking retopology")
+
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    @classmethod
+    def poll(cls, context):
+        return any(obj.type == 'MESH' for obj in context.selected_objects)
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "context_select_loops.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        reports = {}
+        for obj in context.selected_objects:
+            if obj.type != 'MESH':
+                continue
+            if obj.mode == 'EDIT':
+                obj.update_from_editmode()
+            report = reports[obj.name] = api.loop_report(obj.data)
+            self.report({'INFO'}, "{}: {} edge loops ({} self-intersecting), {} face loops ({} self-intersecting), "
+                        "{} poles".format(obj.name, report['edge_loops']['count'],
+                                          len(report['edge_loops']['self_intersecting']),
+                                          report['face_loops']['count'],
+                                          len(report['face_loops']['self_intersecting']),
+                                          sum(report['poles'].values())))
+        path = bpy.path.abspath(self.filepath)
+        with open(path, 'w') as file:
+            json.dump(reports, file, indent=1)
+        self.report({'INFO'}, "Saved " + path)
+        return {'FINISHED'}
+classes.append(OBJECT_OT_context_select_loop_report)
+
+
+@profiling.entry_point
+def context_vert_select(context, mode):
+    prefs = context.preferences.addons[__name__].preferences
+    obj, bm = get_active_edit_mesh(context)
+    if bm is None:
+        return {'CANCELLED'}
+    me = obj.data
+
+    new_sel = None
+    active_vert = bm.select_history.active
+    previous_active_vert = bm.select_history[len(bm.select_history) - 2]
+    # Sanity check.  Make sure we're actually working with vertices.
+    if type(active_vert) is not bmesh.types.BMVert or type(previous_active_vert) is not bmesh.types.BMVert:
+        return {'CANCELLED'}
+    topo = get_topology(obj, bm, active_vert)
+    if topo is None:  # Every walk runs on the topology index.
+        return {'CANCELLED'}
+
+    adjacent = previous_active_vert in get_neighbour_verts(active_vert)
+
+    # If the two components are not the same it would correspond to a mode of 'ADD'
+    if not previous_active_vert.index == active_vert.index:
+        if adjacent:
+            active_edge = [e for e in active_vert.link_edges if e in previous_active_vert.link_edges][0]
+            if active_edge.hide and not prefs.ignore_hidden_geometry:
+                return {'CANCELLED'}
+            if active_edge.is_manifold:
+                new_sel = full_loop_vert_manifold(prefs, active_vert, active_edge, topo)
+            elif active_edge.is_boundary:
+                if active_vert.is_manifold:
+                    new_sel = full_loop_vert_boundary(prefs, active_vert, topo)
+                elif previous_active_vert.is_manifold:
+                    new_sel = full_loop_vert_boundary(prefs, previous_active_vert, topo)
+                else:
+                    new_sel = full_loop_vert_boundary(prefs, active_vert, topo)
+            elif active_edge.is_wire:
+                if active_vert.is_wire:
+                    new_sel = full_loop_vert_wire(prefs, active_vert, topo)
+                elif previous_active_vert.is_wire:
+                    new_sel = full_loop_vert_wire(prefs, previous_active_vert, topo)
+            else:  # Non-manifold edge extrusion/intersection
+                new_sel = full_loop_vert_nonmanifold(prefs, active_edge, topo)
+        elif not adjacent:
+            new_sel = get_waypoint_selection(bm, active_vert, previous_active_vert, mode='VERT', topo=topo)
+
+    if new_sel:
+        new_sel = with_mirror(prefs, obj, topo, new_sel)
+        select_elements(new_sel)
+    elif not new_sel and prefs.select_linked_on_double_click:
+        new_sel = select_linked(prefs, topo, active_vert, mode)
+
+    bm.select_history.add(active_vert)  # Re-add active_vert to history to keep it active.
+    flush_selection(bm, topo, new_sel)
+    update_edit_selection(me)
+    return {'FINISHED'}
+
+
+@profiling.entry_point
+def context_face_select(context, mode):
+    prefs = context.preferences.addons[__name__].preferences
+    obj, bm = get_active_edit_mesh(context)
+    if bm is None:
+        return {'CANCELLED'}
+    me = obj.data
+
+    new_sel = None
+    active_face = bm.select_history.active
+    previous_active_face = bm.select_history[len(bm.select_history) - 2]
+    # Sanity check.  Make sure we're actually working with faces.
+    if type(active_face) is not bmesh.types.BMFace or type(previous_active_face) is not bmesh.types.BMFace:
+        return {'CANCELLED'}
+    topo = get_topology(obj, bm, active_face)
+    if topo is None:  # Every walk runs on the topology index.
+        return {'CANCELLED'}
+
+    if len(active_face.verts) != 4 and len(previous_active_face.verts) != 4:
+        quads = (0, 0)
+    elif len(active_face.verts) == 4 and len(previous_active_face.verts) == 4:
+        quads = (1, 1)
+    elif len(active_face.verts) == 4 and len(previous_active_face.verts) != 4:
+        quads = (1, 0)
+    elif len(active_face.verts) != 4 and len(previous_active_face.verts) == 4:
+        quads = (0, 1)
+
+    adjacent = previous_active_face in get_neighbour_faces(active_face)
+
+    # If the two components are not the same it would correspond to a mode of 'ADD'
+    if not previous_active_face.index == active_face.index and not quads == (0, 0):
+        if adjacent and (quads == (1, 1) or prefs.allow_non_quads_at_ends):
+            ring_edge = [e for e in active_face.edges if e in previous_active_face.edges][0]
+            new_sel = full_loop_face(ring_edge, active_face, topo)
+        elif not adjacent and (quads == (1, 1) or prefs.allow_non_quads_at_ends):
+            new_sel = get_waypoint_selection(bm, active_face, previous_active_face, mode='FACE', topo=topo)
+
+    if new_sel:
+        new_sel = with_mirror(prefs, obj, topo, new_sel)
+        select_elements(new_sel)
+    elif not new_sel and prefs.select_linked_on_double_click:
+        new_sel = select_linked(prefs, topo, active_face, mode)
+
+    bm.select_history.add(active_face)
+    flush_selection(bm, topo, new_sel)
+    update_edit_selection(me)
+    return {'FINISHED'}
+
+
+@profiling.entry_point
+def context_edge_select(context, mode):
+    prefs = context.preferences.addons[__name__].preferences
+    obj, bm = get_active_edit_mesh(context)
+    if bm is None:
+        return {'CANCELLED'}
+    me = obj.data
+
+    new_sel = None
+    active_edge = bm.select_history.active
+    previous_active_edge = bm.select_history[len(bm.select_history) - 2]
+    # Sanity check.  Make sure we're actually working with edges.
+    if type(active_edge) is not bmesh.types.BMEdge or type(previous_active_edge) is not bmesh.types.BMEdge:
+        return {'CANCELLED'}
+    topo = get_topology(obj, bm, active_edge)
+    if topo is None:  # Every walk runs on the topology index.
+        return {'CANCELLED'}
+
+    adjacent = previous_active_edge in get_neighbour_edges(active_edge)
+
+    # If the previous edge and current edge are different we are doing a Shift+Double Click selection.
+    # This corresponds to a mode of 'ADD'
+    # This could be a complete edge ring/loop, or partial ring/loop.
+    if not previous_active_edge.index == active_edge.index:
+        if adjacent:
+            # If a vertex is shared then the active_edge and previous_active_edge are physically connected.
+            # We want to select a full edge loop.
+            if any([v for v in active_edge.verts if v in previous_active_edge.verts]):
+                if active_edge.is_manifold:
+                    new_sel = full_loop_edge_manifold(active_edge, topo)
+                elif active_edge.is_boundary:
+                    new_sel = full_loop_edge_boundary(prefs, active_edge, topo)
+                elif active_edge.is_wire:
+                    new_sel = full_loop_edge_wire(prefs, active_edge, topo)
+                    if len(new_sel) == 1:  # Not sure if this condition is ever true due to filters elsewhere
+                        new_sel = None
+                        bpy.ops.mesh.loop_select('INVOKE_DEFAULT', extend=True)
+                else:
+                    new_sel = full_loop_edge_nonmanifold(prefs, active_edge, topo)
+            # If they're not connected but still adjacent then we want a full edge ring.
+            else:
+                if active_edge.is_manifold:
+                    new_sel = full_ring_edge_manifold(prefs, active_edge, topo)
+                else:
+                    new_sel = full_ring_edge_manifold(prefs, previous_active_edge, topo)
+        # If we're not adjacent we have to test for bounded selections.
+        elif not adjacent:
+            new_sel = get_waypoint_selection(bm, active_edge, previous_active_edge, mode='EDGE', topo=topo)
+            if not new_sel:
+                if active_edge.is_manifold:
+                    new_sel = full_loop_edge_manifold(active_edge, topo)
+                elif active_edge.is_boundary:
+                    new_sel = full_loop_edge_boundary(prefs, active_edge, topo)
+                elif active_edge.is_wire:
+                    new_sel = full_loop_edge_wire(prefs, active_edge, topo)
+                    if len(new_sel) == 1:
+                        new_sel = None
+                        bpy.ops.mesh.loop_select('INVOKE_DEFAULT', extend=True)
+                else:
+                    new_sel = full_loop_edge_nonmanifold(prefs, active_edge, topo)
+
+    # This corresponds to a mode of 'SET'
+    else:
+        if active_edge.is_manifold:
+            new_sel = full_loop_edge_manifold(active_edge, topo)
+        elif active_edge.is_boundary:
+            new_sel = full_loop_edge_boundary(prefs, active_edge, topo)
+        elif active_edge.is_wire:
+            new_sel = full_loop_edge_wire(prefs, active_edge, topo)
+            if len(new_sel) == 1:
+                new_sel = None
+                if mode == 'SET':
+                    bpy.ops.mesh.loop_select('INVOKE_DEFAULT')
+                else:
+                    bpy.ops.mesh.loop_select('INVOKE_DEFAULT', extend=True)
+        else:
+            new_sel = full_loop_edge_nonmanifold(prefs, active_edge, topo)
+
+    if new_sel:
+        new_sel = with_mirror(prefs, obj, topo, new_sel)
+        select_elements(new_sel)
+
+    # No idea why clearing history matters for edges and not for verts/faces, but it seems that it does.
+    bm.select_history.clear()
+    # Re-adding the active_edge to keep it active alters the way chained selections work so it's a user preference.
+    # We'd have to replace view3d.select and some Blender functionality to retain active edge AND desired behavior.
+    if prefs.leave_edge_active:
+        bm.select_history.add(active_edge)
+    flush_selection(bm, topo, new_sel)
+    update_edit_selection(me)
+    return {'FINISHED'}
+
+
+# Selects the edge loops crossing the active edge's ring in one go, instead of one double-click (and undo step) each.
+@profiling.entry_point
+def context_ring_loops_select(context, mode, nth):
+    prefs = context.preferences.addons[__name__].preferences
+    obj, bm = get_active_edit_mesh(context)
+    if bm is None:
+        return {'CANCELLED'}
+
+    active_edge = bm.select_history.active
+    if type(active_edge) is not bmesh.types.BMEdge or not active_edge.is_manifold:
+        return {'CANCELLED'}
+    topo = get_topology(obj, bm, active_edge)
+    if topo is None:  # Every walk runs on the topology index.
+        return {'CANCELLED'}
+
+    ring = topo.cached('EDGE_RING', prefs, indexed_ring_edge_manifold, active_edge.index)
+    loops = topology.loops_across_ring(
+        ring, active_edge.index, nth,
+        lambda edge: topo.cached('EDGE_LOOP', prefs, indexed_loop_edge_manifold, edge))
+    edge_list = list(set().union(*loops))
+
+    if mode == 'SET':
+        bpy.ops.mesh.select_all(action='DESELECT')
+    new_sel = with_mirror(prefs, obj, topo, topo.edges(edge_list))
+    select_elements(new_sel)
+    bm.select_history.add(active_edge)
+    flush_selection(bm, topo, new_sel)
+    update_edit_selection(obj.data)
+    return {'FINISHED'}
+
+
+# ##################### UV Editor ##################### #
+
+# Selects the UV loop, ring, face loop or island nearest to location, on whichever mesh in edit mode has the nearest
+# UV edge. Loops run along UV edges and stop where the UVs are split, so a seam is a boundary like any other.
+@profiling.entry_point
+def context_uv_select(context, mode, location, ring=False):
+    prefs = context.preferences.addons[__name__].preferences
+    tool_settings = context.tool_settings
+    sync = tool_settings.use_uv_select_sync
+
+    picked = None
+    checked = set()
+    for obj in context.objects_in_mode:
+        if obj.type != 'MESH' or obj.data.as_pointer() in checked:
+            continue
+        checked.add(obj.data.as_pointer())
+        bm = bmesh.from_edit_mesh(obj.data)
+        uv_layer = bm.loops.layers.uv.active
+        if uv_layer is None or not len(bm.faces):
+            continue
+        bm.faces.ensure_lookup_table()
+        topo = get_topology(obj, bm, bm.faces[0])
+        if topo is None:
+            continue
+        uv_index = get_uv_index(obj, topo, uv_layer.name)
+        uv_edge, distance = uv_index.nearest_edge(location)
+        if uv_edge >= 0 and (picked is None or distance < picked[0]):
+            picked = (distance, obj, bm, uv_layer, topo, uv_index, uv_edge)
+    if picked is None:
+        return {'CANCELLED'}
+    _distance, obj, bm, uv_layer, topo, uv_index, uv_edge = picked
+
+    if sync:
+        select_mode = 'VERTEX' if 'VERT' in bm.select_mode else 'EDGE' if 'EDGE' in bm.select_mode else 'FACE'
+    else:
+        select_mode = tool_settings.uv_select_mode
+
+    uv_edges = uv_verts = faces = None
+    if select_mode in ('FACE', 'ISLAND'):
+        face = uv_index.face_at(location)
+        if select_mode == 'ISLAND':
+            faces = uv_index.island_faces([face])
+        else:
+            uv_edge, _distance = uv_index.nearest_edge(location, [face])
+            faces = uv_index.face_loop(prefs, uv_edge, face)
+    else:
+        uv_edges = uv_index.edge_loop(prefs, uv_edge, ring) or [uv_edge]
+        if select_mode == 'VERTEX':
+            uv_verts = np.unique(uv_index.uv.edge_verts[uv_edges])
+
+    if mode == 'SET':
+        if sync:
+            bpy.ops.mesh.select_all(action='DESELECT')
+        else:
+            bpy.ops.uv.select_all(action='DESELECT')
+
+    if sync:
+        if faces is not None:
+            new_sel = topo.faces(faces)
+        elif uv_verts is not None:
+            new_sel = topo.verts(np.unique(uv_index.uv_vert_mesh[uv_verts]))
+        else:
+            new_sel = topo.edges(np.unique(uv_index.uv_edge_mesh[uv_edges]))
+        select_elements(new_sel)
+        flush_selection(bm, topo, new_sel)
+    else:
+        index = topo.index
+        if faces is not None:
+            edge_loops = index.loops_of_faces(faces)[0]
+            uv_verts = np.unique(uv_index.loop_uv_vert[edge_loops])
+        elif uv_verts is None:
+            edge_loops = uv_index.loops_of_uv_edges(uv_edges)
+            uv_verts = np.unique(uv_index.uv.edge_verts[uv_edges])
+        else:
+            edge_loops = ()
+        # Every face corner sharing a selected UV vertex has to be selected, or the UV editor shows it split.
+        select_uv_loops(bm, index, uv_layer, uv_index.loops_of_uv_verts(uv_verts), 'select')
+        select_uv_loops(bm, index, uv_layer, edge_loops, 'select_edge')
+    update_edit_selection(obj.data)
+    return {'FINISHED'}
+
+
+# Returns the cached UV index of a UV layer, reading the layer's UVs from the mesh if it has to be built.
+def get_uv_index(obj, topo, layer_name):
+    def read_uvs():
+        me = obj.data
+        obj.update_from_editmode()
+        loop_uv = np.empty(len(me.loops) * 2, dtype=np.float32)
+        me.uv_layers[layer_name].data.foreach_get('uv', loop_uv)
+        return loop_uv
+    return uv.UVIndex.for_index(topo.index, layer_name, read_uvs)
+
+
+# Takes face corner indices and sets a selection flag of their UVs.
+# BMesh has no lookup table for face corners, so each is found by its face and its place in that face.
+def select_uv_loops(bm, index, uv_layer, loops, flag):
+    loops = np.asarray(loops, dtype=np.int64)
+    if not len(loops):
+        return
+    loop_face = index.loop_face[loops]
+    corners = (loops - index.face_loop_start[loop_face]).tolist()
+    faces = gather_elements(bm.faces, loop_face)
+    for face, corner in zip(faces, corners):
+        setattr(face.loops[corner][uv_layer], flag, True)
+
+
+# ##################### Grow/Shrink Loop ##################### #
+
+# Grows (positive steps) or shrinks (negative steps) the partial loop through the active component. The walks are
+# kept between calls, so repeated growing continues from the current ends instead of walking from scratch.
+@profiling.entry_point
+def context_grow_loop(context, steps):
+    prefs = context.preferences.addons[__name__].preferences
+    obj, bm = get_active_edit_mesh(context)
+    if bm is None:
+        return {'CANCELLED'}
+    active = bm.select_history.active
+    topo = get_topology(obj, bm, active)
+    if topo is None:  # Every walk runs on the topology index.
+        return {'CANCELLED'}
+
+    growth = get_loop_growth(prefs, topo, active)
+    if growth is None:
+        return {'CANCELLED'}
+    seq = element_sequence(bm, active)
+    if steps > 0:
+        new_sel = gather_elements(seq, growth.grow(steps))
+        select_elements(new_sel)
+        flush_selection(bm, topo, new_sel)
+    else:
+        # Deselecting through BMesh deselects whatever depended on the component, so nothing needs flushing.
+        for element in gather_elements(seq, growth.shrink(-steps)):
+            element.select = False
+    loop_growths[topo.mesh_key] = (growth, topo.index.version, selection_state(bm))
+    update_edit_selection(obj.data)
+    return {'FINISHED'}
+
+
+# Returns the LoopGrowth left by the last grow or shrink if the selection is still what it left behind, otherwise
+# starts a new one from the active component and the partial loop selected through it. Returns None if the active
+# component doesn't start a loop, or (for verts and faces) no selected neighbour shows which way the loop runs.
+def get_loop_growth(prefs, topo, active):
+    bm, index = topo.bm, topo.index
+    growth, version, state = loop_growths.get(topo.mesh_key, (None, None, None))
+    if growth is not None and version == index.version and state == selection_state(bm):
+        return growth
+
+    seq = element_sequence(bm, active)
+    if type(active) is bmesh.types.BMEdge:
+        if not index.is_manifold_edge(active.index):
+            return None
+        growth = topology.edge_loop_growth(index, prefs, active.index)
+    elif type(active) is bmesh.types.BMVert:
+        edges = [edge for edge in index.vert_edges_of(active.index).tolist()
+                 if seq[index.other_vert(edge, active.index)].select]
+        if not edges:
+            return None
+        growth = topology.vert_loop_growth(index, prefs, active.index, edges[0])
+    elif type(active) is bmesh.types.BMFace:
+        loops = [loop for loop in index.face_loops_of(active.index)
+                 if index.is_manifold_edge(index.loop_edge[loop])
+                 and seq[int(index.loop_face[index.loop_radial_next[loop]])].select]
+        if not loops:
+            return None
+        growth = topology.face_loop_growth(index, prefs, active.index, loops[0])
+    else:
+        return None
+    growth.extend_while(lambda component: seq[component].select)
+    return growth
+
+
+# Returns the BMesh sequence holding elements of the same type as element, with its lookup table ready.
+def element_sequence(bm, element):
+    if type(element) is bmesh.types.BMVert:
+        seq = bm.verts
+    elif type(element) is bmesh.types.BMEdge:
+        seq = bm.edges
+    else:
+        seq = bm.faces
+    seq.ensure_lookup_table()
+    return seq
+
+
+# A cheap fingerprint of a BMesh's selection, for telling whether anything else changed it since we last did.
+def selection_state(bm):
+    active = bm.select_history.active
+    return (type(active), active.index if active is not None else -1,
+            bm.total_vert_sel, bm.total_edge_sel, bm.total_face_sel)
+
+
+# ##################### Selection History ##################### #
+
+# Runs select() for an operator and records the selection it left in the selection history. With profiling on the
+# whole selection is timed, and the timings are shown in the status bar.
+def run_selection(operator, context, select):
+    selected_log.clear()
+    with profiling.profiler.record() as record:
+        result = select()
+        if 'FINISHED' in result:
+            record_selection(context)
+    selected_log.clear()
+    if record is not None:
+        operator.report({'INFO'}, record.summary())
+    return result
+
+
+# Records the current selection of the edit mesh the operator worked on (by default the one get_active_edit_mesh
+# finds) and of every other edit mesh that already has a history, since deselecting everything reaches them too.
+# Histories of meshes that left edit mode are dropped. full_read allows reading a whole selection back from the mesh,
+# which is left to stepping through the history so clicks never pay for it.
+@profiling.phase('history')
+def record_selection(context, obj=None, full_read=False):
+    prefs = context.preferences.addons[__name__].preferences
+    if not prefs.selection_history_size:
+        selection_histories.clear()
+        return
+    if obj is None:
+        obj, _bm = get_active_edit_mesh(context)
+
+    live = set()
+    for other in [obj] + list(context.objects_in_mode):
+        if other is None or other.type != 'MESH' or other.data.as_pointer() in live:
+            continue
+        key = other.data.as_pointer()
+        live.add(key)
+        if other is obj or key in selection_histories:
+            record_mesh_selection(prefs, other, selected_log if other is obj else (), full_read)
+    for key in set(selection_histories) - live:
+        del selection_histories[key]
+
+
+# Records one edit mesh's selection. While the recorded state still applies, only the components that can have
+# changed since are read from the BMesh: whatever was selected before, plus everything touching what's been selected
+# since (the logged selections and the select history, which every click adds to). A mesh without a history starts
+# one the same way, from nothing selected. If the totals don't add up, something else changed the selection: with
+# full_read it's read in full, otherwise the history is reset rather than writing the whole edit mesh back.
+def record_mesh_selection(prefs, obj, selected, full_read=False):
+    bm = bmesh.from_edit_mesh(obj.data)
+    key = obj.data.as_pointer()
+    counts = (len(bm.verts), len(bm.edges), len(bm.faces))
+    index = topology_cache.current(key, counts)
+    history = selection_histories.get(key)
+    if index is None or history is None or history.version != index.version or history.counts != counts:
+        history = None  # The topology changed since, so the recorded indices mean other components now.
+    if index is None:
+        selection_histories.pop(key, None)
+        return
+
+    bm.verts.index_update()
+    bm.edges.index_update()
+    bm.faces.index_update()
+    known = history
+    if known is None:
+        nothing_selected = [np.zeros(count, dtype=bool) for count in counts]
+        known = selection_history.SelectionHistory(index.version, counts, nothing_selected, 0)
+    selection = read_selection_changes(bm, index, known, selected)
+    if selection is None:
+        if not full_read:
+            selection_histories.pop(key, None)
+            return
+        obj.update_from_editmode()
+        selection = topology.read_selection(obj.data)
+    if history is None:
+        selection_histories[key] = selection_history.SelectionHistory(index.version, counts, selection,
+                                                                      prefs.selection_history_size)
+    else:
+        history.limit = prefs.selection_history_size
+        history.record(selection)
+
+
+# Returns the selection as a boolean array per vert, edge and face, starting from the history's current state and
+# reading back only the components that can have changed since, or None if that doesn't account for every change.
+def read_selection_changes(bm, index, history, selected):
+    seeds = {bmesh.types.BMVert: [], bmesh.types.BMEdge: [], bmesh.types.BMFace: []}
+    for elements in selected:
+        if len(elements):
+            seeds[type(next(iter(elements)))].append(np.fromiter(map(attrgetter('index'), elements),
+                                                                 dtype=np.int64, count=len(elements)))
+    for element in bm.select_history:
+        seeds[type(element)].append(np.array([element.index], dtype=np.int64))
+
+    # Selecting a component selects the ones it's made of, and flushing selects the ones made of it.
+    empty = [np.zeros(0, dtype=np.int64)]
+    seed_faces = np.concatenate(seeds[bmesh.types.BMFace] + empty)
+    loops = index.loops_of_faces(seed_faces)[0]
+    seed_edges = np.concatenate(seeds[bmesh.types.BMEdge] + [index.loop_edge[loops]] + empty)
+    seed_verts = np.concatenate(seeds[bmesh.types.BMVert]
+                                + [index.loop_vert[loops], index.edge_verts[seed_edges].ravel()])
+    near_edges = np.concatenate((seed_edges, index.edges_of_verts(seed_verts)))
+    near_faces = np.concatenate((seed_faces, index.faces_of_edges(near_edges)))
+
+    selection = history.selection()
+    totals = (bm.total_vert_sel, bm.total_edge_sel, bm.total_face_sel)
+    for selected_flags, seq, was_selected, near, total in zip(selection, (bm.verts, bm.edges, bm.faces),
+                                                             history.selected(), (seed_verts, near_edges, near_faces),
+                                                             totals):
+        candidates = np.union1d(was_selected, near)
+        selected_flags[candidates] = selection_of(seq, candidates)
+        if np.count_nonzero(selected_flags) != total:
+            return None
+    return selection
+
+
+# Steps the active mesh's selection history back (negative offset) or forward, only touching the components whose
+# selection differs between the two states.
+@profiling.entry_point
+def context_selection_history_step(context, offset):
+    obj = context.object
+    # So whatever was selected since the last recording can be stepped back to.
+    record_selection(context, obj, full_read=True)
+    history = selection_histories.get(obj.data.as_pointer())
+    changes = history.step(offset) if history is not None else None
+    if changes is None:
+        return {'CANCELLED'}
+
+    bm = bmesh.from_edit_mesh(obj.data)
+    sequences = (bm.verts, bm.edges, bm.faces)
+    # Deselect first: deselecting a vert deselects its edges and faces, which the target state has deselected too.
+    for seq, (deselect, _select) in zip(sequences, changes):
+        for element in gather_elements(seq, deselect):
+            element.select = False
+    for seq, (_deselect, select) in zip(sequences, changes):
+        select_elements(gather_elements(seq, select))
+    selected_log.clear()
+    update_edit_selection(obj.data)
+    return {'FINISHED'}
+
+
+# ##################### Hover Preview ##################### #
+
+# Updates the hover preview for the mouse at region coordinates x, y. The walk runs through the result cache and the
+# batch is only rebuilt when the hovered component, select mode or mesh changes. Returns whether it changed.
+def context_preview(context, x, y):
+    prefs = context.preferences.addons[__name__].preferences
+    hovered = hovered_component(context, x, y)
+    if hovered is None:
+        return preview.preview_batch.clear()
+    obj, topo, edge, face = hovered
+
+    face_mode = topo.bm.select_mode == {'FACE'}
+    key = (topo.mesh_key, topo.index.version, topology_cache.edits(topo.mesh_key), edge, face if face_mode else None)
+
+    def build():
+        if face_mode:
+            return preview.face_batches(topo.index, preview_face_loop(prefs, topo, edge, face), vert_positions)
+        return preview.edge_batches(topo.index, preview_edge_loop(prefs, topo, edge), vert_positions)
+
+    def vert_positions(verts):
+        return np.array([vert.co for vert in topo.verts(verts)], dtype=np.float32)
+
+    return preview.preview_batch.update(key, build, obj.matrix_world.copy(), prefs.hover_preview_color)
+
+
+# Takes region coordinates and returns the edit mesh object under them, its topology, and the face hit and its edge
+# nearest to the hit, or None if there's no visible edit mesh face there. Only meshes a selection has already indexed
+# are previewed: building an index here would stall the mouse on a cold cache.
+def hovered_component(context, x, y):
+    region, rv3d = context.region, context.region_data
+    if rv3d is None:
+        return None
+    origin = view3d_utils.region_2d_to_origin_3d(region, rv3d, (x, y))
+    direction = view3d_utils.region_2d_to_vector_3d(region, rv3d, (x, y))
+
+    nearest = None
+    for obj in context.objects_in_mode:
+        if obj.type != 'MESH':
+            continue
+        bm = bmesh.from_edit_mesh(obj.data)
+        key = obj.data.as_pointer()
+        index = topology_cache.current(key, (len(bm.verts), len(bm.edges), len(bm.faces)))
+        if index is None:
+            continue
+        to_local = obj.matrix_world.inverted()
+        hit = ray_cast_visible(hover_tree(bm, index, key), index, to_local @ origin, to_local.to_3x3() @ direction)
+        if hit is None:
+            continue
+        distance = (obj.matrix_world @ hit[0] - origin).length
+        if nearest is None or distance < nearest[0]:
+            nearest = (distance, obj, bm, index, hit)
+    if nearest is None:
+        return None
+
+    _distance, obj, bm, index, (point, face) = nearest
+    topo = BMeshTopology(bm, index, obj.data.as_pointer())
+    loops = index.face_loops_of(face)
+    corners = [vert.co for vert in topo.verts(index.loop_vert[loops])]
+    nearest_corner = min(range(len(corners)),
+                         key=lambda i: segment_distance(point, corners[i], corners[(i + 1) % len(corners)]))
+    return obj, topo, int(index.loop_edge[loops[nearest_corner]]), face
+
+
+# Returns a BVH tree of the edit mesh's faces to ray cast the hover preview against, cached on the topology index.
+# Its face indices are the BMesh's, unlike the evaluated mesh's a scene ray cast hits, which modifiers renumber. It's
+# rebuilt when the index is replaced or its mesh, at key, has been edited since it was built.
+def hover_tree(bm, index, key):
+    stamp = (index.version, topology_cache.edits(key))
+    cached = getattr(index, 'hover_tree', None)
+    if cached is None or cached[0] != stamp:
+        cached = index.hover_tree = (stamp, BVHTree.FromBMesh(bm))
+    return cached[1]
+
+
+# Casts a ray in local space and returns the location and index of the first face it hits that isn't hidden, or None.
+# Hidden faces aren't drawn, so the ray carries on through them.
+def ray_cast_visible(tree, index, origin, direction, max_hidden=64):
+    direction = direction.normalized()
+    for _attempt in range(max_hidden):
+        location, _normal, face, _distance = tree.ray_cast(origin, direction)
+        if face is None:
+            return None
+        if not index.face_hide[face]:
+            return location, face
+        origin = location + direction * 1e-5
+    return None
+
+
+# Takes a point and the ends of a line segment and returns the distance between them.
+def segment_distance(point, start, end):
+    closest, factor = intersect_point_line(point, start, end)
+    if factor < 0.0:
+        closest = start
+    elif factor > 1.0:
+        closest = end
+    return (closest - point).length
+
+
+# Returns the edge loop a double-click on the edge would select, on the topology index.
+def preview_edge_loop(prefs, topo, edge):
+    face_count = topo.index.edge_face_count[edge]
+    if face_count == 2:
+        edge_list = topo.cached('EDGE_LOOP', prefs, indexed_loop_edge_manifold, edge)
+    elif face_count == 1:
+        edge_list = topo.cached('EDGE_BOUNDARY', prefs, topology.full_loop_edge_boundary, edge)
+    elif face_count == 0:
+        edge_list = topo.cached('EDGE_WIRE', prefs, topology.full_loop_edge_wire, edge)
+    else:
+        edge_list = topo.cached('EDGE_NONMANIFOLD', prefs, topology.full_loop_edge_nonmanifold, edge)
+    return edge_list or [edge]
+
+
+# Returns the face loop a double-click would select running from the face across the edge, on the topology index.
+def preview_face_loop(prefs, topo, edge, face):
+    if topo.index.edge_face_count[edge] != 2:
+        return [face]
+    return topo.cached('FACE_LOOP', prefs, topology.full_loop_face, edge, face) or [face]
+
+
+# ##################### Select Linked ##################### #
+
+# Selects everything linked to the active component, the double-click fallback when there's no loop to select.
+# The island comes straight from the cached island index. Returns the newly selected elements, to be flushed like any
+# other selection.
+@profiling.phase('walk')
+def select_linked(prefs, topo, element, mode):
+    deselect = mode not in ('SET', 'ADD')
+    delimit = set(prefs.select_linked_delimit)
+    index = topo.index
+    island = topo.islands(delimit)
+    if type(element) is bmesh.types.BMVert:
+        faces = index.faces_of_edges(index.vert_edges_of(element.index))
+    elif type(element) is bmesh.types.BMEdge:
+        faces = index.faces_of_edges([element.index])
+    else:
+        faces = np.array([element.index])
+    faces = faces[~index.face_hide[faces]]
+
+    if island.delimited and len(faces):
+        faces = island.linked(faces)
+        loops, _face_offsets = index.loops_of_faces(faces)
+        verts = np.unique(index.loop_vert[loops])
+        edges = np.unique(index.loop_edge[loops])
+    else:  # Loose geometry has no faces to delimit, so it's linked through its edges.
+        if island.delimited:
+            island = topo.islands(set())
+        seed = element.index if type(element) is bmesh.types.BMVert else element.verts[0].index
+        verts = island.linked([seed])
+        edges = np.unique(index.edges_of_verts(verts))
+        edges = edges[~index.edge_hide[edges]]
+        faces = np.unique(index.faces_of_edges(edges))
+        faces = faces[~index.face_hide[faces]]
+
+    select_mode = topo.bm.select_mode
+    if 'VERT' in select_mode:
+        elements = topo.verts(verts)
+    elif 'EDGE' in select_mode:
+        elements = topo.edges(edges)
+    else:
+        elements = topo.faces(faces)
+    if deselect:
+        deque(map(setattr, elements, repeat('select'), repeat(False)), maxlen=0)
+        topo.bm.select_flush(False)
+        return None
+    select_elements(elements)
+    return elements
+
+
+# Returns which edges the select linked delimiters stop at, as a boolean array. Read from the BMesh rather than the
+# mesh, since marking seams or sharp edges doesn't need the mesh to be synced.
+def delimit_edges(index, bm, delimit):
+    stops = np.zeros(index.edge_count, dtype=bool)
+    if 'SEAM' in delimit:
+        stops |= np.fromiter(map(attrgetter('seam'), bm.edges), dtype=bool, count=index.edge_count)
+    if 'SHARP' in delimit:
+        stops |= ~np.fromiter(map(attrgetter('smooth'), bm.edges), dtype=bool, count=index.edge_count)
+    if 'MATERIAL' in delimit:
+        material = np.fromiter(map(attrgetter('material_index'), bm.faces), dtype=np.int32, count=index.face_count)
+        other_face = index.loop_face[index.loop_radial_next]
+        stops[index.loop_edge[material[index.loop_face] != material[other_face]]] = True
+    return stops
+
+
+# ##################### Multi-Object Edit Mode ##################### #
+
+# Returns the (object, BMesh) owning the active component, out of every mesh in edit mode.
+# Clicking a component makes its object active, so the active object is tried first and the other objects' BMeshes
+# are only looked at when it has no selection history. Returns (None, None) if no object has one.
+def get_active_edit_mesh(context):
+    objects = [context.object] + [obj for obj in context.objects_in_mode if obj != context.object]
+    checked = set()
+    for obj in objects:
+        if obj is None or obj.type != 'MESH' or obj.mode != ObjectMode.EDIT:
+            continue
+        key = obj.data.as_pointer()
+        if key in checked:  # Linked duplicates share one edit mesh.
+            continue
+        checked.add(key)
+        bm = bmesh.from_edit_mesh(obj.data)
+        if len(bm.select_history):
+            return obj, bm
+    return None, None
+
+
+# Drops cached topology for meshes that have left edit mode, so only the objects being edited keep an index.
+def prune_topology_cache(context):
+    live = {obj.data.as_pointer() for obj in context.objects_in_mode if obj.type == 'MESH'}
+    topology_cache.prune(live)
+
+
+# ##################### Symmetry ##################### #
+
+# Takes a loop, ring or bounded selection and returns it together with its mirror image, if mirroring is on.
+# Mirror images that are hidden are left out.
+@profiling.phase('mirror')
+def with_mirror(prefs, obj, topo, new_sel):
+    if not prefs.mirror_selections or not new_sel:
+        return new_sel
+    index = topo.index
+
+    def read_coords():
+        obj.update_from_editmode()
+        return topology.read_coords(obj.data)
+
+    mirror_map = symmetry.MirrorMap.for_index(index, prefs.mirror_axis, prefs.mirror_tolerance, read_coords)
+    element_type = type(next(iter(new_sel)))
+    if element_type is bmesh.types.BMVert:
+        kind, seq, hidden = 'VERT', topo.bm.verts, index.vert_hide
+    elif element_type is bmesh.types.BMEdge:
+        kind, seq, hidden = 'EDGE', topo.bm.edges, index.edge_hide
+    else:
+        kind, seq, hidden = 'FACE', topo.bm.faces, index.face_hide
+    indices = np.fromiter(map(attrgetter('index'), new_sel), dtype=np.int64, count=len(new_sel))
+    mirrored = mirror_map.mirror(kind, indices)
+    return tuple(new_sel) + gather_elements(seq, mirrored[~hidden[mirrored]])
+
+
+# ##################### Topology Index ##################### #
+
+# Pairs a topology index with the BMesh it was validated against, so array walks can hand back BMesh elements.
+class BMeshTopology:
+    def __init__(self, bm, index, mesh_key):
+        self.bm = bm
+        self.index = index
+        self.mesh_key = mesh_key
+
+    # Runs walk(index, prefs, *start) through the result cache, keyed on this mesh's topology version,
+    # the starting component(s) and the preferences that kind of walk depends on.
+    def cached(self, kind, prefs, walk, *start):
+        result_cache.max_components = prefs.result_cache_size
+        key = cache.walk_key(kind, self.mesh_key, self.index.version, start, prefs)
+        return result_cache.fetch(key, lambda: walk(self.index, prefs, *start))
+
+    # Whole-mesh loop/ring labels, built on first use and kept with the index until the topology changes.
+    @property
+    def labels(self):
+        return edge_labels.EdgeLabels.for_index(self.index)
+
+    # Island labels for a set of select linked delimiters, built on first use and kept with the index like the labels.
+    def islands(self, delimit):
+        delimit_key = tuple(sorted(delimit))
+        return islands.IslandIndex.for_index(self.index, delimit_key,
+                                             lambda: delimit_edges(self.index, self.bm, delimit))
+
+    def verts(self, indices):
+        return gather_elements(self.bm.verts, indices)
+
+    def edges(self, indices):
+        return gather_elements(self.bm.edges, indices)
+
+    def faces(self, indices):
+        return gather_elements(self.bm.faces, indices)
+
+
+# Returns a BMeshTopology for the object's edit mesh, patching or rebuilding the cached index if edits since it was
+# last used call for it. Returns None if the index can't be trusted for this BMesh, which only happens if the edit
+# mesh can't be read back consistently; there are no BMesh walkers to fall back on, so the selection is cancelled.
+@profiling.phase('topology')
+def get_topology(obj, bm, element):
+    counts = (len(bm.verts), len(bm.edges), len(bm.faces))
+    bm.verts.index_update()
+    bm.edges.index_update()
+    bm.faces.index_update()
+
+    index = topology_cache.index_for(obj, counts, lambda index: topology_agrees(index, element))
+    if index is None:
+        return None
+    return BMeshTopology(bm, index, obj.data.as_pointer())
+
+
+# Pushes a selection change to the edit mesh without it being mistaken for an edit of the topology.
+@profiling.phase('update')
+def update_edit_selection(me):
+    topology_cache.expect_update(me.as_pointer())
+    bmesh.update_edit_mesh(me, loop_triangles=False, destructive=False)  # Nothing to re-tessellate after a selection.
+
+
+# ##################### Bulk Selection ##################### #
+
+# Takes a BMesh element sequence and indices and returns a tuple of the elements, gathered in a single call.
+def gather_elements(seq, indices):
+    if isinstance(indices, np.ndarray):
+        indices = indices.tolist()
+    seq.ensure_lookup_table()
+    if len(indices) == 0:
+        return ()
+    elif len(indices) == 1:
+        return (seq[indices[0]],)
+    return itemgetter(*indices)(seq)
+
+
+# Selects a collection of BMesh elements.
+# Large selections go through map() so the per-element attribute writes don't run through the interpreter loop.
+@profiling.phase('select')
+def select_elements(elements):
+    selected_log.append(elements)
+    profiling.count('selected', len(elements))
+    if len(elements) < BULK_SELECT_THRESHOLD:
+        for element in elements:
+            element.select = True
+    else:
+        deque(map(setattr, elements, repeat('select'), repeat(True)), maxlen=0)
+
+
+# Takes a BMesh element sequence and indices and selects those elements in bulk.
+def select_indices(seq, indices):
+    select_elements(gather_elements(seq, indices))
+
+
+# Takes a BMesh element sequence and an array of indices and returns their selection state as a boolean array.
+def selection_of(seq, indices):
+    elements = gather_elements(seq, indices)
+    return np.fromiter(map(attrgetter('select'), elements), dtype=bool, count=len(elements))
+
+
+# Flushes a new selection up to the edges and faces it completes.
+# With a selection that's small next to the mesh only the faces around it are checked, otherwise it's left to
+# Blender's whole-mesh flush.
+@profiling.phase('flush')
+def flush_selection(bm, topo, new_sel):
+    select_mode = bm.select_mode
+    if 'VERT' not in select_mode and 'EDGE' not in select_mode:
+        return  # Selecting a face already selects its verts and edges, so there's nothing to flush upwards.
+    if not new_sel or len(new_sel) * REGION_FLUSH_FACTOR > len(bm.faces):
+        bm.select_flush_mode()
+        return
+
+    index = topo.index
+    indices = np.fromiter(map(attrgetter('index'), new_sel), dtype=np.int64, count=len(new_sel))
+    if 'VERT' in select_mode:
+        edges = np.unique(index.edges_of_verts(indices))
+        faces = np.unique(index.faces_of_edges(edges))
+        loops, face_offsets = index.loops_of_faces(faces)
+        edge_verts = index.edge_verts[edges]
+        face_verts = index.loop_vert[loops]
+        verts = np.unique(np.concatenate((edge_verts.ravel(), face_verts)))
+        vert_sel = selection_of(bm.verts, verts)
+        edge_done = vert_sel[np.searchsorted(verts, edge_verts)].all(axis=1)
+        face_parts = vert_sel[np.searchsorted(verts, face_verts)]
+        select_indices(bm.edges, edges[edge_done])
+    else:
+        faces = np.unique(index.faces_of_edges(indices))
+        loops, face_offsets = index.loops_of_faces(faces)
+        face_edges = index.loop_edge[loops]
+        edges = np.unique(face_edges)
+        face_parts = selection_of(bm.edges, edges)[np.searchsorted(edges, face_edges)]
+    if len(faces):
+        face_done = np.logical_and.reduceat(face_parts, face_offsets[:-1])
+        select_indices(bm.faces, faces[face_done])
+
+
+# Spot-checks the index against the component being selected, to catch edits that kept the element counts intact.
+def topology_agrees(index, element):
+    if type(element) is bmesh.types.BMVert:
+        return index.vert_edge_count[element.index] == len(element.link_edges)
+    elif type(element) is bmesh.types.BMEdge:
+        return sorted(index.edge_verts[element.index].tolist()) == sorted(v.index for v in element.verts)
+    elif type(element) is bmesh.types.BMFace:
+        face_verts = [int(index.loop_vert[loop]) for loop in index.face_loops_of(element.index)]
+        return face_verts == [v.index for v in element.verts]
+    return False
+
+
+# Full edge loop on the topology index, straight from the loop labels when they exist and the loop is uncut.
+def indexed_loop_edge_manifold(index, prefs, edge):
+    labels = edge_labels.EdgeLabels.built_for(index)
+    edge_list = edge_labels.full_loop_edge(labels, prefs, edge) if labels is not None else None
+    if edge_list is None:
+        edge_list = topology.full_loop_edge_manifold(index, prefs, edge)
+    return edge_list
+
+
+# Full edge ring on the topology index, straight from the ring labels when they exist and the ring is uncut.
+def indexed_ring_edge_manifold(index, prefs, edge):
+    labels = edge_labels.EdgeLabels.built_for(index)
+    edge_list = edge_labels.full_ring_edge(labels, prefs, edge) if labels is not None else None
+    if edge_list is None:
+        edge_list = topology.full_ring_edge_manifold(index, prefs, edge)
+    return edge_list
+
+
+# Takes a vertex and returns a set of adjacent vertices.
+@profiling.phase('neighbours')
+def get_neighbour_verts(vertex):
+    edges = vertex.link_edges  # There's no nonmanifold check but that hasn't been a problem so far.
+    relevant_neighbour_verts = {v for e in edges for v in e.verts if v != vertex}
+    return relevant_neighbour_verts
+
+
+# Takes a face and returns a set of connected faces.
+@profiling.phase('neighbours')
+def get_neighbour_faces(face):
+    face_edges = face.edges  # There's no nonmanifold check but that hasn't been a problem so far.
+    relevant_neighbour_faces = {f for e in face_edges for f in e.link_faces if f != face}
+    return relevant_neighbour_faces
+
+
+# Takes an edge and returns a set of nearby edges.
+# Optionally takes a mode and will return only components for that mode, otherwise returns all.
+@profiling.phase('neighbours')
+def get_neighbour_edges(edge, mode=''):
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    if mode not in ['', 'LOOP', 'RING']:
+        bpy.ops.wm.report_err(err_type = 'ERROR_INVALID_INPUT',
+                              err_message = "ERROR: get_neighbour_edges mode must be one of: "
+                              + "'', 'LOOP', or 'RING'")
+        return {'CANCELLED'}
+
+    edge_faces = edge.link_faces
+    face_edges = {e for f in edge_faces for e in f.edges}
+
+    ring_edges = []
+    if len(edge_faces) > 0:
+        for f in edge_faces:
+            if len(f.verts) == 4:
+                # Get the only 2 verts that are not in the edge we start with.
+                target_verts = [v for v in f.verts if v not in edge.verts]
+                # Add the only edge that corresponds to those two verts.
+                ring_edges.extend([e for e in f.edges if target_verts[0] in e.verts and target_verts[1] in e.verts])
+
+    if edge.is_manifold:
+        # Vertices connected to more or less than 4 edges are disqualified.
+        loop_edges = [e for v in edge.verts for e in v.link_edges
+                     if len(v.link_edges) == 4 and e.is_manifold and e not in face_edges]
+    elif edge.is_boundary:
+        edge_verts = edge.verts
+        if not prefs.ignore_boundary_wires:
+            loop_edges = []
+            for v in edge_verts:
+                linked_edges = v.link_edges
+                for e in linked_edges:
+                    if not any([e for e in linked_edges if e.is_wire]):
+                        if e.is_boundary and e is not edge:
+                            loop_edges.append(e)
+        elif prefs.ignore_boundary_wires:
+            loop_edges = [e for v in edge_verts for e in v.link_edges
+                         if e.is_boundary and e is not edge]
+    # There may be more that we can do with wires but for now this will have to do.
+    elif edge.is_wire:
+        loop_edges = []
+        for vert in edge.verts:
+            linked_edges = vert.link_edges
+            if len(linked_edges) == 2:
+                loop_edges.extend([e for e in linked_edges if e.is_wire and e is not edge])
+    # Nonmanifold
+    elif len(edge_faces) > 2:
+        loop_edges = [e for v in edge.verts for e in v.link_edges
+                     if not e.is_manifold and not e.is_wire and e not in face_edges]
+
+    relevant_neighbour_edges = set(ring_edges + loop_edges)
+    if mode == '':
+        return relevant_neighbour_edges  # Returns a set.
+    elif mode == 'LOOP':
+        return loop_edges  # Returns a list, not a set. This is intentional.
+    elif mode == 'RING':
+        return ring_edges  # Returns a list, not a set. This is intentional.
+
+
+# Deselect everything and select only the given component. 
+# Replaces select_edge, select_vert, and select_face (NOT ACTUALLY BEING USED ANYWHERE AT THE MOMENT)
+def select_component(component):
+    bpy.ops.mesh.select_all(action='DESELECT')
+    component.select = True
+
+
+# Takes the active and previous active components and returns the bounded selection between them. With the
+# bounded_waypoints pref, the path carries on back through every earlier component of the same type in the select
+# history, one segment per pair of waypoints, and stops at the first pair with no bounded selection between them.
+# Every segment walks the same topology index, so the whole path is one selection and one undo step.
+def get_waypoint_selection(bm, component0, component1, mode, topo):
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    new_sel = get_bounded_selection(component0, component1, mode, topo)
+    if not new_sel or not prefs.bounded_waypoints:
+        return new_sel
+
+    waypoint = component1
+    for earlier in reversed(list(bm.select_history)[:-2]):
+        if type(earlier) is not type(component0):
+            break
+        if earlier.index == waypoint.index:
+            continue
+        segment = get_bounded_selection(waypoint, earlier, mode, topo)
+        if not segment:
+            break
+        profiling.count('waypoints')
+        new_sel |= segment
+        waypoint = earlier
+    return new_sel
+
+
+# Takes two components of the same type and returns a set of components that are bounded between them.
+@profiling.phase('walk')
+def get_bounded_selection(component0, component1, mode, topo):
+    prefs = bpy.context.preferences.addons[__name__].preferences
+
+    if not component0 or not component1 or component0.index == component1.index:
+        bpy.ops.wm.report_err(err_type = 'ERROR_INVALID_INPUT',
+                              err_message = "ERROR: You must supply two components of the same type and a mode.")
+        return {'CANCELLED'}
+    if mode not in ['VERT', 'EDGE', 'FACE']:
+        bpy.ops.wm.report_err(err_type = 'ERROR_INVALID_INPUT',
+                              err_message = "ERROR: get_bounded_selection mode must be one of "
+                              + "'VERT', 'EDGE', or 'FACE'")
+        return {'CANCELLED'}
+    if type(component0) != type(component1):
+        bpy.ops.wm.report_err(err_type = 'ERROR_INVALID_INPUT',
+                              err_message = "ERROR: Both components must be the same type and "
+                              + "must match the supplied mode.")
+        return {'CANCELLED'}
+
+    ends = [component0, component1]
+    c0 = component0
+    c1 = component1
+
+    if mode == 'VERT':
+        c0_edges = c0.link_edges
+        c0_boundary = [e for e in c0_edges if e.is_boundary]
+        c0_wire = [e for e in c0_edges if e.is_wire]
+
+        c1_edges = c1.link_edges
+        c1_boundary = [e for e in c1_edges if e.is_boundary]
+        c1_wire = [e for e in c1_edges if e.is_wire]
+
+        if len(c0_edges) == 0 or len(c1_edges) == 0:  # Floating vertex not connected to anything
+            return None
+
+        # At least one internal manifold vertex
+        if (c0.is_manifold and not c0.is_boundary) or (c1.is_manifold and not c1.is_boundary):
+            if c0.is_manifold and c1.is_manifold and not c0.is_boundary and not c1.is_boundary:  # Both are manifold
+                if len(c0_edges) == 4:
+                    starting_vert = c0
+                elif len(c0_edges) != 4 and len(c1_edges) == 4:
+                    starting_vert = c1
+                elif len(c0_edges) != 4 and len(c1_edges) != 4:
+                    return None
+            elif c0.is_manifold and not c0.is_boundary:  # One internal manifold and one of any other vertex type
+                starting_vert = c0
+            elif c1.is_manifold and not c1.is_boundary:  # One internal manifold and one of any other vertex type
+                starting_vert = c1
+            connected_loops = bounded_loop_vert_manifold(prefs, starting_vert, ends, topo)
+
+        # Two of any boundary vertex type
+        elif c0.is_boundary and c1.is_boundary:
+            if c0.is_manifold:  # Normal or "clean" boundary vert
+                starting_vert = c0
+            elif c1.is_manifold:  # Normal or "clean" boundary vert
+                starting_vert = c1
+            elif len(c0_wire) > 0 and len(c0_boundary) == 2:  # Boundary vert has wire edge but not self-intersect
+                starting_vert = c0
+            elif len(c1_wire) > 0 and len(c1_boundary) == 2:  # Boundary vert has wire edge but not self-intersect
+                starting_vert = c1
+            else:  # Only remaining possibility is both are intersect, in which case, good luck
+                starting_vert = c0
+            connected_loops = bounded_loop_vert_boundary(prefs, starting_vert, ends, topo)
+
+        # At least one wire vertex
+        elif c0.is_wire or c1.is_wire:
+            if c0.is_wire and c1.is_wire:  # Two wire verts
+                if 0 < len(c0_wire) < 3:  # Can attempt if 1 or 2 connected wire edges
+                    starting_vert = c0
+                elif 0 < len(c1_wire) < 3:  # Can attempt if 1 or 2 connected wire edges
+                    starting_vert = c1
+                elif len(c0_wire) > 2 and len(c1_wire) > 2:
+                    return None
+            elif (c0.is_wire or c1.is_wire) and (not c0.is_wire or not c1.is_wire):  # One wire and one not wire
+                return None
+            connected_loops = bounded_loop_vert_wire(prefs, starting_vert, ends, topo)
+
+        # Two non-manifold vertices (extrusion from a manifold topology edge)
+        elif not c0.is_manifold and not c1.is_manifold and not c0.is_boundary and not c1.is_boundary\
+             and len(c0_wire) == 0 and len(c1_wire) == 0:
+            connected_loops = bounded_loop_vert_nonmanifold(prefs, c0, ends, topo)
+            if connected_loops is None:
+                return None
+
+        # At least one internal with a wire extrusion
+        elif (not c0.is_boundary and len(c0_wire) > 0) or (not c1.is_boundary and len(c1_wire) > 0):
+            # Two internal with a wire extrusion
+            if not c0.is_boundary and len(c0_wire) > 0 and not c1.is_boundary and len(c1_wire) > 0:
+                starting_vert = c0
+            elif c0.is_boundary:  # One internal wire extrusion and one boundary of any type
+                starting_vert = c1
+            elif c1.is_boundary:  # One internal wire extrusion and one boundary of any type
+                starting_vert = c0
+            # One internal non-manifold edge extrusion and one internal wire extrusion
+            elif not c0.is_manifold and len(c0_wire) == 0 and not c1.is_boundary and len(c1_wire) > 0:
+                starting_vert = c1
+            # One internal non-manifold edge extrusion and one internal wire extrusion
+            elif not c1.is_manifold and len(c1_wire) == 0 and not c0.is_boundary and len(c0_wire) > 0:
+                starting_vert = c0
+            connected_loops = bounded_loop_vert_manifold(prefs, starting_vert, ends, topo)
+
+        else:  # Any other condition that's been missed
+            return None
+
+    if mode == 'EDGE':
+        c0_faces = c0.link_faces
+        c0_loop_dirs = get_neighbour_edges(c0, mode='LOOP')  # edges
+        c0_ring_dirs = get_neighbour_edges(c0, mode='RING')  # edges
+
+        c1_faces = c1.link_faces
+        c1_loop_dirs = get_neighbour_edges(c1, mode='LOOP')  # edges
+        c1_ring_dirs = get_neighbour_edges(c1, mode='RING')  # edges
+
+        connected_loops = []
+        if c0.is_manifold and c1.is_manifold:  # Manifold
+            starting_edge = c0
+
+            if len(c0_loop_dirs):
+                connected_loops = bounded_loop_edge_manifold(prefs, starting_edge, ends, topo)
+            if len(connected_loops) > 0:
+                # Priority behavior is that if there is a positive match for a bounded loop selection then
+                # return the loop selection. It doesn't care if there's an equal-length ring selection too.
+                pass
+            elif len(c0_ring_dirs):
+                if any(map(lambda x: len(x.verts) != 4, c0_faces)):
+                    starting_edge = c1
+
+                connected_loops = bounded_ring_edge_manifold(prefs, starting_edge, ends, topo)
+
+        elif c0.is_boundary and c1.is_boundary:  # Boundary
+            connected_loops = bounded_loop_edge_boundary(prefs, c0, ends, topo)
+
+        elif c0.is_wire and c1.is_wire:  # Wire
+            connected_loops = bounded_loop_edge_wire(prefs, c0, ends, topo)
+
+        elif len(c0_faces) > 2 and len(c1_faces) > 2:  # Non-manifold edge extrusion/intersection
+            connected_loops = bounded_loop_edge_nonmanifold(prefs, c0, ends, topo)
+            if connected_loops is None:
+                return None
+
+        elif c0.is_manifold and (c1.is_boundary or len(c1_faces) > 2):  # Only possible bounded selection is a ring.
+            starting_edge = c0
+            connected_loops = bounded_ring_edge_manifold(prefs, starting_edge, ends, topo)
+
+        elif c1.is_manifold and (c0.is_boundary or len(c0_faces) > 2):  # Only possible bounded selection is a ring.
+            starting_edge = c1
+            connected_loops = bounded_ring_edge_manifold(prefs, starting_edge, ends, topo)
+
+        # There is no conceivable condition where a wire edge can be part of any other type of loop or ring.
+        elif (c0.is_wire and not c1.is_wire) or (c1.is_wire and not c0.is_wire):
+            return None
+
+    if mode == 'FACE':
+        # Not implemented yet but if one of the faces is a triangle and the other is a quad we could use the triangle
+        # as our starting_face if the pref allows cause n=3 instead of n=4 to find out if the other face is connected
+        if not prefs.allow_non_quads_at_ends and (len(c0.verts) != 4 or len(c1.verts) != 4):
+            return None
+        if len(c0.verts) == 4:
+            starting_face = c0
+        elif len(c0.verts) != 4 and len(c1.verts) == 4:
+            starting_face = c1
+        else:
+            return None
+
+        connected_loops = bounded_loop_face(prefs, starting_face, ends, topo)
+
+    connected_loops.sort(key = lambda x: len(x))
+    if len(connected_loops) == 0:
+        return None
+    elif len(connected_loops) == 1:
+        return {i for i in connected_loops[0]}
+    # If multiple bounded loop candidates of identical length exist, this pref returns only the first loop.
+    elif prefs.return_single_loop and len(connected_loops) > 1:
+        return {i for i in connected_loops[0]}
+    else:
+        return {i for loop in connected_loops if len(loop) == len(connected_loops[0]) for i in loop}
+
+
+# ##################### Bounded Selections ##################### #
+
+# Takes 2 separated verts, and which vert to start with, and returns a list of loop lists of vertices.
+def bounded_loop_vert_manifold(prefs, starting_vert, ends, topo):
+    end_indices = tuple(c.index for c in ends)
+    loops = topology.bounded_loop_vert_manifold(topo.index, prefs, starting_vert.index, end_indices)
+    return [topo.verts(loop) for loop in loops]
+
+
+# Takes 2 separated boundary vertices, and which vertex to start with, and returns a list of loop lists of vertices.
+# NOTE: Must determine externally which vert to start with, whether the active or previous active
+# e.g. it is desirable to start on a boundary vert with only 2 boundary edges and no wire edges
+def bounded_loop_vert_boundary(prefs, starting_vert, ends, topo):
+    end_indices = tuple(c.index for c in ends)
+    loops = topology.bounded_loop_vert_boundary(topo.index, prefs, starting_vert.index, end_indices)
+    return [topo.verts(loop) for loop in loops]
+
+
+# Takes a wire vertex and a start/end vert and returns a list of wire vertices if they are part of a stand-alone loop
+# Only works on wire loops with 1-2 edges per vertex
+def bounded_loop_vert_wire(prefs, starting_vert, ends, topo):
+    end_indices = tuple(c.index for c in ends)
+    loops = topology.bounded_loop_vert_wire(topo.index, prefs, starting_vert.index, end_indices)
+    return [topo.verts(loop) for loop in loops] if loops is not None else None
+
+
+# Takes 2 separated faces, and which face to start with, and returns a list of loop lists of faces.
+def bounded_loop_face(prefs, starting_face, ends, topo):
+    end_indices = tuple(c.index for c in ends)
+    loops = topology.bounded_loop_face(topo.index, prefs, starting_face.index, end_indices)
+    return [topo.faces(loop) for loop in loops]
+
+
+# Takes 2 separated edges, and which edge to start with, and returns a list of loop lists of edges.
+def bounded_loop_edge_manifold(prefs, starting_edge, ends, topo):
+    end_indices = tuple(c.index for c in ends)
+    loops = edge_labels.bounded_loop_edge(topo.labels, prefs, starting_edge.index, end_indices)
+    return [topo.edges(loop) for loop in loops]
+
+
+# Takes 2 separated edges, and which edge to start with, and returns a list of ring lists of edges.
+def bounded_ring_edge_manifold(prefs, starting_edge, ends, topo):
+    end_indices = tuple(c.index for c in ends)
+    loops = edge_labels.bounded_ring_edge(topo.labels, prefs, starting_edge.index, end_indices)
+    return [topo.edges(loop) for loop in loops]
+
+
+# Takes 2 separated boundary edges, and which edge to start with, and returns a list of loop lists of edges.
+def bounded_loop_edge_boundary(prefs, starting_edge, ends, topo):
+    end_indices = tuple(c.index for c in ends)
+    loops = topology.bounded_loop_edge_boundary(topo.index, prefs, starting_edge.index, end_indices)
+    return [topo.edges(loop) for loop in loops]
+
+
+# Takes a wire edge and a start/end edge and returns a list of wire vertices if they are part of a stand-alone loop
+# Only works on wire loops with 1-2 edges per vertex
+def bounded_loop_edge_wire(prefs, starting_edge, ends, topo):
+    end_indices = tuple(c.index for c in ends)
+    loops = topology.bounded_loop_edge_wire(topo.index, prefs, starting_edge.index, end_indices)
+    return [topo.edges(loop) for loop in loops]
+
+
+# Takes 2 separated non-manifold verts, and which vert to start with, and returns a list of loop lists of vertices.
+def bounded_loop_vert_nonmanifold(prefs, starting_vert, ends, topo):
+    end_indices = tuple(c.index for c in ends)
+    loops = topology.bounded_loop_vert_nonmanifold(topo.index, prefs, starting_vert.index, end_indices)
+    return [topo.verts(loop) for loop in loops]
+
+
+# Takes 2 separated non-manifold edges, and which edge to start with, and returns a list of loop lists of edges.
+def bounded_loop_edge_nonmanifold(prefs, starting_edge, ends, topo):
+    end_indices = tuple(c.index for c in ends)
+    loops = topology.bounded_loop_edge_nonmanifold(topo.index, prefs, starting_edge.index, end_indices)
+    return [topo.edges(loop) for loop in loops]
+
+
+# ##################### Full Loop Selections ##################### #
+
+# Takes a starting vertex and a connected reference edge and returns a full loop of vertex indices.
+@profiling.phase('walk')
+def full_loop_vert_manifold(prefs, starting_vert, starting_edge, topo):
+    vert_list = topo.cached('VERT_LOOP', prefs, topology.full_loop_vert_manifold,
+                            starting_vert.index, starting_edge.index)
+    return set(topo.verts(vert_list)) if vert_list is not None else None
+
+
+# Takes a boundary vertex and returns a list of boundary vertices.
+# NOTE: Must determine externally which vert to start with, whether the active or previous active
+# e.g. it is desirable to start on a boundary vert with only 2 boundary edges and no wire edges
+@profiling.phase('walk')
+def full_loop_vert_boundary(prefs, starting_vert, topo):
+    vert_list = topo.cached('VERT_BOUNDARY', prefs, topology.full_loop_vert_boundary, starting_vert.index)
+    return set(topo.verts(vert_list))
+
+
+# Takes a wire vertex and returns a list of wire vertices if they are part of a stand-alone loop
+# Only works on wire loops with 1-2 edges per vertex
+@profiling.phase('walk')
+def full_loop_vert_wire(prefs, starting_vert, topo):
+    vert_list = topo.cached('VERT_WIRE', prefs, topology.full_loop_vert_wire, starting_vert.index)
+    return set(topo.verts(vert_list)) if vert_list is not None else None
+
+
+# Takes an edge and face and returns a loop of face indices (as a set) for the ring direction of that edge.
+@profiling.phase('walk')
+def full_loop_face(edge, face, topo):
+    if len(edge.link_loops) > 2:
+        return None
+
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    face_list = topo.cached('FACE_LOOP', prefs, topology.full_loop_face, edge.index, face.index)
+    return set(topo.faces(face_list))
+
+
+# Takes an edge and returns a full loop of edge indices.
+@profiling.phase('walk')
+def full_loop_edge_manifold(edge, topo):
+    prefs = bpy.context.preferences.addons[__name__].preferences
+    return set(topo.edges(topo.cached('EDGE_LOOP', prefs, indexed_loop_edge_manifold, edge.index)))
+
+
+# Takes an edge and returns a ring of edge indices (as a set) for that edge.
+@profiling.phase('walk')
+def full_ring_edge_manifold(prefs, starting_edge, topo):
+    return set(topo.edges(topo.cached('EDGE_RING', prefs, indexed_ring_edge_manifold, starting_edge.index)))
+
+
+# Takes a boundary edge and returns a list of boundary edge indices.
+@profiling.phase('walk')
+def full_loop_edge_boundary(prefs, edge, topo):
+    edge_list = topo.cached('EDGE_BOUNDARY', prefs, topology.full_loop_edge_boundary, edge.index)
+    return set(topo.edges(edge_list))
+
+
+# Takes a wire edge and returns a list of connected wire edges in a loop.
+# Only works on wire loops with 1-2 edges per vertex
+@profiling.phase('walk')
+def full_loop_edge_wire(prefs, edge, topo):
+    edge_list = topo.cached('EDGE_WIRE', prefs, topology.full_loop_edge_wire, edge.index)
+    return set(topo.edges(edge_list))
+
+
+# Takes a non-manifold edge (more than two faces) and returns the vertices along the non-manifold edges chained to it.
+@profiling.phase('walk')
+def full_loop_vert_nonmanifold(prefs, edge, topo):
+    vert_list = topo.cached('VERT_NONMANIFOLD', prefs, topology.full_loop_vert_nonmanifold, edge.index)
+    return set(topo.verts(vert_list)) if vert_list is not None else None
+
+
+# Takes a non-manifold edge and returns the non-manifold edges chained to it.
+@profiling.phase('walk')
+def full_loop_edge_nonmanifold(prefs, edge, topo):
+    edge_list = topo.cached('EDGE_NONMANIFOLD', prefs, topology.full_loop_edge_nonmanifold, edge.index)
+    return set(topo.edges(edge_list)) if edge_list is not None else None
+
+
+def register():
+    for every_class in classes:
+        bpy.utils.register_class(every_class)
+    cs_register_keymap_keys()
+    cache_manager.register()
+    preview.register()
+    addon = bpy.context.preferences.addons.get(__name__)
+    if addon is not None:
+        cs_update_profiling(addon.preferences, bpy.context)
+        cs_update_persistence(addon.preferences, bpy.context)
+        cs_update_labeling(addon.preferences, bpy.context)
+
+
+def unregister():
+    for every_class in classes:
+        bpy.utils.unregister_class(every_class)
+    cs_unregister_keymap_keys()
+    cache_manager.unregister()
+    preview.unregister()
+
+
+if __name__ == "__main__":
+    register()
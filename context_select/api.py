@@ -0,0 +1,276 @@
+"""Context Select's loop and ring walks as plain functions, for scripts and batch jobs.
+
+Nothing here needs edit mode, an operator or the add-on preferences: every function takes a mesh, the component(s)
+to start from and an Options object, and returns arrays of vert, edge or face indices. A mesh can be a
+bpy.types.Mesh (read as it is, so not one in edit mode), a BMesh, for instance from bmesh.new() and
+BMesh.from_mesh(), or a topology index made by index_mesh(). Index a mesh once when asking it several questions.
+
+    from context_select import api
+
+    index = api.index_mesh(bpy.data.meshes["Cylinder"])
+    options = api.Options(terminate_self_intersects=True)
+    for loop in api.loops_across_ring(index, 0, options=options):
+        print(loop)
+"""
+import numpy as np
+
+from . import topology
+from . import edge_labels
+
+
+class Options:
+    """The walk settings the add-on otherwise takes from its preferences, with the same defaults."""
+
+    def __init__(self, ignore_hidden_geometry=False, terminate_self_intersects=False, ignore_boundary_wires=False,
+                 allow_non_quads_at_ends=True, return_single_loop=False):
+        self.ignore_hidden_geometry = ignore_hidden_geometry
+        self.terminate_self_intersects = terminate_self_intersects
+        self.ignore_boundary_wires = ignore_boundary_wires
+        self.allow_non_quads_at_ends = allow_non_quads_at_ends
+        self.return_single_loop = return_single_loop
+
+    def __repr__(self):
+        return "Options({})".format(", ".join("{}={!r}".format(name, value) for name, value in vars(self).items()))
+
+
+# Takes a Mesh, a BMesh or an existing index and returns the topology index the other functions walk.
+def index_mesh(mesh):
+    if isinstance(mesh, topology.TopologyIndex):
+        return mesh
+    if hasattr(mesh, 'polygons'):
+        return topology.TopologyIndex.from_mesh(mesh)
+    if hasattr(mesh, 'faces') and hasattr(mesh, 'verts'):
+        mesh.verts.index_update()
+        mesh.edges.index_update()
+        mesh.faces.index_update()
+        return topology.TopologyIndex.from_bmesh(mesh)
+    raise TypeError("Expected a Mesh, a BMesh or a topology index, not {}".format(type(mesh).__name__))
+
+
+# ##################### Loops and Rings ##################### #
+
+# Returns the edge loop through an edge, following boundaries, wires and non-manifold edges as a double-click does.
+def edge_loop(mesh, edge, options=None):
+    index, options = index_mesh(mesh), options or Options()
+    _check(index.edge_count, edge, "edge")
+    faces = index.edge_face_count[edge]
+    if faces == 2:
+        edge_list = topology.full_loop_edge_manifold(index, options, edge)
+    elif faces == 1:
+        edge_list = topology.full_loop_edge_boundary(index, options, edge)
+    elif faces == 0:
+        edge_list = topology.full_loop_edge_wire(index, options, edge)
+    else:
+        edge_list = topology.full_loop_edge_nonmanifold(index, options, edge)
+    return _array(edge_list)
+
+
+# Returns the edge ring through an edge with one or two faces, or an empty array for any other edge.
+def edge_ring(mesh, edge, options=None):
+    index, options = index_mesh(mesh), options or Options()
+    _check(index.edge_count, edge, "edge")
+    if index.edge_face_count[edge] not in (1, 2):
+        return _array(None)
+    return _array(topology.full_ring_edge_manifold(index, options, edge))
+
+
+# Returns the vertex loop running from a vert along one of its edges.
+def vert_loop(mesh, vert, edge, options=None):
+    index, options = index_mesh(mesh), options or Options()
+    _check(index.vert_count, vert, "vert")
+    _check(index.edge_count, edge, "edge")
+    if vert not in index.edge_verts[edge]:
+        raise ValueError("Edge {} doesn't use vert {}".format(edge, vert))
+    faces = index.edge_face_count[edge]
+    if faces == 2:
+        vert_list = topology.full_loop_vert_manifold(index, options, vert, edge)
+    elif faces == 1:
+        vert_list = topology.full_loop_vert_boundary(index, options, vert)
+    elif faces == 0:
+        vert_list = topology.full_loop_vert_wire(index, options, vert)
+    else:
+        vert_list = topology.full_loop_vert_nonmanifold(index, options, edge)
+    return _array(vert_list)
+
+
+# Returns the face loop running from a face across one of its edges.
+def face_loop(mesh, face, edge, options=None):
+    index, options = index_mesh(mesh), options or Options()
+    _check(index.face_count, face, "face")
+    _check(index.edge_count, edge, "edge")
+    if edge not in index.loop_edge[list(index.face_loops_of(face))]:
+        raise ValueError("Face {} doesn't use edge {}".format(face, edge))
+    return _array(topology.full_loop_face(index, options, edge, face))
+
+
+# Returns every edge loop crossing the ring through an edge, or the loops through every nth ring edge counted from
+# it, one array per loop. A loop crossing the ring more than once is only returned once.
+def loops_across_ring(mesh, edge, nth=1, options=None):
+    index, options = index_mesh(mesh), options or Options()
+    ring = edge_ring(index, edge, options).tolist()
+    if not ring:
+        return []
+    loops = topology.loops_across_ring(ring, edge, nth, lambda ring_edge: edge_loop(index, ring_edge, options).tolist())
+    return [_array(loop) for loop in loops]
+
+
+# Returns every edge loop of the mesh in walk order, for edges with two faces, and whether each one is cyclic.
+# Hidden components and self-intersections don't cut these; they're the loops as the topology has them.
+def all_edge_loops(mesh):
+    labels = edge_labels.EdgeLabels.for_index(index_mesh(mesh))
+    return _split(labels.loop_members, labels.loop_offsets), labels.loop_cyclic.copy()
+
+
+# Returns every edge ring of the mesh in walk order, for edges with one or two faces, and whether each is cyclic.
+def all_edge_rings(mesh):
+    labels = edge_labels.EdgeLabels.for_index(index_mesh(mesh))
+    return _split(labels.ring_members, labels.ring_offsets), labels.ring_cyclic.copy()
+
+
+# ##################### Loop Report ##################### #
+
+# Returns a summary of the loop topology of a whole mesh for retopology QA, as a dict that dumps straight to JSON:
+# face counts by type, interior poles counted by valence, and for edge loops and face loops, how many there are, how
+# many are cyclic, a histogram of their lengths and the self-intersecting ones (spirals and loops crossing themselves).
+# A self-intersecting edge loop is listed by one of its edges, a face loop by one of its faces and the edge it crosses
+# into the next face, ready for edge_loop() and face_loop(). Face loops are measured in faces, along the edge rings
+# running through them.
+# Every loop comes from one labeling pass over the mesh, which is also kept on the index for later selections.
+def loop_report(mesh):
+    index = index_mesh(mesh)
+    labels = edge_labels.EdgeLabels.for_index(index)
+    vert_bits = np.frombuffer(index.walk_flags()[0], dtype=np.uint8)
+    interior = ((vert_bits & (topology.BOUNDARY | topology.WIRE)) == 0) & (index.vert_edge_count > 0)
+    valence = index.vert_edge_count[interior]
+
+    loop_starts = labels.loop_offsets[:-1]
+    ring_starts = labels.ring_offsets[:-1]
+    ring_faces = np.diff(np.concatenate(([0], np.cumsum(labels.ring_joints >= 0)))[labels.ring_offsets])
+    face_loops = np.flatnonzero(ring_faces > 0)
+    crossing_loops = np.flatnonzero(labels.loop_self_intersects)
+    crossing_rings = face_loops[labels.ring_self_intersects[face_loops]]
+    return {
+        'verts': index.vert_count,
+        'edges': index.edge_count,
+        'faces': index.face_count,
+        'face_types': {'triangles': int(np.count_nonzero(index.face_loop_total == 3)),
+                       'quads': int(np.count_nonzero(index.face_loop_total == 4)),
+                       'ngons': int(np.count_nonzero(index.face_loop_total > 4))},
+        'poles': _histogram(valence[valence != 4]),
+        'edge_loops': {
+            'count': labels.loop_count,
+            'cyclic': int(np.count_nonzero(labels.loop_cyclic)),
+            'lengths': _histogram(labels.loop_lengths()),
+            'self_intersecting': [{'edge': int(labels.loop_members[loop_starts[loop]]),
+                                   'length': int(labels.loop_lengths()[loop]),
+                                   'cyclic': bool(labels.loop_cyclic[loop])} for loop in crossing_loops.tolist()],
+        },
+        'face_loops': {
+            'count': len(face_loops),
+            'cyclic': int(np.count_nonzero(labels.ring_cyclic[face_loops])),
+            'lengths': _histogram(ring_faces[face_loops]),
+            'self_intersecting': [{'face': int(labels.ring_joints[ring_starts[ring]]),
+                                   'edge': int(labels.ring_members[ring_starts[ring] + 1]),
+                                   'length': int(ring_faces[ring]),
+                                   'cyclic': bool(labels.ring_cyclic[ring])} for ring in crossing_rings.tolist()],
+        },
+    }
+
+
+# Takes an array of whole numbers and returns how many times each one appears, smallest first.
+def _histogram(values):
+    numbers, counts = np.unique(values, return_counts=True)
+    return dict(zip(numbers.tolist(), counts.tolist()))
+
+
+# ##################### Bounded Selections ##################### #
+
+# Each of these returns the shortest loops running between two components, or only the first of them with
+# return_single_loop, as one array each. The list is empty if there's no loop between them.
+
+# Edge loops between two edges, or the edge rings between them if they aren't on a loop together.
+def bounded_edge_loops(mesh, start, end, options=None):
+    index, options = index_mesh(mesh), options or Options()
+    _check_pair(index.edge_count, start, end, "edge")
+    ends = [start, end]
+    faces = index.edge_face_count[ends].tolist()
+    if faces == [2, 2]:
+        loops = topology.bounded_loop_edge_manifold(index, options, start, ends)
+        if not loops:
+            loops = topology.bounded_ring_edge_manifold(index, options, start, ends)
+    elif faces == [1, 1]:
+        loops = topology.bounded_loop_edge_boundary(index, options, start, ends)
+    elif faces == [0, 0]:
+        loops = topology.bounded_loop_edge_wire(index, options, start, ends)
+    elif min(faces) > 2:
+        loops = topology.bounded_loop_edge_nonmanifold(index, options, start, ends)
+    elif 2 in faces and 0 not in faces:  # Only a ring can run from a manifold edge to a boundary or non-manifold one.
+        ring_start = start if faces[0] == 2 else end
+        loops = topology.bounded_ring_edge_manifold(index, options, ring_start, ends)
+    else:
+        loops = []
+    return _shortest(loops, options)
+
+
+# Vertex loops between two verts. Walks start from whichever vert has four faces around it, otherwise along
+# boundaries, wires or non-manifold edges when both verts are on them.
+def bounded_vert_loops(mesh, start, end, options=None):
+    index, options = index_mesh(mesh), options or Options()
+    _check_pair(index.vert_count, start, end, "vert")
+    ends = [start, end]
+    face_counts = [index.edge_face_count[index.vert_edges_of(vert)] for vert in ends]
+    if 0 in map(len, face_counts):
+        return []
+    regular = [len(counts) == 4 and (counts == 2).all() and index.vert_loop_count[vert] == 4
+               for vert, counts in zip(ends, face_counts)]
+    if any(regular):
+        loops = topology.bounded_loop_vert_manifold(index, options, ends[regular.index(True)], ends)
+    elif all((counts == 1).any() for counts in face_counts):
+        loops = topology.bounded_loop_vert_boundary(index, options, start, ends)
+    elif all((counts == 0).all() for counts in face_counts):
+        loops = topology.bounded_loop_vert_wire(index, options, start, ends)
+    elif all((counts > 2).any() for counts in face_counts):
+        loops = topology.bounded_loop_vert_nonmanifold(index, options, start, ends)
+    else:
+        loops = []
+    return _shortest(loops or [], options)
+
+
+# Face loops between two faces, walked from whichever of them is a quad.
+def bounded_face_loops(mesh, start, end, options=None):
+    index, options = index_mesh(mesh), options or Options()
+    _check_pair(index.face_count, start, end, "face")
+    quads = (index.face_loop_total[[start, end]] == 4).tolist()
+    if not any(quads) or (not all(quads) and not options.allow_non_quads_at_ends):
+        return []
+    starting_face = start if quads[0] else end
+    return _shortest(topology.bounded_loop_face(index, options, starting_face, [start, end]), options)
+
+
+def _shortest(loops, options):
+    if not loops:
+        return []
+    shortest = min(map(len, loops))
+    loops = [_array(loop) for loop in loops if len(loop) == shortest]
+    return loops[:1] if options.return_single_loop else loops
+
+
+# Splits packed chain members into one array per chain, and into no arrays at all when there are no chains.
+def _split(members, offsets):
+    return np.split(members, offsets[1:-1]) if len(offsets) > 1 else []
+
+
+def _array(indices):
+    return np.array(indices if indices else [], dtype=np.int32)
+
+
+def _check(count, component, name):
+    if not 0 <= component < count:
+        raise IndexError("No {} {}, the mesh has {}".format(name, component, count))
+
+
+def _check_pair(count, start, end, name):
+    _check(count, start, name)
+    _check(count, end, name)
+    if start == end:
+        raise ValueError("A bounded selection needs two different {}s".format(name))
@@ -0,0 +1,92 @@
+"""Result cache for Context Select walks."""
+from collections import OrderedDict
+
+
+class ResultCache:
+    """Least recently used cache of walk results, bounded by the total number of components stored.
+
+    Keys are expected to include the topology version of the mesh, so results from before an edit are never
+    returned; they simply age out.
+    """
+
+    def __init__(self, max_components=1000000):
+        self.max_components = max_components
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Returns the cached result for key, or calls compute() and stores what it returns.
+    def fetch(self, key, compute):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        result = compute()
+        self.put(key, result)
+        return result
+
+    def put(self, key, result):
+        if result is not None:
+            result = tuple(result)
+        cost = _cost(result)
+        if cost > self.max_components:
+            return
+        self.discard(key)
+        self.entries[key] = result
+        self.size += cost
+        while self.size > self.max_components:
+            _old_key, old_result = self.entries.popitem(last=False)
+            self.size -= _cost(old_result)
+            self.evictions += 1
+
+    def discard(self, key):
+        if key in self.entries:
+            self.size -= _cost(self.entries.pop(key))
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'components': self.size,
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+# Components a result holds, plus one for the entry itself so empty results still count against the limit.
+def _cost(result):
+    return len(result) + 1 if result is not None else 1
+
+
+# The preferences each kind of walk depends on; anything else can change without invalidating a result.
+WALK_PREFS = {
+    'VERT_LOOP': ('ignore_hidden_geometry', 'terminate_self_intersects'),
+    'EDGE_LOOP': ('ignore_hidden_geometry', 'terminate_self_intersects'),
+    'EDGE_RING': ('ignore_hidden_geometry', 'terminate_self_intersects'),
+    'FACE_LOOP': ('ignore_hidden_geometry', 'terminate_self_intersects', 'allow_non_quads_at_ends'),
+    'VERT_BOUNDARY': ('ignore_hidden_geometry', 'terminate_self_intersects', 'ignore_boundary_wires'),
+    'EDGE_BOUNDARY': ('ignore_hidden_geometry', 'terminate_self_intersects', 'ignore_boundary_wires'),
+    'VERT_WIRE': ('ignore_hidden_geometry',),
+    'EDGE_WIRE': ('ignore_hidden_geometry',),
+    'VERT_NONMANIFOLD': ('ignore_hidden_geometry',),
+    'EDGE_NONMANIFOLD': ('ignore_hidden_geometry',),
+}
+
+
+# Builds the cache key for a walk of the given kind starting at start (a tuple of component indices).
+def walk_key(kind, mesh_key, version, start, prefs):
+    return (kind, mesh_key, version, start, tuple(getattr(prefs, name) for name in WALK_PREFS[kind]))
@@ -0,0 +1,288 @@
+"""Keeps the per-mesh topology indexes in step with edits, rebuilding them only when a walk needs one."""
+from itertools import count
+
+import bpy
+from bpy.app.handlers import persistent
+
+from . import topology
+from . import sidecar
+
+# What an edit may have done to an index since it was last validated, from least to most.
+COORDS = 'COORDS'  # Only positions or UVs changed, so the index only drops the UV indexes built on it.
+HIDE = 'HIDE'  # Only hidden flags changed, so the index can be patched in place.
+TOPOLOGY = 'TOPOLOGY'  # Anything could have changed, so the index has to be rebuilt.
+CHANGE_LEVELS = (None, COORDS, HIDE, TOPOLOGY)
+
+# Operators (by the prefix of their C style bl_idname) that only select components.
+# Edits made by these leave the index as it is.
+SELECT_OPERATORS = (
+    'VIEW3D_OT_select',
+    'MESH_OT_select_',
+    'MESH_OT_loop_select',
+    'MESH_OT_edgering_select',
+    'MESH_OT_shortest_path_',
+    'OBJECT_OT_context_select',
+    'UV_OT_select',
+    'UV_OT_shortest_path_',
+)
+# Operators that only move components or their UVs.
+COORDS_OPERATORS = (
+    'TRANSFORM_OT_',
+    'MESH_OT_vertices_smooth',
+    'UV_OT_',
+)
+# UV operators that change the mesh itself.
+UV_TOPOLOGY_OPERATORS = ('UV_OT_mark_seam', 'UV_OT_seams_from_islands')
+HIDE_OPERATORS = ('MESH_OT_hide', 'MESH_OT_reveal', 'UV_OT_hide', 'UV_OT_reveal')
+
+
+class TopologyCache:
+    """Topology indexes by mesh pointer, plus what has happened to each mesh since its index was validated.
+
+    The depsgraph handlers only record that a mesh's geometry was touched. Working out whether that touched the
+    topology is left until a walk asks for the index, by looking at the operators that ran in the meantime:
+    moves and selections keep it, hiding patches it, and anything else (or an edit no operator accounts for,
+    like a script or an undo) rebuilds it. Moves also drop the UV indexes and mirror maps built on the index.
+
+    Only registered operators are listed, so a touch is only put down to one that can change geometry and either
+    was the last listed when the touch happened or, for modal operators that update the mesh before they finish,
+    was listed after it. A touch from a script or an unlisted operator is never put down to a later selection.
+    """
+
+    def __init__(self):
+        self.indices = {}  # Mesh pointer -> TopologyIndex
+        self.touched = set()  # Meshes whose geometry changed since their index was validated.
+        self.stale = set()  # Meshes that have to be rebuilt whatever the operators say.
+        self.own_updates = set()  # Meshes we're about to update ourselves, after a selection.
+        self.validated_at = {}  # Mesh pointer -> the last registered operator when the index was validated.
+        self.accounted_by = {}  # Mesh pointer -> the last registered operator, when it accounted for the last touch.
+        self.unaccounted_at = {}  # Mesh pointer -> the last registered operator at the first unaccounted touch.
+        self.versions = count(1)  # Every new or patched index gets a new version, so old cached results never match.
+        self.edit_counts = {}  # Mesh pointer -> geometry changes since indexed, for anything drawn from positions.
+        self.persist = False  # Whether big meshes' indexes are saved next to the .blend and loaded from there.
+
+    def __len__(self):
+        return len(self.indices)
+
+    def clear(self):
+        self.indices.clear()
+        self.touched.clear()
+        self.stale.clear()
+        self.own_updates.clear()
+        self.validated_at.clear()
+        self.accounted_by.clear()
+        self.unaccounted_at.clear()
+        self.edit_counts.clear()
+
+    # Drops the indexes of every mesh not in live_keys.
+    def prune(self, live_keys):
+        for key in set(self.indices) - set(live_keys):
+            del self.indices[key]
+            self._forget_touches(key)
+            self.stale.discard(key)
+            self.validated_at.pop(key, None)
+            self.edit_counts.pop(key, None)
+
+    # Call before updating an edit mesh after only changing its selection, so the update isn't taken for an edit.
+    def expect_update(self, key):
+        if key in self.indices:
+            self.own_updates.add(key)
+
+    # Takes the meshes one depsgraph update changed the geometry of. Our own updates are always evaluated next, so
+    # whatever they didn't account for here has been evaluated some other way and is forgotten.
+    def geometry_changed(self, keys):
+        changed = [key for key in keys if key in self.indices and key not in self.own_updates]
+        if changed:
+            self.touched.update(changed)
+            last, idname = _last_operator(), _last_operator_idname()
+            editing = idname is not None and operator_change(idname) is not None
+            for key in changed:
+                self.edit_counts[key] = self.edit_counts.get(key, 0) + 1
+                # One operator accounts for one touch; another touch after it is from something unlisted.
+                if editing and last != self.validated_at.get(key) and last != self.accounted_by.get(key):
+                    self.accounted_by[key] = last
+                else:
+                    self.unaccounted_at.setdefault(key, last)
+        self.own_updates.clear()
+
+    # Returns how many times the geometry of the mesh at key has changed since it was first indexed, moves included.
+    def edits(self, key):
+        return self.edit_counts.get(key, 0)
+
+    def _forget_touches(self, key):
+        self.touched.discard(key)
+        self.accounted_by.pop(key, None)
+        self.unaccounted_at.pop(key, None)
+
+    def invalidate_all(self):
+        self.stale.update(self.indices)
+
+    # Returns how far the index for key may be out of date: None, COORDS, HIDE or TOPOLOGY.
+    def pending_change(self, key):
+        if key in self.stale:
+            return TOPOLOGY
+        if key not in self.touched:
+            return None
+        ops = _operators_since(self.validated_at.get(key))
+        if not ops:  # Touched by something that didn't register an operator, so assume the worst.
+            return TOPOLOGY
+        if key in self.unaccounted_at:  # Only an editing operator finishing after the touch can account for it.
+            later = _operators_since(self.unaccounted_at[key])
+            if not later or all(operator_change(idname) is None for idname in later):
+                return TOPOLOGY
+        change = None
+        for idname in ops:
+            change = max(change, operator_change(idname), key=CHANGE_LEVELS.index)
+            if change == TOPOLOGY:
+                break
+        return change
+
+    # Returns the cached index for key if it can be used as it is, without validating it, otherwise None.
+    # For callers that run far more often than walks do, like the hover preview.
+    def current(self, key, counts):
+        index = self.indices.get(key)
+        if index is None or index.counts() != counts or self.pending_change(key) not in (None, COORDS):
+            return None
+        return index
+
+    # Returns the topology index for an object's edit mesh, patched or rebuilt as needed. counts are the BMesh element
+    # counts and agrees(index) spot-checks the index against the BMesh; if either still fails after a rebuild the
+    # index can't be trusted and None is returned.
+    def index_for(self, obj, counts, agrees):
+        me = obj.data
+        key = me.as_pointer()
+        index = self.indices.get(key)
+        change = self.pending_change(key) if index is not None else TOPOLOGY
+
+        if change in (COORDS, HIDE) and index is not None:
+            index.uv_indices = None
+        if change == COORDS and index is not None:
+            index.mirror_maps = None  # Verts are paired up by position.
+        if change == HIDE and index.counts() == counts:
+            obj.update_from_editmode()
+            index.update_hide(*topology.read_hide(me))
+            index.version = next(self.versions)
+        if change == TOPOLOGY or index.counts() != counts or not agrees(index):
+            obj.update_from_editmode()  # Sync the mesh so the bulk reads see the current edit-mode topology.
+            index = sidecar.load_or_build(self.sidecar_directory(), topology.read_topology(me), topology.read_hide(me))
+            index.version = next(self.versions)
+            self.indices[key] = index
+
+        self._forget_touches(key)
+        self.stale.discard(key)
+        self.validated_at[key] = _last_operator()
+        if index.counts() != counts or not agrees(index):
+            return None
+        return index
+
+    # Returns the directory indexes are saved to and loaded from, or None if they aren't.
+    def sidecar_directory(self):
+        if not self.persist or not bpy.data.filepath:
+            return None
+        return sidecar.directory_for(bpy.data.filepath)
+
+    # Saves the index of every mesh in the file whose index is up to date, and deletes saved indexes nothing uses.
+    def save_sidecars(self):
+        directory = self.sidecar_directory()
+        if directory is None:
+            return
+        meshes = {me.as_pointer(): me for me in bpy.data.meshes}
+        try:
+            for key, index in self.indices.items():
+                if key in meshes and self.pending_change(key) in (None, COORDS):
+                    sidecar.save(directory, index, meshes[key].name)
+            sidecar.prune(directory, {me.name for me in meshes.values()})
+        except OSError as error:
+            print("Context Select: couldn't save topology indexes to {}: {}".format(directory, error))
+
+
+# Returns what an operator, by its C style bl_idname, may have changed.
+def operator_change(idname):
+    if idname.startswith(HIDE_OPERATORS):
+        return HIDE
+    if idname.startswith(SELECT_OPERATORS):
+        return None
+    if idname.startswith(COORDS_OPERATORS) and not idname.startswith(UV_TOPOLOGY_OPERATORS):
+        return COORDS
+    return TOPOLOGY
+
+
+# Returns the bl_idnames of the registered operators that ran after the one at pointer since (None for none), oldest
+# first, or None if it has already dropped off the list and what ran in between is unknown.
+def _operators_since(since):
+    operators = list(bpy.context.window_manager.operators)
+    pointers = [op.as_pointer() for op in operators]
+    if since is None:
+        start = 0
+    elif since in pointers:
+        start = pointers.index(since) + 1
+    else:
+        return None
+    return [op.bl_idname for op in operators[start:]]
+
+
+def _last_operator():
+    operators = bpy.context.window_manager.operators
+    return operators[-1].as_pointer() if len(operators) else None
+
+
+def _last_operator_idname():
+    operators = bpy.context.window_manager.operators
+    return operators[-1].bl_idname if len(operators) else None
+
+
+topology_cache = TopologyCache()
+
+
+@persistent
+def depsgraph_update_post(scene, depsgraph):
+    keys = set()
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry:
+            continue  # Selection changes come through as their own kind of update and never touch the topology.
+        data = update.id.original
+        if isinstance(data, bpy.types.Object):
+            data = data.data
+        if isinstance(data, bpy.types.Mesh):
+            keys.add(data.as_pointer())
+    topology_cache.geometry_changed(keys)
+
+
+# Undo and redo replace the edit mesh wholesale, without an operator to tell what they changed.
+@persistent
+def undo_post(*args):
+    topology_cache.invalidate_all()
+
+
+# Pointers from the previous file mean nothing in the new one.
+@persistent
+def load_post(*args):
+    topology_cache.clear()
+
+
+# Saving flushes edit mode into the mesh, so indexes still matching the edit mesh match what was saved.
+@persistent
+def save_post(*args):
+    topology_cache.save_sidecars()
+
+
+handlers = (
+    (bpy.app.handlers.depsgraph_update_post, depsgraph_update_post),
+    (bpy.app.handlers.undo_post, undo_post),
+    (bpy.app.handlers.redo_post, undo_post),
+    (bpy.app.handlers.load_post, load_post),
+    (bpy.app.handlers.save_post, save_post),
+)
+
+
+def register():
+    for handler_list, handler in handlers:
+        if handler not in handler_list:
+            handler_list.append(handler)
+
+
+def unregister():
+    for handler_list, handler in handlers:
+        if handler in handler_list:
+            handler_list.remove(handler)
+    topology_cache.clear()
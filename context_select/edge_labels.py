@@ -0,0 +1,341 @@
+"""Whole-mesh edge loop and edge ring labels for Context Select."""
+import numpy as np
+
+from . import parallel_labels
+from . import topology
+
+# The arrays labels are made of, besides the hidden flags worked out from the index.
+LABEL_ARRAYS = ('loop_id', 'loop_pos', 'loop_members', 'loop_joints', 'loop_offsets', 'loop_cyclic',
+                'loop_self_intersects', 'ring_id', 'ring_pos', 'ring_members', 'ring_joints', 'ring_offsets',
+                'ring_cyclic', 'ring_self_intersects')
+
+
+class EdgeLabels:
+    """Every manifold edge gets a loop ID plus its position along that loop, and every edge with one or two
+    faces gets a ring ID plus its position along that ring.
+
+    Chains are stored CSR style (members, offsets) in walk order. joints[i] is the vertex (loops) or face (rings)
+    between members[i] and members[i + 1]; for cyclic chains the last joint leads back to the first member.
+    """
+
+    def __init__(self, topo):
+        self.topo = topo
+        self.loop_id, self.loop_pos, loops = _label(topo, topo.edge_face_count == 2, _loop_chain, parallel_labels.LOOP)
+        self.ring_id, self.ring_pos, rings = _label(topo, (topo.edge_face_count == 1) | (topo.edge_face_count == 2),
+                                                    _ring_chain, parallel_labels.RING)
+        (self.loop_members, self.loop_joints, self.loop_offsets, self.loop_cyclic,
+         self.loop_self_intersects) = loops
+        (self.ring_members, self.ring_joints, self.ring_offsets, self.ring_cyclic,
+         self.ring_self_intersects) = rings
+
+        self.update_hidden()
+
+    # Works out whether any component on each chain is hidden, so clean chains can be returned without re-checking.
+    def update_hidden(self):
+        topo = self.topo
+        joint_verts_hidden = topo.vert_hide[np.maximum(self.loop_joints, 0)] & (self.loop_joints >= 0)
+        self.loop_hidden = _chain_any(topo.edge_hide[self.loop_members] | joint_verts_hidden, self.loop_offsets)
+        joint_faces_hidden = topo.face_hide[np.maximum(self.ring_joints, 0)] & (self.ring_joints >= 0)
+        self.ring_hidden = _chain_any(topo.edge_hide[self.ring_members] | joint_faces_hidden, self.ring_offsets)
+
+    # Takes every array in LABEL_ARRAYS by name, for instance memory mapped from saved labels, and returns the labels
+    # of topo made of them.
+    @classmethod
+    def from_arrays(cls, topo, arrays):
+        labels = cls.__new__(cls)
+        labels.topo = topo
+        for name in LABEL_ARRAYS:
+            setattr(labels, name, arrays[name])
+        labels.update_hidden()
+        return labels
+
+    # Caches the labels on the topology index they were built from, so they're dropped along with it.
+    @classmethod
+    def for_index(cls, topo):
+        labels = getattr(topo, 'edge_labels', None)
+        if labels is None:
+            labels = topo.edge_labels = cls(topo)
+        return labels
+
+    # Returns the labels already built for a topology index, without building them.
+    @staticmethod
+    def built_for(topo):
+        return getattr(topo, 'edge_labels', None)
+
+    @property
+    def loop_count(self):
+        return len(self.loop_cyclic)
+
+    @property
+    def ring_count(self):
+        return len(self.ring_cyclic)
+
+    # Number of edges in each loop, for the whole mesh.
+    def loop_lengths(self):
+        return np.diff(self.loop_offsets)
+
+    # Number of edges in each ring, for the whole mesh.
+    def ring_lengths(self):
+        return np.diff(self.ring_offsets)
+
+    def same_loop(self, edge0, edge1):
+        return self.loop_id[edge0] >= 0 and self.loop_id[edge0] == self.loop_id[edge1]
+
+    def same_ring(self, edge0, edge1):
+        return self.ring_id[edge0] >= 0 and self.ring_id[edge0] == self.ring_id[edge1]
+
+    def loop_edges(self, edge):
+        chain = self.loop_id[edge]
+        return self.loop_members[self.loop_offsets[chain]:self.loop_offsets[chain + 1]]
+
+    def ring_edges(self, edge):
+        chain = self.ring_id[edge]
+        return self.ring_members[self.ring_offsets[chain]:self.ring_offsets[chain + 1]]
+
+
+# Labels the chains through the edges in mask from their link table, split across worker processes if the mesh is
+# big enough and they're enabled. Chains through the non-manifold links a table can't settle are walked one by one and
+# merged in, numbered as if every chain had been walked.
+def _label(topo, mask, chain_walker, kind):
+    chain_id, chain_pos, packed, walk = parallel_labels.label_chains(
+        topo, mask, kind, parallel_labels.process_count_for(topo.edge_count))
+    if not walk[mask].any():
+        return chain_id, chain_pos, packed
+    tabled_starts = _first_edges(chain_id, mask)
+    walked = _walk_chains(topo, mask & walk, chain_walker)
+    return _merge((chain_id, chain_pos, packed), tabled_starts, walked[:3], walked[3])
+
+
+# Runs chain_walker from every unlabeled edge in mask and packs the chains it finds.
+def _label_chains(topo, mask, chain_walker):
+    return _walk_chains(topo, mask, chain_walker)[:3]
+
+
+# Like _label_chains, also returning the edge each chain was walked from.
+def _walk_chains(topo, mask, chain_walker):
+    chain_id = np.full(topo.edge_count, -1, dtype=np.int32)
+    chain_pos = np.full(topo.edge_count, -1, dtype=np.int32)
+    members = []
+    joints = []
+    offsets = [0]
+    cyclic = []
+    self_intersects = []
+    starts = []
+
+    for edge in np.flatnonzero(mask).tolist():
+        if chain_id[edge] >= 0:
+            continue
+        chain, chain_joints, is_cyclic = chain_walker(topo, edge)
+        chain_id[chain] = len(cyclic)
+        chain_pos[chain] = np.arange(len(chain), dtype=np.int32)
+        members.extend(chain)
+        joints.extend(chain_joints)
+        offsets.append(len(members))
+        cyclic.append(is_cyclic)
+        passed = [j for j in chain_joints if j >= 0]
+        self_intersects.append(len(set(passed)) != len(passed))
+        starts.append(edge)
+
+    packed = (np.array(members, dtype=np.int32), np.array(joints, dtype=np.int32),
+              np.array(offsets, dtype=np.int32), np.array(cyclic, dtype=bool), np.array(self_intersects, dtype=bool))
+    return chain_id, chain_pos, packed, np.array(starts, dtype=np.int64)
+
+
+# Returns the first edge in mask on each chain, which is the edge the walkers would have walked it from.
+def _first_edges(chain_id, mask):
+    edges = np.flatnonzero(mask & (chain_id >= 0))
+    chains, first = np.unique(chain_id[edges], return_index=True)
+    starts = np.zeros(len(chains), dtype=np.int64)
+    starts[chains] = edges[first]
+    return starts
+
+
+# Merges two sets of labels covering different edges into one, with the chains of both numbered in the order of the
+# edges they were walked from.
+def _merge(first, first_starts, second, second_starts):
+    first_id, first_pos, first_packed = first
+    second_id, second_pos, second_packed = second
+    order = np.argsort(np.concatenate((first_starts, second_starts)), kind='stable')
+    new_id = np.empty(len(order), dtype=np.int32)
+    new_id[order] = np.arange(len(order), dtype=np.int32)
+
+    chain_id = np.full(len(first_id), -1, dtype=np.int32)
+    in_first, in_second = first_id >= 0, second_id >= 0
+    chain_id[in_first] = new_id[first_id[in_first]]
+    chain_id[in_second] = new_id[second_id[in_second] + len(first_starts)]
+    chain_pos = np.where(in_second, second_pos, first_pos)
+
+    members, joints, _offsets, cyclic, self_intersects = (np.concatenate(arrays)
+                                                          for arrays in zip(first_packed, second_packed))
+    first_offsets, second_offsets = first_packed[2], second_packed[2]
+    starts = np.concatenate((first_offsets[:-1], second_offsets[:-1] + first_offsets[-1])).astype(np.int64)
+    lengths = np.concatenate((np.diff(first_offsets), np.diff(second_offsets))).astype(np.int64)[order]
+    runs = topology.ranges(starts[order], lengths)
+    offsets = np.zeros(len(order) + 1, dtype=np.int32)
+    np.cumsum(lengths, out=offsets[1:])
+    return chain_id, chain_pos, (members[runs], joints[runs], offsets, cyclic[order], self_intersects[order])
+
+
+def _chain_any(values, offsets):
+    if len(offsets) < 2:
+        return np.zeros(0, dtype=bool)
+    return np.logical_or.reduceat(values, offsets[:-1])
+
+
+# Takes two open walks out of the same edge and returns them as one chain, from the backward end to the forward end.
+# Each walk's joints[i] sits between walk[i] and walk[i + 1] and its last joint is the -1 terminator.
+def _combine(forward, forward_joints, backward, backward_joints):
+    chain = backward[:0:-1] + forward
+    joints = backward_joints[-2::-1] + forward_joints
+    return chain, joints, False
+
+
+# Walks the loop through an edge in both directions and returns (edges, joint verts, cyclic).
+def _loop_chain(topo, edge):
+    v0, v1 = topo.edge_verts[edge].tolist()
+    forward, forward_joints, cyclic = _loop_walk(topo, edge, v1)
+    if cyclic:
+        return forward, forward_joints, True
+    backward, backward_joints, _ = _loop_walk(topo, edge, v0)
+    return _combine(forward, forward_joints, backward, backward_joints)
+
+
+def _loop_walk(topo, edge, vert):
+    chain = [edge]
+    joints = []
+    seen = {edge}
+    cur = edge
+    while True:
+        nxt = topo.opposite_edge(cur, vert)
+        joints.append(vert)
+        if nxt < 0:
+            joints[-1] = -1
+            return chain, joints, False
+        if nxt == edge:
+            return chain, joints, True
+        if nxt in seen:  # Malformed fan, stop rather than spin forever.
+            joints[-1] = -1
+            return chain, joints, False
+        seen.add(nxt)
+        chain.append(nxt)
+        vert = topo.other_vert(nxt, vert)
+        cur = nxt
+
+
+# Walks the ring through an edge in both directions and returns (edges, joint faces, cyclic).
+def _ring_chain(topo, edge):
+    loops = topo.edge_loops_of(edge).tolist()
+    forward, forward_joints, cyclic = _ring_walk(topo, edge, loops[0])
+    if cyclic or len(loops) < 2:
+        return forward, forward_joints, cyclic
+    backward, backward_joints, _ = _ring_walk(topo, edge, loops[1])
+    return _combine(forward, forward_joints, backward, backward_joints)
+
+
+def _ring_walk(topo, edge, loop):
+    chain = [edge]
+    joints = []
+    seen = {edge}
+    while True:
+        face = int(topo.loop_face[loop])
+        joints.append(face)
+        if topo.face_loop_total[face] != 4:
+            joints[-1] = -1
+            return chain, joints, False
+        opposite = int(topo.loop_next[topo.loop_next[loop]])
+        nxt = int(topo.loop_edge[opposite])
+        if nxt == edge:
+            return chain, joints, True
+        if nxt in seen:
+            joints[-1] = -1
+            return chain, joints, False
+        seen.add(nxt)
+        chain.append(nxt)
+        if topo.edge_face_count[nxt] != 2:
+            joints.append(-1)
+            return chain, joints, False
+        loop = int(topo.loop_radial_next[opposite])
+
+
+# Returns the chain slices running from position p0 to p1, as (members, joints between them) pairs.
+# Open chains have one slice, cyclic chains have one in each direction.
+def _arcs(members, joints, cyclic, p0, p1):
+    n = len(members)
+    arcs = []
+    if p1 > p0 or cyclic:
+        pos = (p0 + np.arange((p1 - p0) % n + 1)) % n
+        arcs.append((members[pos], joints[pos[:-1]]))
+    if p1 < p0 or cyclic:
+        pos = (p0 - np.arange((p0 - p1) % n + 1)) % n
+        arcs.append((members[pos], joints[pos[1:]]))
+    return arcs
+
+
+# Takes 2 separated edges on the same loop and returns a list of loop lists of edge indices between them,
+# following the same dead end rules as the loop walker.
+def bounded_loop_edge(labels, prefs, starting_edge, ends):
+    other_edge = ends[1] if ends[0] == starting_edge else ends[0]
+    if not labels.same_loop(starting_edge, other_edge):
+        return []
+    topo = labels.topo
+    chain = labels.loop_id[starting_edge]
+    start, stop = labels.loop_offsets[chain], labels.loop_offsets[chain + 1]
+    arcs = _arcs(labels.loop_members[start:stop], labels.loop_joints[start:stop], labels.loop_cyclic[chain],
+                 labels.loop_pos[starting_edge], labels.loop_pos[other_edge])
+    connected_loops = []
+    for edges, joints in arcs:
+        if not prefs.ignore_hidden_geometry:
+            # The walk stops on a hidden edge, or an edge leading to a hidden vert, before reaching the end.
+            if topo.edge_hide[edges[1:-1]].any() or topo.vert_hide[joints[1:]].any():
+                continue
+        if prefs.terminate_self_intersects and len(np.unique(joints)) != len(joints):
+            continue
+        connected_loops.append(edges.tolist())
+    return connected_loops
+
+
+# Takes 2 separated edges on the same ring and returns a list of ring lists of edge indices between them,
+# following the same dead end rules as the ring walker.
+def bounded_ring_edge(labels, prefs, starting_edge, ends):
+    other_edge = ends[1] if ends[0] == starting_edge else ends[0]
+    if not labels.same_ring(starting_edge, other_edge):
+        return []
+    topo = labels.topo
+    chain = labels.ring_id[starting_edge]
+    start, stop = labels.ring_offsets[chain], labels.ring_offsets[chain + 1]
+    arcs = _arcs(labels.ring_members[start:stop], labels.ring_joints[start:stop], labels.ring_cyclic[chain],
+                 labels.ring_pos[starting_edge], labels.ring_pos[other_edge])
+    connected_loops = []
+    for edges, faces in arcs:
+        if not prefs.ignore_hidden_geometry:
+            if topo.edge_hide[edges[1:-1]].any() or topo.face_hide[faces].any():
+                continue
+        if prefs.terminate_self_intersects and len(np.unique(faces)) != len(faces):
+            continue
+        connected_loops.append(edges.tolist())
+    return connected_loops
+
+
+# Returns the whole loop through an edge if no dead end rule can cut it short, otherwise None.
+def full_loop_edge(labels, prefs, edge):
+    chain = labels.loop_id[edge]
+    if chain < 0:
+        return None
+    if not prefs.ignore_hidden_geometry and labels.loop_hidden[chain]:
+        return None
+    if prefs.terminate_self_intersects and labels.loop_self_intersects[chain]:
+        return None
+    edges = labels.loop_edges(edge)
+    return edges.tolist() if len(edges) > 1 else []
+
+
+# Returns the whole ring through an edge if no dead end rule can cut it short, otherwise None.
+def full_ring_edge(labels, prefs, edge):
+    chain = labels.ring_id[edge]
+    if chain < 0:
+        return None
+    if not prefs.ignore_hidden_geometry and labels.ring_hidden[chain]:
+        return None
+    if prefs.terminate_self_intersects and labels.ring_self_intersects[chain]:
+        return None
+    return labels.ring_edges(edge).tolist()
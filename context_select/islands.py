@@ -0,0 +1,75 @@
+"""Island (connected piece) labels for Context Select's select linked fallback."""
+import numpy as np
+
+
+class IslandIndex:
+    """Every vertex, or with delimiters every face, labelled with the island it belongs to.
+
+    Without delimiters islands are linked through edges, like select_linked_pick with an empty delimit. With
+    delimiters they're linked through the edges shared by faces, except across the delimiting edges. Hidden
+    components are never linked through. Members of each island are stored CSR style, so looking one up is a slice.
+    """
+
+    def __init__(self, topo, delimit_edges=None):
+        self.topo = topo
+        self.delimited = delimit_edges is not None
+        if not self.delimited:
+            a, b = topo.edge_verts[:, 0], topo.edge_verts[:, 1]
+            link = ~topo.edge_hide & ~topo.vert_hide[a] & ~topo.vert_hide[b]
+            self.label = components(topo.vert_count, a[link], b[link])
+            hidden = topo.vert_hide
+        else:
+            # Each face corner links its face to the next face around the same edge.
+            radial = topo.loop_radial_next
+            a, b = topo.loop_face, topo.loop_face[radial]
+            edge = topo.loop_edge
+            link = (radial != np.arange(topo.loop_count)) & ~delimit_edges[edge] & ~topo.edge_hide[edge]
+            link &= ~topo.face_hide[a] & ~topo.face_hide[b]
+            self.label = components(topo.face_count, a[link], b[link])
+            hidden = topo.face_hide
+        # Hidden components are kept out of every island's members.
+        visible = np.flatnonzero(~hidden).astype(np.int32)
+        order = np.argsort(self.label[visible], kind='stable')
+        self.members = visible[order]
+        self.offsets = np.zeros(len(self.label) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.label[visible], minlength=len(self.label)), out=self.offsets[1:])
+
+    # Caches island indexes on the topology index they were built from, one per set of delimiters.
+    # delimit_key identifies the delimiters and delimit_edges() is only called to build a new index.
+    @classmethod
+    def for_index(cls, topo, delimit_key=(), delimit_edges=None):
+        islands = getattr(topo, 'islands', None)
+        if islands is None:
+            islands = topo.islands = {}
+        if delimit_key not in islands:
+            islands[delimit_key] = cls(topo, delimit_edges() if delimit_key else None)
+        return islands[delimit_key]
+
+    # Takes vert (or, delimited, face) indices and returns every visible one on the same islands.
+    def linked(self, seeds):
+        labels = np.unique(self.label[np.asarray(seeds, dtype=np.int64)])
+        return np.concatenate([self.members[self.offsets[i]:self.offsets[i + 1]] for i in labels.tolist()]
+                              or [np.zeros(0, dtype=np.int32)])
+
+
+# Takes a number of nodes and arrays of linked node pairs and returns each node's component, as the lowest node in it.
+# Union-find done a whole array at a time: every pass hooks the higher of each pair's roots under the lower one, then
+# compresses the paths until every node points straight at its root.
+def components(count, a, b):
+    parent = np.arange(count, dtype=np.int32)
+    a = np.asarray(a, dtype=np.int32)
+    b = np.asarray(b, dtype=np.int32)
+    while True:
+        root_a, root_b = parent[a], parent[b]
+        split = root_a != root_b
+        if not split.any():
+            return parent
+        a, b = a[split], b[split]  # Pairs already joined stay joined.
+        low = np.minimum(root_a[split], root_b[split])
+        high = np.maximum(root_a[split], root_b[split])
+        np.minimum.at(parent, high, low)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
@@ -0,0 +1,331 @@
+"""Whole-mesh loop and ring labeling split across worker processes, for meshes too big to label quickly in one.
+
+Every chain is a path or cycle through a table of links: for each side of each edge, the edge the walk steps to next
+and the vertex (loops) or face (rings) it steps through. Each worker walks the chains of one range of edges, stopping
+wherever a chain leaves the range, and writes the segments it found to a file Blender reads back. The segments are
+then stitched together at the range borders and every chain is numbered, turned and rotated the way
+edge_labels' walkers would have walked it, so both give identical labels. Walking the link table is quicker than
+those walkers even in one process, so meshes too small for workers are walked as a single range in Blender's.
+
+Workers are fresh Python processes running this file, importing nothing but numpy, and share nothing with Blender but
+the files they're handed; Blender is never forked. They need sys.executable to be a Python interpreter, which it is in
+Blender 2.91 and later. Where it isn't, or a worker fails, labeling stays in Blender's process.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+LOOP, RING = 'LOOP', 'RING'
+FORWARD = {LOOP: 1, RING: 0}  # The side of its first edge edge_labels' walkers walk a chain along first.
+MIN_EDGES = 400000  # Smaller meshes are labeled faster in one process than workers can be started, see benchmarks/.
+
+processes = 1  # Set from the add-on preferences. 1 keeps labeling in Blender's process.
+
+_job = None  # The link table and output arrays of the labeling running in this process now.
+SEGMENT_LAYOUT = [(np.int32, 4), (np.int8, 2)]  # segment, position, tail, length, then orient, cyclic.
+NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)  # Keeps Windows from opening a console per worker.
+
+
+# Returns how many processes to label edge_count edges in.
+def process_count_for(edge_count):
+    if edge_count < MIN_EDGES or not can_start_workers():
+        return 1
+    return processes
+
+
+# Whether there's a Python interpreter to run workers with. Before 2.91, Blender's sys.executable was Blender itself.
+def can_start_workers():
+    return os.path.basename(sys.executable or '').lower().startswith('python')
+
+
+# Takes a topology index, the edges chains start from and LOOP or RING and returns the chains packed like
+# edge_labels._label_chains does, plus a mask of the edges left for its walkers. Non-manifold fans and edges can be
+# reached from chains they don't lead back to, which a link table can't settle, so every chain through such a link
+# is left out of the labels and walked there instead.
+def label_chains(topo, mask, kind, process_count=1):
+    links, joints, entry = loop_links(topo) if kind == LOOP else ring_links(topo)
+    unanswered = cut_unanswered(links, joints, entry)
+    segments = _segment(links, entry, process_count)
+    stitched = _stitch(links, entry, *segments)
+    chain = stitched[0]
+    walk = np.zeros(len(links), dtype=bool)
+    if unanswered.any():
+        walk[np.isin(chain, chain[unanswered])] = True
+    chain_id, chain_pos, packed = _pack(stitched, links, joints, mask & ~walk, FORWARD[kind])
+    return chain_id, chain_pos, packed, walk
+
+
+# ##################### Link Tables ##################### #
+
+# Each table is (links, joints, entry), all (edge count, 2): the edge the walk steps to from each side of each edge
+# (or -1), the vertex or face it steps through (-1 where the walk ends), and the side of the next edge it arrives on.
+
+# Loops step through the vertex at each end of an edge, to the edge opposite it in the fan.
+def loop_links(topo):
+    links = np.array(topo.edge_opposite, dtype=np.int32)
+    joints = np.where(links >= 0, topo.edge_verts, -1).astype(np.int32)
+    entry = (topo.edge_verts[np.maximum(links, 0), 0] != topo.edge_verts).astype(np.int8)
+    entry[links < 0] = 0
+    return links, joints, entry
+
+
+# Rings step through the quad on each side of an edge, to the edge across it. Side 0 is the edge's first face corner
+# and side 1 its second; edges with more than two faces end every ring reaching them.
+def ring_links(topo):
+    edge_count = topo.edge_count
+    links = np.full((edge_count, 2), -1, dtype=np.int32)
+    joints = np.full((edge_count, 2), -1, dtype=np.int32)
+    entry = np.zeros((edge_count, 2), dtype=np.int8)
+    if topo.loop_count == 0:  # Nothing but verts and wires, so no rings.
+        return links, joints, entry
+    first_loop = topo.edge_loops[np.minimum(topo.edge_loop_offsets[:-1], topo.loop_count - 1)]
+    for side in (0, 1):
+        edges = np.flatnonzero((topo.edge_face_count > side) & (topo.edge_face_count <= 2))
+        loops = topo.edge_loops[topo.edge_loop_offsets[edges] + side]
+        faces = topo.loop_face[loops]
+        quad = topo.face_loop_total[faces] == 4
+        edges, loops, faces = edges[quad], loops[quad], faces[quad]
+        opposite = topo.loop_next[topo.loop_next[loops]]
+        links[edges, side] = topo.loop_edge[opposite]
+        joints[edges, side] = faces
+        entry[edges, side] = first_loop[topo.loop_edge[opposite]] != opposite
+    return links, joints, entry
+
+
+# Cuts every link that isn't answered by a link back from the edge it leads to, which leaves the chains plain paths
+# and cycles that can be walked from any edge on them. Returns a mask of the edges at either end of a cut link.
+def cut_unanswered(links, joints, entry):
+    edges, sides = np.nonzero(links >= 0)
+    following = links[edges, sides]
+    unanswered = (following == edges) | (links[following, entry[edges, sides]] != edges)
+    edges, sides, following = edges[unanswered], sides[unanswered], following[unanswered]
+    links[edges, sides] = -1
+    joints[edges, sides] = -1
+    entry[edges, sides] = 0
+    cut = np.zeros(len(links), dtype=bool)
+    cut[edges] = True
+    cut[following] = True
+    return cut
+
+
+# ##################### Workers ##################### #
+
+# Splits the edges into one range per process, has the workers walk them and returns the segments as
+# (segment, position, orient, tail, length, cyclic) arrays. Every edge is on exactly one segment. segment is the
+# segment's first edge, orient is the side of each edge that leads on towards the segment's last edge (tail), and
+# tail, length and cyclic are only set at the first edge of each segment.
+def _segment(links, entry, process_count):
+    global _job
+    edge_count = len(links)
+    bounds = np.linspace(0, edge_count, process_count + 1).astype(np.int64).tolist()
+    block = _run_workers(links, entry, bounds) if process_count > 1 else None
+    if block is None:
+        block = bytearray(_block_size(edge_count))
+        _job = (links, entry, _segment_arrays(block, edge_count))
+        try:
+            _segment_range(0, edge_count)
+        finally:
+            _job = None
+    segment, position, orient, tail, length, cyclic = _segment_arrays(block, edge_count)
+    return segment, position, orient, tail, length, cyclic.astype(bool)
+
+
+def _block_size(edge_count):
+    return sum(np.dtype(dtype).itemsize * count for dtype, count in SEGMENT_LAYOUT) * edge_count
+
+
+# Returns the (segment, position, orient, tail, length, cyclic) arrays laid out in block.
+def _segment_arrays(block, edge_count):
+    arrays = []
+    offset = 0
+    for dtype, count in SEGMENT_LAYOUT:
+        for _ in range(count):
+            arrays.append(np.frombuffer(block, dtype=dtype, count=edge_count, offset=offset))
+            offset += np.dtype(dtype).itemsize * edge_count
+    segment, position, tail, length, orient, cyclic = arrays
+    return segment, position, orient, tail, length, cyclic
+
+
+# Has one worker process walk each range between bounds and returns the block they wrote their segments to, or None
+# if a worker couldn't be started or failed.
+def _run_workers(links, entry, bounds):
+    with tempfile.TemporaryDirectory(prefix='context_select_labels-') as directory:
+        np.save(os.path.join(directory, 'links.npy'), links)
+        np.save(os.path.join(directory, 'entry.npy'), entry)
+        path = os.path.join(directory, 'segments')
+        with open(path, 'wb') as file:
+            file.truncate(_block_size(len(links)))
+        try:
+            workers = [subprocess.Popen([sys.executable, '-I', os.path.abspath(__file__), directory, str(lo), str(hi)],
+                                        creationflags=NO_WINDOW)
+                       for lo, hi in zip(bounds[:-1], bounds[1:])]
+        except OSError:
+            return None
+        if any([worker.wait() for worker in workers]):
+            return None
+        return np.fromfile(path, dtype=np.uint8)  # Read rather than mapped, so the directory can be deleted.
+
+
+# Worker process: walks the edges lo to hi of the link table saved in directory into its segments file.
+def _worker(directory, lo, hi):
+    global _job
+    links = np.load(os.path.join(directory, 'links.npy'), mmap_mode='r')
+    entry = np.load(os.path.join(directory, 'entry.npy'), mmap_mode='r')
+    block = np.memmap(os.path.join(directory, 'segments'), dtype=np.uint8, mode='r+')
+    _job = (links, entry, _segment_arrays(block, len(links)))
+    _segment_range(lo, hi)
+    block.flush()
+
+
+# Worker: walks every chain through the edges lo to hi, as far as it stays in that range.
+def _segment_range(lo, hi):
+    links, entry, (segment, position, orient, tail, length, cyclic) = _job
+    span = hi - lo
+    following = links[lo:hi].astype(np.int64) - lo
+    step = np.where((following >= 0) & (following < span), 2 * following + 1 - entry[lo:hi], -1)
+    order, lengths, closed = _walk(step.ravel().tolist(), span)
+
+    firsts = np.cumsum(lengths) - lengths
+    edges = (order >> 1) + lo
+    heads = edges[firsts]
+    segment[edges] = np.repeat(heads, lengths)
+    position[edges] = np.arange(len(order)) - np.repeat(firsts, lengths)
+    orient[edges] = order & 1
+    tail[heads] = edges[firsts + lengths - 1]
+    length[heads] = lengths
+    cyclic[heads] = closed
+
+
+# Walks every path and cycle through count items. A walk's state is 2 * item + the side it leaves the item by, and
+# step[state] is the state after stepping on to the next item, or -1 where the walk ends. Returns every walk's states
+# one walk after another (each with the side leading on along the walk), how many items each walk has and whether
+# it's cyclic. Walks are found in item order and run forward from their first item's side 1 where they can.
+def _walk(step, count):
+    seen = [False] * count
+    order = []
+    lengths = []
+    closed = []
+    for start in range(count):
+        if seen[start]:
+            continue
+        seen[start] = True
+        forward = [2 * start + 1]
+        state = step[2 * start + 1]
+        while state >= 0 and state >> 1 != start:
+            seen[state >> 1] = True
+            forward.append(state)
+            state = step[state]
+        if state >= 0:
+            order.extend(forward)
+        else:
+            backward = []
+            state = step[2 * start]
+            while state >= 0 and state >> 1 != start:
+                seen[state >> 1] = True
+                backward.append(state ^ 1)  # Leaving by the side it was entered on leads back towards the start.
+                state = step[state]
+            order.extend(reversed(backward))
+            order.extend(forward)
+            forward.extend(backward)
+        lengths.append(len(forward))
+        closed.append(state >= 0)
+    return np.array(order, dtype=np.int64), np.array(lengths, dtype=np.int64), np.array(closed, dtype=bool)
+
+
+# ##################### Merging ##################### #
+
+# Joins segments that link across range borders into chains, walking them with _walk like the workers walk edges: a
+# segment's side 1 is its tail and side 0 its head. Returns per edge its chain, position along it and the side
+# leading on along it, plus each chain's length and whether it's cyclic.
+def _stitch(links, entry, segment, position, orient, tail, length, seg_cyclic):
+    edge_count = len(links)
+    heads = np.flatnonzero(length > 0)
+    seg_index = np.full(edge_count, -1, dtype=np.int64)
+    seg_index[heads] = np.arange(len(heads))
+
+    step = np.full((len(heads), 2), -1, dtype=np.int64)
+    for side, last in ((0, heads), (1, tail[heads])):
+        leave = orient[last] ^ (1 - side)
+        following = links[last, leave]
+        linked = np.flatnonzero((following >= 0) & ~seg_cyclic[heads])
+        following = following[linked]
+        # Entering a segment at its head (an edge left by its head side) continues through it towards its tail.
+        towards_tail = orient[following] != entry[last[linked], leave[linked]]
+        step[linked, side] = 2 * seg_index[segment[following]] + towards_tail
+    order, chain_segments, chain_cyclic = _walk(step.ravel().tolist(), len(heads))
+    chain_cyclic |= seg_cyclic[heads[order[np.cumsum(chain_segments) - chain_segments] >> 1]]
+
+    walked = heads[order >> 1]
+    walked_length = length[walked].astype(np.int64)
+    ends = np.cumsum(walked_length)
+    chain_ends = ends[np.cumsum(chain_segments) - 1]
+    chain_length = np.diff(chain_ends, prepend=0)
+    seg_chain = np.zeros(edge_count, dtype=np.int64)
+    seg_offset = np.zeros(edge_count, dtype=np.int64)
+    seg_flip = np.zeros(edge_count, dtype=bool)
+    seg_chain[walked] = np.repeat(np.arange(len(chain_segments)), chain_segments)
+    seg_offset[walked] = ends - walked_length - np.repeat(chain_ends - chain_length, chain_segments)
+    seg_flip[walked] = (order & 1) == 0
+
+    flip = seg_flip[segment]
+    pos = np.where(flip, length[segment] - 1 - position, position) + seg_offset[segment]
+    side = orient ^ flip.astype(np.int8)
+    return seg_chain[segment], pos, side, chain_length, chain_cyclic
+
+
+# Numbers the chains holding an edge from mask by the first such edge, turns and rotates them to run the way the
+# single process labeler walks them from it, and packs them. forward is the side it walks first.
+def _pack(stitched, links, joints, mask, forward):
+    chain, pos, side, chain_length, chain_cyclic = stitched
+    edge_count = len(links)
+    starts = np.flatnonzero(mask)
+    kept, first = np.unique(chain[starts], return_index=True)
+    start = starts[first]
+    order = np.argsort(start, kind='stable')
+    kept, start = kept[order], start[order]
+    new_id = np.full(len(chain_length), -1, dtype=np.int64)
+    new_id[kept] = np.arange(len(kept))
+
+    # Turn chains whose first edge leads on backwards, then rotate cyclic chains to begin at it.
+    turn = np.zeros(len(chain_length), dtype=bool)
+    turn[kept] = side[start] != forward
+    lengths = chain_length[chain]
+    turned = turn[chain]
+    pos = np.where(turned, lengths - 1 - pos, pos)
+    side = np.where(turned, 1 - side, side)
+    shift = np.zeros(len(chain_length), dtype=np.int64)
+    shift[kept] = np.where(chain_cyclic[kept], pos[start], 0)
+    pos = (pos - shift[chain]) % lengths
+
+    chain_id = new_id[chain]
+    labeled = np.flatnonzero(chain_id >= 0)
+    kept_lengths = chain_length[kept]
+    offsets = np.zeros(len(kept) + 1, dtype=np.int64)
+    np.cumsum(kept_lengths, out=offsets[1:])
+    slots = offsets[chain_id[labeled]] + pos[labeled]
+    members = np.empty(len(labeled), dtype=np.int32)
+    members[slots] = labeled
+    chain_joints = np.empty(len(labeled), dtype=np.int32)
+    chain_joints[slots] = joints[labeled, side[labeled]]
+
+    # A chain intersects itself if it passes through the same vertex or face twice.
+    self_intersects = np.zeros(len(kept), dtype=bool)
+    member_chain = np.repeat(np.arange(len(kept)), kept_lengths)
+    passed = chain_joints >= 0
+    by_chain = np.lexsort((chain_joints[passed], member_chain[passed]))
+    passed_chain = member_chain[passed][by_chain]
+    passed_joint = chain_joints[passed][by_chain]
+    repeats = (passed_chain[1:] == passed_chain[:-1]) & (passed_joint[1:] == passed_joint[:-1])
+    self_intersects[passed_chain[1:][repeats]] = True
+
+    chain_pos = np.full(edge_count, -1, dtype=np.int32)
+    chain_pos[labeled] = pos[labeled]
+    packed = (members, chain_joints, offsets.astype(np.int32), chain_cyclic[kept].copy(), self_intersects)
+    return chain_id.astype(np.int32), chain_pos, packed
+
+
+if __name__ == '__main__':
+    _worker(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]))
@@ -0,0 +1,114 @@
+"""Hover preview for Context Select: draws the loop a double-click would select under the cursor."""
+import bpy
+import gpu
+import numpy as np
+from gpu_extras.batch import batch_for_shader
+
+from . import topology
+
+PREVIEW_LINE_WIDTH = 3.0
+PREVIEW_FACE_ALPHA = 0.25  # Faces are filled with the preview color at this fraction of its alpha.
+
+
+class PreviewBatch:
+    """The GPU batches of the previewed selection, kept until what they show changes.
+
+    key identifies what's shown (the mesh, its topology version and edit count, the hovered component and the select
+    mode), so hovering over the same component again only costs comparing keys, and the walk and batch upload
+    happen once per component rather than once per redraw.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.batches = ()
+        self.matrix = None
+        self.color = (1.0, 1.0, 1.0, 1.0)
+
+    # Builds new batches with build() if key differs from what's shown. build returns (primitive, positions,
+    # indices) triplets, and a key of None clears the preview. Returns whether anything changed.
+    def update(self, key, build=None, matrix=None, color=None):
+        if key == self.key:
+            return False
+        self.key = key
+        self.batches = ()
+        if key is not None:
+            shader = _shader()
+            self.batches = tuple((primitive, batch_for_shader(shader, primitive, {"pos": positions}, indices=indices))
+                                 for primitive, positions, indices in build())
+            self.matrix = matrix
+            self.color = tuple(color)
+        return True
+
+    def clear(self):
+        return self.update(None)
+
+    def draw(self):
+        if not self.batches or bpy.context.mode != 'EDIT_MESH':
+            return
+        shader = _shader()
+        gpu.state.blend_set('ALPHA')
+        gpu.state.line_width_set(PREVIEW_LINE_WIDTH)
+        gpu.matrix.push()
+        gpu.matrix.multiply_matrix(self.matrix)
+        shader.bind()
+        for primitive, batch in self.batches:
+            color = self.color
+            if primitive == 'TRIS':
+                color = color[:3] + (color[3] * PREVIEW_FACE_ALPHA,)
+            shader.uniform_float("color", color)
+            batch.draw(shader)
+        gpu.matrix.pop()
+        gpu.state.line_width_set(1.0)
+        gpu.state.blend_set('NONE')
+
+
+# Takes a topology index, edges and a function returning the positions of verts and returns the batch data for
+# drawing the edges.
+def edge_batches(index, edges, vert_positions):
+    verts, pairs = np.unique(index.edge_verts[np.asarray(edges, dtype=np.int64)], return_inverse=True)
+    return [('LINES', vert_positions(verts), pairs.reshape(-1, 2).astype(np.int32))]
+
+
+# Takes a topology index, faces and a function returning the positions of verts and returns the batch data for
+# drawing the faces filled and outlined. Faces are fan triangulated, which is exact for the convex faces loops run
+# through.
+def face_batches(index, faces, vert_positions):
+    faces = np.asarray(faces, dtype=np.int64)
+    counts = index.face_loop_total[faces] - 2
+    starts = index.face_loop_start[faces]
+    first = np.repeat(starts, counts)
+    second = topology.ranges(starts + 1, counts)
+    tri_verts = index.loop_vert[np.stack((first, second, second + 1), axis=1)]
+    verts, tris = np.unique(tri_verts, return_inverse=True)
+    edges = np.unique(index.loop_edge[index.loops_of_faces(faces)[0]])
+    return ([('TRIS', vert_positions(verts), tris.reshape(-1, 3).astype(np.int32))]
+            + edge_batches(index, edges, vert_positions))
+
+
+def _shader():
+    try:
+        return gpu.shader.from_builtin('UNIFORM_COLOR')
+    except ValueError:  # Before Blender 3.4 the builtin shaders were named per dimension.
+        return gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+
+
+preview_batch = PreviewBatch()
+draw_handler = None
+
+
+def draw():
+    preview_batch.draw()
+
+
+def register():
+    global draw_handler
+    if draw_handler is None:
+        draw_handler = bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
+
+
+def unregister():
+    global draw_handler
+    if draw_handler is not None:
+        bpy.types.SpaceView3D.draw_handler_remove(draw_handler, 'WINDOW')
+        draw_handler = None
+    preview_batch.clear()
@@ -0,0 +1,158 @@
+"""Opt-in instrumentation for Context Select: per-phase timings and counters of recent selections."""
+import cProfile
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+OTHER = 'other'  # Time spent in a selection outside every named phase.
+
+
+class Record:
+    """Timings and counters of one selection.
+
+    phases hold exclusive time in seconds: time spent in a phase nested in another only counts towards the inner one,
+    so the phases add up to the total.
+    """
+
+    def __init__(self, started):
+        self.name = None
+        self.started = started
+        self.total = 0.0
+        self.phases = {}
+        self.counts = {}
+
+    def as_dict(self):
+        return {'name': self.name, 'started': self.started, 'total': self.total, 'phases': self.phases,
+                'counts': self.counts}
+
+    # One line for the status bar, slowest phases first.
+    def summary(self):
+        phases = sorted(self.phases.items(), key=lambda item: item[1], reverse=True)
+        text = "{} {:.1f} ms: ".format(self.name or 'selection', self.total * 1000.0)
+        text += ", ".join("{} {:.1f}".format(name, seconds * 1000.0) for name, seconds in phases)
+        if self.counts:
+            counts = sorted(self.counts.items())
+            text += " ({})".format(", ".join("{} {}".format(name, amount) for name, amount in counts))
+        return text
+
+
+class Profiler:
+    """A ring buffer of the last records, plus the record and phase stack of the selection running now.
+
+    Phases are only timed while a record is open, so with profiling off the instrumented functions cost one attribute
+    check each.
+    """
+
+    def __init__(self, size=100):
+        self.enabled = False
+        self.records = deque(maxlen=size)
+        self.current = None
+        self.stack = []  # [phase name, time it was entered or resumed] of every open phase, innermost last.
+        self.capture = None  # A cProfile.Profile accumulating every recorded selection, while capturing.
+
+    def resize(self, size):
+        self.records = deque(self.records, maxlen=size)
+
+    def set_capture(self, capture):
+        if capture and self.capture is None:
+            self.capture = cProfile.Profile()
+        elif not capture:
+            self.capture = None
+
+    # Times everything inside as one record, if profiling is on. Yields the record, or None.
+    @contextmanager
+    def record(self):
+        if not self.enabled or self.current is not None:
+            yield None
+            return
+        record = self.current = Record(time.time())
+        capture = self.capture
+        if capture is not None:
+            capture.enable()
+        start = time.perf_counter()
+        self.stack = [[OTHER, start]]
+        try:
+            yield record
+        finally:
+            end = time.perf_counter()
+            if capture is not None:
+                capture.disable()
+            self._add_time(OTHER, end - self.stack[0][1])
+            record.total = end - start
+            self.current = None
+            self.stack = []
+            self.records.append(record)
+
+    def enter(self, name):
+        now = time.perf_counter()
+        parent = self.stack[-1]
+        self._add_time(parent[0], now - parent[1])
+        self.stack.append([name, now])
+
+    def exit(self):
+        now = time.perf_counter()
+        name, started = self.stack.pop()
+        self._add_time(name, now - started)
+        self.stack[-1][1] = now
+
+    def count(self, name, amount=1):
+        if self.current is not None:
+            counts = self.current.counts
+            counts[name] = counts.get(name, 0) + amount
+
+    def name(self, name):
+        if self.current is not None and self.current.name is None:
+            self.current.name = name
+
+    def _add_time(self, name, seconds):
+        phases = self.current.phases
+        phases[name] = phases.get(name, 0.0) + seconds
+
+    def last(self):
+        return self.records[-1] if self.records else None
+
+    # Writes the records as JSON, and the cProfile capture (if any) next to it with a .prof extension.
+    # Returns the paths written.
+    def dump(self, path):
+        with open(path, 'w') as file:
+            json.dump([record.as_dict() for record in self.records], file, indent=1)
+        written = [path]
+        if self.capture is not None:
+            stats_path = path.rsplit('.', 1)[0] + '.prof'
+            self.capture.dump_stats(stats_path)
+            written.append(stats_path)
+        return written
+
+
+profiler = Profiler()
+
+
+# Decorates a function to time its calls as the named phase of the open record.
+def phase(name):
+    def decorate(function):
+        @wraps(function)
+        def timed(*args, **kwargs):
+            if profiler.current is None:
+                return function(*args, **kwargs)
+            profiler.enter(name)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.exit()
+        return timed
+    return decorate
+
+
+# Decorates a selection entry point so the open record is named after it.
+def entry_point(function):
+    @wraps(function)
+    def named(*args, **kwargs):
+        profiler.name(function.__name__)
+        return function(*args, **kwargs)
+    return named
+
+
+def count(name, amount=1):
+    profiler.count(name, amount)
@@ -0,0 +1,61 @@
+"""Compact per-mesh selection history for Context Select, kept apart from Blender's undo history."""
+import numpy as np
+
+
+class SelectionHistory:
+    """Recent selection states of one mesh, cheap enough to keep many of them for meshes with millions of components.
+
+    Only the current state is kept whole, as one bit per vert, edge and face. Every other state is reached through the
+    deltas between neighbouring states, stored as the indices of the components whose selection flipped, so a loop
+    selection costs a few kilobytes of history instead of the copy of the mesh an undo step takes.
+    """
+
+    def __init__(self, version, counts, selection, limit):
+        self.version = version  # The topology index version the component indices belong to.
+        self.counts = tuple(counts)
+        self.limit = limit
+        self.bits = [np.packbits(selected) for selected in selection]
+        self.deltas = []  # Per step, the flipped (verts, edges, faces) between the states either side of it.
+        self.position = 0  # The current state, as the number of deltas leading up to it.
+
+    def __len__(self):
+        return len(self.deltas) + 1
+
+    # Returns the current state as a boolean array per vert, edge and face.
+    def selection(self):
+        return [np.unpackbits(bits, count=count).astype(bool) for bits, count in zip(self.bits, self.counts)]
+
+    # Returns the selected verts, edges and faces of the current state.
+    def selected(self):
+        return [np.flatnonzero(selected) for selected in self.selection()]
+
+    # Takes the new selection as boolean arrays and makes it the current state, dropping any states stepped back
+    # over. Returns whether it differed from the current state.
+    def record(self, selection):
+        bits = [np.packbits(selected) for selected in selection]
+        flips = [np.flatnonzero(np.unpackbits(old ^ new, count=count)).astype(np.int32)
+                 for old, new, count in zip(self.bits, bits, self.counts)]
+        if not any(len(flipped) for flipped in flips):
+            return False
+        del self.deltas[self.position:]
+        self.deltas.append(flips)
+        del self.deltas[:max(len(self.deltas) - self.limit, 0)]
+        self.position = len(self.deltas)
+        self.bits = bits
+        return True
+
+    # Moves offset states back (negative) or forward and returns, per verts, edges and faces, the components to
+    # deselect and to select to get there. Returns None if there aren't that many states.
+    def step(self, offset):
+        target = self.position + offset
+        if offset == 0 or not 0 <= target <= len(self.deltas):
+            return None
+        selection = self.selection()
+        start = [selected.copy() for selected in selection]
+        for delta in (self.deltas[target:self.position] if offset < 0 else self.deltas[self.position:target]):
+            for selected, flipped in zip(selection, delta):
+                selected[flipped] = ~selected[flipped]
+        self.position = target
+        self.bits = [np.packbits(selected) for selected in selection]
+        return [(np.flatnonzero(before & ~after), np.flatnonzero(after & ~before))
+                for before, after in zip(start, selection)]
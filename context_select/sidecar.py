@@ -0,0 +1,144 @@
+"""Saved topology indexes for Context Select: the derived index arrays of big meshes, kept next to the .blend.
+
+Every topology gets its own directory named after its topology hash, holding one .npy file per array so they can be
+memory mapped back in. Only the derived arrays are saved; the arrays they're derived from are read from the mesh
+anyway to hash it, and a saved index is only used when that hash matches the one it was saved under.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from . import topology
+from . import edge_labels
+
+FORMAT_VERSION = 2
+MIN_FACES = 100000  # Smaller meshes are indexed faster than their saved index loads.
+MANIFEST = 'meshes.json'  # Mesh name -> topology hash of its last saved index.
+
+
+# Returns the sidecar directory for a .blend file path.
+def directory_for(blend_path):
+    return blend_path + '.context_select'
+
+
+# Takes a mesh's topology (as topology.read_topology returns it) and hidden flags and returns its index, loaded from
+# directory if an index was saved there for the same topology, otherwise built. Only big meshes are hashed, and only
+# when there's a directory to save them to; the index is tagged with the hash, or None, for saving it later.
+def load_or_build(directory, mesh_topology, hide):
+    vert_count, *base = mesh_topology
+    face_count = len(base[topology.BASE_ARRAYS.index('face_loop_start')])
+    key = topology.topology_hash(vert_count, *base) if directory and face_count >= MIN_FACES else None
+    index = load(directory, key, vert_count, base, hide) if key else None
+    if index is None:
+        index = topology.TopologyIndex(vert_count, *base, *hide)
+    index.topology_hash = key
+    return index
+
+
+# Returns the index saved under key, memory mapped, or None if there's none or it doesn't check out.
+def load(directory, key, vert_count, base, hide):
+    path = os.path.join(directory, key)
+    try:
+        with open(os.path.join(path, 'meta.json')) as file:
+            meta = json.load(file)
+        if meta.get('format') != FORMAT_VERSION or meta.get('hash') != key:
+            return None
+        arrays = dict(zip(topology.BASE_ARRAYS, base))
+        arrays.update(_load_arrays(path, meta['arrays']))
+        labels = _load_arrays(path, meta['labels']) if meta.get('labels') else None
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if _incomplete(arrays) or (labels is not None and _incomplete(labels)):
+        return None
+    index = topology.TopologyIndex.from_arrays(vert_count, arrays, *hide)
+    if labels is not None:
+        index.edge_labels = edge_labels.EdgeLabels.from_arrays(index, labels)
+    index.saved_labels = labels is not None
+    return index
+
+
+# Memory maps the named arrays, returning None for any whose shape or type isn't the one recorded when saving.
+def _load_arrays(path, shapes):
+    arrays = {}
+    for name, (shape, dtype) in shapes.items():
+        array = np.load(os.path.join(path, name + '.npy'), mmap_mode='r', allow_pickle=False)
+        arrays[name] = array if list(array.shape) == shape and array.dtype.str == dtype else None
+    return arrays
+
+
+def _incomplete(arrays):
+    return any(array is None for array in arrays.values())
+
+
+# Saves an index under its topology hash (hashing it now if it was built without one), unless it's too small or
+# already saved (with its labels, if it has them now), and records it as mesh_name's index in the manifest. Returns
+# whether anything was written.
+def save(directory, index, mesh_name):
+    if index.face_count < MIN_FACES:
+        return False
+    key = getattr(index, 'topology_hash', None)
+    if key is None:  # Built before there was anywhere to save it.
+        key = index.topology_hash = topology.topology_hash(
+            index.vert_count, *(getattr(index, name) for name in topology.BASE_ARRAYS))
+    labels = edge_labels.EdgeLabels.built_for(index)
+    path = os.path.join(directory, key)
+    written = False
+    if not os.path.isdir(path) or (labels is not None and not getattr(index, 'saved_labels', False)):
+        os.makedirs(directory, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.saving-', dir=directory)
+        try:
+            meta = {'format': FORMAT_VERSION, 'hash': key,
+                    'arrays': _save_arrays(staging, index, topology.DERIVED_ARRAYS),
+                    'labels': _save_arrays(staging, labels, edge_labels.LABEL_ARRAYS) if labels is not None else None}
+            with open(os.path.join(staging, 'meta.json'), 'w') as file:
+                json.dump(meta, file)
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(staging, path)  # Readers never see a half written index.
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+        index.saved_labels = labels is not None
+        written = True
+    manifest = _read_manifest(directory)
+    manifest[mesh_name] = key
+    _write_manifest(directory, manifest)
+    return written
+
+
+def _save_arrays(path, owner, names):
+    shapes = {}
+    for name in names:
+        array = np.ascontiguousarray(getattr(owner, name))
+        np.save(os.path.join(path, name + '.npy'), array, allow_pickle=False)
+        shapes[name] = (list(array.shape), array.dtype.str)
+    return shapes
+
+
+# Forgets meshes that aren't in live_names any more and deletes the saved indexes no mesh uses.
+def prune(directory, live_names):
+    if not os.path.isdir(directory):
+        return
+    manifest = {name: key for name, key in _read_manifest(directory).items() if name in live_names}
+    _write_manifest(directory, manifest)
+    used = set(manifest.values())
+    for entry in os.listdir(directory):
+        path = os.path.join(directory, entry)
+        if entry not in used and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _read_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST)) as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _write_manifest(directory, manifest):
+    with open(os.path.join(directory, MANIFEST), 'w') as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
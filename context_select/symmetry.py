@@ -0,0 +1,109 @@
+"""Mirror maps for Context Select: the vert, edge and face on the other side of a symmetric mesh."""
+import numpy as np
+from mathutils.kdtree import KDTree
+
+from . import topology
+
+AXES = {'X': 0, 'Y': 1, 'Z': 2}
+
+
+class MirrorMap:
+    """For every vert, edge and face of a mesh, its mirror image across one local axis, or -1 if it has none.
+
+    Verts are paired up through a KD-tree, within a distance tolerance of their mirrored position. Edges and faces
+    are paired through their verts, so a mirrored selection is an array lookup rather than a second walk.
+    """
+
+    def __init__(self, topo, coords, axis, tolerance):
+        self.verts = mirror_verts(np.asarray(coords, dtype=np.float64).reshape(-1, 3), AXES[axis], tolerance)
+        self.edges = mirror_edges(topo, self.verts)
+        self.faces = mirror_faces(topo, self.verts, self.edges)
+
+    # Caches mirror maps on the topology index they were built for, one per axis and tolerance. They're dropped along
+    # with it, and when verts move. read_coords() returns the local vert positions and is only called to build one.
+    @classmethod
+    def for_index(cls, topo, axis, tolerance, read_coords):
+        mirror_maps = getattr(topo, 'mirror_maps', None)
+        if mirror_maps is None:
+            mirror_maps = topo.mirror_maps = {}
+        key = (axis, tolerance)
+        if key not in mirror_maps:
+            mirror_maps[key] = cls(topo, read_coords(), axis, tolerance)
+        return mirror_maps[key]
+
+    # Takes 'VERT', 'EDGE' or 'FACE' and component indices and returns the mirror images that aren't among them.
+    def mirror(self, kind, indices):
+        table = {'VERT': self.verts, 'EDGE': self.edges, 'FACE': self.faces}[kind]
+        indices = np.asarray(indices, dtype=np.int64)
+        mirrored = table[indices]
+        return np.setdiff1d(mirrored[mirrored >= 0], indices)
+
+
+# Pairs each vert with the vert nearest its mirrored position, if that's within tolerance. Only verts on the positive
+# side (and the middle) are looked up, and pair up the verts they find with themselves.
+def mirror_verts(coords, axis, tolerance):
+    tree = KDTree(len(coords))
+    for vert, co in enumerate(coords.tolist()):
+        tree.insert(co, vert)
+    tree.balance()
+
+    vert_map = np.full(len(coords), -1, dtype=np.int32)
+    side = np.flatnonzero(coords[:, axis] >= -tolerance)
+    mirrored = coords[side]
+    mirrored[:, axis] = -mirrored[:, axis]
+    for vert, co in zip(side.tolist(), mirrored.tolist()):
+        _co, found, distance = tree.find(co)
+        if found is not None and distance <= tolerance:
+            vert_map[vert] = found
+            vert_map[found] = vert
+    return vert_map
+
+
+# Pairs each edge with the edge between its verts' mirror images.
+def mirror_edges(topo, vert_map):
+    keys = _edge_keys(topo.edge_verts, topo.vert_count)
+    order = np.argsort(keys)
+    ends = vert_map[topo.edge_verts]
+    mirrored = _edge_keys(ends, topo.vert_count)
+    found = order[np.minimum(np.searchsorted(keys, mirrored, sorter=order), len(keys) - 1)]
+    matched = (ends >= 0).all(axis=1) & (keys[found] == mirrored)
+    return np.where(matched, found, -1).astype(np.int32)
+
+
+def _edge_keys(edge_verts, vert_count):
+    edge_verts = edge_verts.astype(np.int64)
+    return edge_verts.min(axis=1) * vert_count + edge_verts.max(axis=1)
+
+
+# Pairs each face with the face whose verts are its verts' mirror images. The candidates are the faces of the mirror
+# image of its first edge, checked corner for corner.
+def mirror_faces(topo, vert_map, edge_map):
+    face_map = np.full(topo.face_count, -1, dtype=np.int32)
+    if topo.face_count == 0:
+        return face_map
+    # Each face's verts sorted, and each face's mirrored verts sorted, in the face corner layout.
+    sorted_verts = _sorted_by_face(topo, topo.loop_vert)
+    sorted_mirrored = _sorted_by_face(topo, vert_map[topo.loop_vert])
+
+    faces = np.arange(topo.face_count)
+    first_edge = edge_map[topo.loop_edge[topo.face_loop_start]]
+    for candidate in (0, 1):
+        open_faces = faces[(face_map < 0) & (first_edge >= 0)]
+        edges = first_edge[open_faces]
+        has = topo.edge_face_count[edges] > candidate
+        open_faces, edges = open_faces[has], edges[has]
+        others = topo.loop_face[topo.edge_loops[topo.edge_loop_offsets[edges] + candidate]]
+        same_size = topo.face_loop_total[open_faces] == topo.face_loop_total[others]
+        open_faces, others = open_faces[same_size], others[same_size]
+        if len(open_faces) == 0:
+            continue
+        counts = topo.face_loop_total[open_faces]
+        equal = (sorted_mirrored[topology.ranges(topo.face_loop_start[open_faces], counts)]
+                 == sorted_verts[topology.ranges(topo.face_loop_start[others], counts)])
+        matched = np.logical_and.reduceat(equal, np.cumsum(counts) - counts)
+        face_map[open_faces[matched]] = others[matched]
+    return face_map
+
+
+def _sorted_by_face(topo, values):
+    return values[np.lexsort((values, topo.loop_face))]
@@ -0,0 +1,1111 @@
+"""Array-backed topology index and walkers for Context Select."""
+import hashlib
+from itertools import chain
+
+import numpy as np
+
+from . import profiling
+
+# The arrays an index is made of, besides the hidden flags. The first five are read from the mesh and the rest are
+# derived from them.
+INDEX_ARRAYS = ('edge_verts', 'loop_vert', 'loop_edge', 'face_loop_start', 'face_loop_total',
+                'loop_face', 'loop_next', 'loop_prev', 'edge_face_count', 'edge_loop_offsets', 'edge_loops',
+                'loop_radial_next', 'vert_edge_count', 'vert_edge_offsets', 'vert_edges', 'vert_loop_count',
+                'edge_opposite')
+BASE_ARRAYS = INDEX_ARRAYS[:5]
+DERIVED_ARRAYS = INDEX_ARRAYS[5:]
+
+# Bits of the flag bytes walkers check each component against, instead of reading the arrays above a step at a time.
+HIDDEN = 1
+BOUNDARY = 2  # Edges with one face, and verts with any of them.
+WIRE = 4  # Edges with no faces, and verts with any of them.
+MANIFOLD = 8  # Edges with two faces.
+NONMANIFOLD = 16  # Edges with more than two faces.
+QUAD = 32  # Faces with four corners, and verts with four faces around them.
+CROSSING = 64  # Verts with more than two boundary edges, where a boundary runs into itself.
+
+
+class TopologyIndex:
+    """Half-edge style adjacency arrays for one mesh, built once and shared by every walk.
+
+    Element indices match the mesh (and the edit-mode BMesh it was synced from), so walks run on plain
+    integers and only the final result has to be mapped back to BMesh elements.
+    """
+
+    def __init__(self, vert_count, edge_verts, loop_vert, loop_edge, face_loop_start, face_loop_total,
+                 vert_hide=None, edge_hide=None, face_hide=None):
+        self.version = 0  # Bumped by whoever owns the index when it replaces an older one.
+        self.vert_count = vert_count
+        self.edge_count = len(edge_verts)
+        self.face_count = len(face_loop_start)
+        self.loop_count = len(loop_vert)
+
+        self.edge_verts = np.asarray(edge_verts, dtype=np.int32).reshape(-1, 2)
+        self.loop_vert = np.asarray(loop_vert, dtype=np.int32)
+        self.loop_edge = np.asarray(loop_edge, dtype=np.int32)
+        self.face_loop_start = np.asarray(face_loop_start, dtype=np.int32)
+        self.face_loop_total = np.asarray(face_loop_total, dtype=np.int32)
+
+        self.vert_hide = _flags(vert_hide, vert_count)
+        self.edge_hide = _flags(edge_hide, self.edge_count)
+        self.face_hide = _flags(face_hide, self.face_count)
+
+        # Face corners are stored contiguously per face, in face order.
+        loop_range = np.arange(self.loop_count, dtype=np.int32)
+        face_loop_end = self.face_loop_start + self.face_loop_total
+        self.loop_face = np.repeat(np.arange(self.face_count, dtype=np.int32), self.face_loop_total)
+        self.loop_next = loop_range + 1
+        self.loop_next[face_loop_end - 1] = self.face_loop_start
+        self.loop_prev = loop_range - 1
+        self.loop_prev[self.face_loop_start] = face_loop_end - 1
+
+        # Edge -> loops (CSR), and the radial cycle through the loops sharing an edge.
+        self.edge_face_count = np.bincount(self.loop_edge, minlength=self.edge_count).astype(np.int32)
+        self.edge_loop_offsets = _offsets(self.edge_face_count)
+        self.edge_loops = np.argsort(self.loop_edge, kind='stable').astype(np.int32)
+        sorted_edges = self.loop_edge[self.edge_loops]
+        is_last = np.ones(self.loop_count, dtype=bool)
+        is_last[:-1] = sorted_edges[1:] != sorted_edges[:-1]
+        radial_pos = np.where(is_last, self.edge_loop_offsets[sorted_edges], loop_range + 1)
+        self.loop_radial_next = np.empty(self.loop_count, dtype=np.int32)
+        self.loop_radial_next[self.edge_loops] = self.edge_loops[radial_pos]
+
+        # Vert -> edges (CSR) and how many face corners use each vertex.
+        flat_verts = self.edge_verts.ravel()
+        self.vert_edge_count = np.bincount(flat_verts, minlength=vert_count).astype(np.int32)
+        self.vert_edge_offsets = _offsets(self.vert_edge_count)
+        self.vert_edges = (np.argsort(flat_verts, kind='stable') // 2).astype(np.int32)
+        self.vert_loop_count = np.bincount(self.loop_vert, minlength=vert_count).astype(np.int32)
+
+        self.edge_opposite = self._fan_table()
+
+    # Reads a bpy.types.Mesh with bulk foreach_get calls.
+    # In edit mode call Object.update_from_editmode() first so the mesh matches the BMesh.
+    @classmethod
+    def from_mesh(cls, me):
+        return cls(*read_topology(me), *read_hide(me))
+
+    # Takes the vert count and every array in INDEX_ARRAYS by name, for instance memory mapped from a saved index,
+    # and returns the index made of them without deriving anything again. The arrays are never written to, so
+    # read-only ones are fine.
+    @classmethod
+    def from_arrays(cls, vert_count, arrays, vert_hide=None, edge_hide=None, face_hide=None):
+        index = cls.__new__(cls)
+        index.version = 0
+        index.vert_count = vert_count
+        for name in INDEX_ARRAYS:
+            setattr(index, name, arrays[name])
+        index.edge_count = len(index.edge_verts)
+        index.face_count = len(index.face_loop_start)
+        index.loop_count = len(index.loop_vert)
+        index.update_hide(vert_hide, edge_hide, face_hide)
+        return index
+
+    # Reads a BMesh directly, one element at a time, for meshes that have no Mesh datablock to bulk-read from.
+    # Element indices have to be valid, so call index_update() on each sequence first.
+    @classmethod
+    def from_bmesh(cls, bm):
+        edge_verts = [v.index for e in bm.edges for v in e.verts]
+        loops = [loop for f in bm.faces for loop in f.loops]
+        loop_vert = [loop.vert.index for loop in loops]
+        loop_edge = [loop.edge.index for loop in loops]
+        face_loop_total = np.array([len(f.loops) for f in bm.faces], dtype=np.int32)
+        vert_hide = [v.hide for v in bm.verts]
+        edge_hide = [e.hide for e in bm.edges]
+        face_hide = [f.hide for f in bm.faces]
+        return cls(len(bm.verts), edge_verts, loop_vert, loop_edge, _offsets(face_loop_total)[:-1], face_loop_total,
+                   vert_hide, edge_hide, face_hide)
+
+    # Builds an index from plain Python data, the way Mesh.from_pydata() would: loose edges plus faces given as
+    # vertex index sequences, with the face edges derived from them. Edges are numbered in order of appearance,
+    # loose edges first. Needs no Blender at all, for tests and batch processing.
+    @classmethod
+    def from_pydata(cls, vert_count, edges, faces, vert_hide=None, edge_hide=None, face_hide=None):
+        face_loop_total = np.fromiter(map(len, faces), dtype=np.int32, count=len(faces))
+        loop_vert = np.fromiter(chain.from_iterable(faces), dtype=np.int32, count=int(face_loop_total.sum()))
+        return cls.from_loops(vert_count, loop_vert, _offsets(face_loop_total)[:-1], face_loop_total, edges,
+                              vert_hide, edge_hide, face_hide)
+
+    # Like from_pydata, with the faces given as arrays of face corner verts plus each face's run of corners.
+    @classmethod
+    def from_loops(cls, vert_count, loop_vert, face_loop_start, face_loop_total, edges=(),
+                   vert_hide=None, edge_hide=None, face_hide=None):
+        loop_vert = np.asarray(loop_vert, dtype=np.int32)
+        face_loop_start = np.asarray(face_loop_start, dtype=np.int32)
+        face_loop_total = np.asarray(face_loop_total, dtype=np.int32)
+
+        # Each face corner's edge runs to the next corner of the same face.
+        next_corner = np.arange(1, len(loop_vert) + 1)
+        next_corner[face_loop_start + face_loop_total - 1] = face_loop_start
+        pairs = np.concatenate((np.asarray(edges, dtype=np.int64).reshape(-1, 2),
+                                np.stack((loop_vert, loop_vert[next_corner]), axis=1)))
+        pairs.sort(axis=1)
+        _keys, first, inverse = np.unique(pairs[:, 0] * vert_count + pairs[:, 1], return_index=True,
+                                          return_inverse=True)
+        order = np.argsort(first, kind='stable')
+        edge_number = np.empty(len(order), dtype=np.int32)
+        edge_number[order] = np.arange(len(order), dtype=np.int32)
+        loop_edge = edge_number[inverse.ravel()][len(pairs) - len(loop_vert):]
+        return cls(vert_count, pairs[first[order]], loop_vert, loop_edge, face_loop_start, face_loop_total,
+                   vert_hide, edge_hide, face_hide)
+
+    # Replaces the hidden flags, for when hiding or revealing is all that changed.
+    def update_hide(self, vert_hide, edge_hide, face_hide):
+        self.vert_hide = _flags(vert_hide, self.vert_count)
+        self.edge_hide = _flags(edge_hide, self.edge_count)
+        self.face_hide = _flags(face_hide, self.face_count)
+        labels = getattr(self, 'edge_labels', None)
+        if labels is not None:
+            labels.update_hidden()
+        self.flags = None  # The hidden bits change, so the flags are packed again on next use.
+        self.islands = None  # Hiding splits islands, so they're rebuilt on next use.
+        self.uv_indices = None  # Same for UV islands, and the UV indexes carry their own copy of the flags.
+
+    def counts(self):
+        return self.vert_count, self.edge_count, self.face_count
+
+    # Returns the flag bits of every vert, edge and face as three bytes objects, packed on first use after the index
+    # is built or its hidden flags change. Indexing bytes gives a plain int, so a walk step checks a component's
+    # dead end conditions with one cheap lookup instead of several numpy scalar reads.
+    def walk_flags(self):
+        flags = getattr(self, 'flags', None)
+        if flags is None:
+            face_count = self.edge_face_count
+            edge_bits = np.select([face_count == 0, face_count == 1, face_count == 2],
+                                  [WIRE, BOUNDARY, MANIFOLD], NONMANIFOLD).astype(np.uint8)
+            edge_bits |= self.edge_hide.astype(np.uint8) * HIDDEN
+
+            ends = self.edge_verts.ravel()
+            end_face_count = np.repeat(face_count, 2)
+            boundary_count = np.bincount(ends, end_face_count == 1, minlength=self.vert_count)
+            wire_count = np.bincount(ends, end_face_count == 0, minlength=self.vert_count)
+            vert_bits = self.vert_hide.astype(np.uint8) * HIDDEN
+            vert_bits |= (boundary_count > 0).astype(np.uint8) * BOUNDARY
+            vert_bits |= (boundary_count > 2).astype(np.uint8) * CROSSING
+            vert_bits |= (wire_count > 0).astype(np.uint8) * WIRE
+            vert_bits |= (self.vert_loop_count == 4).astype(np.uint8) * QUAD
+
+            face_bits = self.face_hide.astype(np.uint8) * HIDDEN
+            face_bits |= (self.face_loop_total == 4).astype(np.uint8) * QUAD
+            flags = self.flags = (vert_bits.tobytes(), edge_bits.tobytes(), face_bits.tobytes())
+        return flags
+
+    def vert_edges_of(self, vert):
+        return self.vert_edges[self.vert_edge_offsets[vert]:self.vert_edge_offsets[vert + 1]]
+
+    def edge_loops_of(self, edge):
+        return self.edge_loops[self.edge_loop_offsets[edge]:self.edge_loop_offsets[edge + 1]]
+
+    def face_loops_of(self, face):
+        start = int(self.face_loop_start[face])
+        return range(start, start + int(self.face_loop_total[face]))
+
+    def other_vert(self, edge, vert):
+        v0 = self.edge_verts[edge, 0]
+        return int(self.edge_verts[edge, 1] if v0 == vert else v0)
+
+    def is_manifold_edge(self, edge):
+        return self.edge_face_count[edge] == 2
+
+    # Takes an edge + vert and returns the edge in the loop direction through the vert, or -1.
+    def opposite_edge(self, edge, vert):
+        return int(self.edge_opposite[edge, 0 if self.edge_verts[edge, 0] == vert else 1])
+
+    # Returns an (edge count, 2) table holding, for each end of each edge, the edge opposite it in the fan around
+    # that vertex, or -1. Array equivalent of Blender's BM_vert_step_fan_loop for every edge at once:
+    # only manifold valence 4 fans can be stepped through.
+    # Blender steps from whichever face of the edge it meets first. That only matters for non-manifold edges, where
+    # the faces can disagree, so every face is stepped from and an edge whose faces disagree has no opposite.
+    # (Blender's retry from the side edge's radial loop never helps: it steps across the same non-manifold edge.)
+    def _fan_table(self):
+        table = np.full((self.edge_count, 2), -1, dtype=np.int32)
+        edges = np.flatnonzero(self.edge_face_count > 0)
+        counts = self.edge_face_count[edges]
+        loop = self.edge_loops[ranges(self.edge_loop_offsets[edges], counts)]
+        run_begins = np.cumsum(counts) - counts
+        for end in (0, 1):
+            vert = self.edge_verts[self.loop_edge[loop], end]
+            regular = (self.vert_loop_count[vert] == 4) & (self.vert_edge_count[vert] == 4)
+            # The loop in the same face that shares the vert, then across that (manifold) edge into the next face.
+            side = np.where(self.loop_vert[loop] == vert, self.loop_prev[loop], self.loop_next[loop])
+            regular &= self.edge_face_count[self.loop_edge[side]] == 2
+            radial = self.loop_radial_next[side]
+            step = np.where(self.loop_vert[radial] == vert, self.loop_prev[radial], self.loop_next[radial])
+            opposite = np.where(regular, self.loop_edge[step], -1)
+            agree = np.minimum.reduceat(opposite, run_begins) == np.maximum.reduceat(opposite, run_begins)
+            table[edges, end] = np.where(agree, opposite[run_begins], -1)
+        return table
+
+    # Takes a loop and returns the loop on the opposite edge of the next face over, i.e. one step along a face loop.
+    def face_step(self, loop):
+        return int(self.loop_next[self.loop_next[self.loop_radial_next[loop]]])
+
+    # ##################### Bulk Neighbourhood Queries ##################### #
+
+    # Takes an array of verts and returns every edge touching them (with repeats).
+    def edges_of_verts(self, verts):
+        return csr_gather(self.vert_edge_offsets, self.vert_edges, verts)
+
+    # Takes an array of edges and returns every face using them (with repeats).
+    def faces_of_edges(self, edges):
+        return self.loop_face[csr_gather(self.edge_loop_offsets, self.edge_loops, edges)]
+
+    # Takes an array of faces and returns their loops face by face, plus the offsets of each face's run.
+    def loops_of_faces(self, faces):
+        counts = self.face_loop_total[faces]
+        return ranges(self.face_loop_start[faces], counts), _offsets(counts)
+
+
+# Takes arrays of run starts and lengths and returns the concatenated index ranges, vectorized.
+def ranges(starts, counts):
+    run_begins = np.cumsum(counts) - counts
+    return np.repeat(starts - run_begins, counts) + np.arange(counts.sum())
+
+
+# Takes CSR offsets/values and an array of keys and returns the concatenated value runs of those keys.
+def csr_gather(offsets, values, keys):
+    keys = np.asarray(keys, dtype=np.int64)
+    starts = offsets[keys]
+    return values[ranges(starts, offsets[keys + 1] - starts)]
+
+
+# Reads a bpy.types.Mesh's vert count and the BASE_ARRAYS of its topology with bulk foreach_get calls.
+def read_topology(me):
+    return (len(me.vertices),
+            _foreach_get(me.edges, 'vertices', len(me.edges) * 2, np.int32).reshape(-1, 2),
+            _foreach_get(me.loops, 'vertex_index', len(me.loops), np.int32),
+            _foreach_get(me.loops, 'edge_index', len(me.loops), np.int32),
+            _foreach_get(me.polygons, 'loop_start', len(me.polygons), np.int32),
+            _foreach_get(me.polygons, 'loop_total', len(me.polygons), np.int32))
+
+
+# Takes a vert count and the BASE_ARRAYS of a topology and returns a hash identifying it.
+def topology_hash(vert_count, *arrays):
+    digest = hashlib.blake2b(np.int64(vert_count).tobytes(), digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array, dtype=np.int32)
+        digest.update(np.int64(array.size).tobytes())
+        digest.update(array)
+    return digest.hexdigest()
+
+
+# Reads the hidden flags of a bpy.types.Mesh's verts, edges and faces.
+def read_hide(me):
+    return (_foreach_get(me.vertices, 'hide', len(me.vertices), bool),
+            _foreach_get(me.edges, 'hide', len(me.edges), bool),
+            _foreach_get(me.polygons, 'hide', len(me.polygons), bool))
+
+
+# Reads the local positions of a bpy.types.Mesh's verts as a (vert count, 3) array.
+def read_coords(me):
+    return _foreach_get(me.vertices, 'co', len(me.vertices) * 3, np.float32).reshape(-1, 3)
+
+
+# Reads the selection flags of a bpy.types.Mesh's verts, edges and faces.
+def read_selection(me):
+    return (_foreach_get(me.vertices, 'select', len(me.vertices), bool),
+            _foreach_get(me.edges, 'select', len(me.edges), bool),
+            _foreach_get(me.polygons, 'select', len(me.polygons), bool))
+
+
+def _flags(values, count):
+    if values is None:
+        return np.zeros(count, dtype=bool)
+    return np.asarray(values, dtype=bool)
+
+
+def _offsets(counts):
+    offsets = np.zeros(len(counts) + 1, dtype=np.int32)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _foreach_get(collection, attr, size, dtype):
+    values = np.empty(size, dtype=dtype)
+    collection.foreach_get(attr, values)
+    return values
+
+
+# Joins two walks that both start at the same component into one ordered list.
+def _join(first, second):
+    joined = first[::-1]
+    seen = set(first)
+    joined.extend(c for c in second if c not in seen)
+    return joined
+
+
+# ##################### Partial Loop (Fragment) Selections ##################### #
+
+# The walk_* generators do one step per iteration, yielding the partial list so far, and return
+# (partial_list, infinite) once they reach a dead end. partial_* run a walk to completion.
+
+def run_walk(walk):
+    steps = 1
+    try:
+        while True:
+            next(walk)
+            steps += 1
+    except StopIteration as finished:
+        profiling.count('walk steps', steps)
+        return finished.value
+
+
+def partial_loop_edge_manifold(topo, prefs, starting_edge, starting_vert, reference_list, ends=None):
+    return run_walk(walk_loop_edge_manifold(topo, prefs, starting_edge, starting_vert, reference_list, ends))
+
+
+def partial_loop_vert_manifold(topo, prefs, starting_edge, starting_vert, reference_list, ends=None):
+    return run_walk(walk_loop_vert_manifold(topo, prefs, starting_edge, starting_vert, reference_list, ends))
+
+
+def partial_loop_face(topo, prefs, cur_loop, starting_face, reference_list, ends=None):
+    return run_walk(walk_loop_face(topo, prefs, cur_loop, starting_face, reference_list, ends))
+
+
+def partial_ring_edge(topo, prefs, starting_loop, starting_edge, reference_list, ends=None):
+    return run_walk(walk_ring_edge(topo, prefs, starting_loop, starting_edge, reference_list, ends))
+
+
+# Takes an edge and the vertex to walk away from, and returns an ordered list of edges until reaching a dead end,
+# plus whether the walk came back around to the starting edge.
+# For a bounded selection between two edges it also requires the two end edges for dead end validation.
+def walk_loop_edge_manifold(topo, prefs, starting_edge, starting_vert, reference_list, ends=None):
+    vert_bits, edge_bits, _face_bits = topo.walk_flags()
+    hidden = 0 if prefs.ignore_hidden_geometry else HIDDEN
+    e_step = starting_edge
+    cv = topo.other_vert(starting_edge, starting_vert)  # Current Vert
+    partial_list = [starting_edge]
+    infinite = False
+
+    while True:
+        pv = cv  # Previous Vert
+        next_edge = topo.opposite_edge(e_step, pv)
+        if next_edge < 0:  # finite and we've reached an end
+            break
+        e_step = next_edge
+        cv = topo.other_vert(e_step, pv)
+
+        if ends is None:
+            reached_end = infinite = e_step == starting_edge
+        else:
+            reached_end = e_step in ends
+            infinite = reached_end and e_step == starting_edge
+        is_intersect = prefs.terminate_self_intersects and cv in reference_list
+        is_hidden = (vert_bits[cv] | edge_bits[e_step]) & hidden
+
+        reference_list.add(pv)
+        if not infinite:
+            partial_list.append(e_step)
+        if reached_end or is_intersect or is_hidden:
+            break
+        yield partial_list
+    return partial_list, infinite
+
+
+# Takes an edge and the vertex to walk away from, and returns an ordered list of verts until reaching a dead end,
+# plus whether the walk came back around to the starting vert.
+# For a bounded selection between two vertices it also requires the two end vertices for dead end validation.
+def walk_loop_vert_manifold(topo, prefs, starting_edge, starting_vert, reference_list, ends=None):
+    vert_bits, edge_bits, _face_bits = topo.walk_flags()
+    hidden = 0 if prefs.ignore_hidden_geometry else HIDDEN
+    e_step = starting_edge
+    cv = topo.other_vert(starting_edge, starting_vert)  # Current Vert
+    partial_list = [starting_vert]
+    infinite = False
+
+    while True:
+        pv = cv  # Previous Vert
+        next_edge = topo.opposite_edge(e_step, pv)
+        if next_edge < 0:  # finite and we've reached an end
+            partial_list.append(pv)
+            break
+        e_step = next_edge
+        cv = topo.other_vert(e_step, pv)
+
+        if ends is None:
+            reached_end = infinite = pv == starting_vert
+        else:
+            reached_end = pv in ends
+            infinite = reached_end and pv == starting_vert
+        is_intersect = prefs.terminate_self_intersects and pv in reference_list
+        is_hidden = (vert_bits[pv] | edge_bits[e_step]) & hidden
+
+        reference_list.add(pv)
+        if not infinite:
+            partial_list.append(pv)
+        if reached_end or is_intersect or is_hidden:
+            break
+        yield partial_list
+    return partial_list, infinite
+
+
+# Takes a loop and its starting face and returns an ordered list of faces until hitting a dead end,
+# plus whether the walk came back around to the starting face.
+# For a bounded selection between two faces it also requires the two end faces for dead end validation.
+def walk_loop_face(topo, prefs, cur_loop, starting_face, reference_list, ends=None):
+    _vert_bits, edge_bits, face_bits = topo.walk_flags()
+    hidden = 0 if prefs.ignore_hidden_geometry else HIDDEN
+    partial_list = [starting_face]
+    members = {starting_face}
+    infinite = False
+
+    while True:
+        next_loop = topo.face_step(cur_loop)
+        next_face = int(topo.loop_face[next_loop])
+
+        if ends is None:
+            reached_end = infinite = next_face == starting_face
+        else:
+            reached_end = next_face in ends
+            infinite = reached_end and next_face == starting_face
+        is_intersect = prefs.terminate_self_intersects and next_face in reference_list
+        is_hidden = face_bits[next_face] & hidden
+        is_non_quad = not face_bits[next_face] & QUAD
+        is_non_manifold = not edge_bits[topo.loop_edge[cur_loop]] & edge_bits[topo.loop_edge[next_loop]] & MANIFOLD
+
+        if next_face not in members and (not is_non_quad or prefs.allow_non_quads_at_ends):
+            members.add(next_face)
+            partial_list.append(next_face)
+        reference_list.add(next_face)
+        if reached_end or is_intersect or is_hidden or is_non_quad or is_non_manifold:
+            break
+        cur_loop = next_loop
+        yield partial_list
+    return partial_list, infinite
+
+
+# Takes a loop and starting edge and returns an ordered list of ring edges until reaching a dead end,
+# plus whether the walk came back around to the starting edge.
+# For a bounded selection between two edges it also requires the two end edges for dead end validation.
+def walk_ring_edge(topo, prefs, starting_loop, starting_edge, reference_list, ends=None):
+    _vert_bits, edge_bits, face_bits = topo.walk_flags()
+    hidden = 0 if prefs.ignore_hidden_geometry else HIDDEN
+    cur_loop = starting_loop
+    partial_list = [starting_edge]
+    members = {starting_edge}
+    infinite = False
+
+    while True:
+        next_loop = topo.face_step(cur_loop)
+        next_edge = int(topo.loop_edge[next_loop])
+        next_face = int(topo.loop_face[next_loop])
+
+        if ends is None:
+            reached_end = infinite = next_edge == starting_edge
+        else:
+            reached_end = next_edge in ends
+            infinite = reached_end and next_edge == starting_edge
+        is_intersect = prefs.terminate_self_intersects and next_face in reference_list
+        face_hidden = face_bits[next_face] & hidden
+        is_hidden = face_hidden or edge_bits[next_edge] & hidden
+        is_non_quad = not face_bits[next_face] & QUAD
+        is_non_manifold = not edge_bits[next_edge] & MANIFOLD
+
+        if next_edge not in members:
+            if not is_non_quad and not face_hidden:
+                members.add(next_edge)
+                partial_list.append(next_edge)
+            reference_list.add(next_face)
+        if reached_end or is_intersect or is_hidden or is_non_quad or is_non_manifold:
+            break
+        cur_loop = next_loop
+        yield partial_list
+    return partial_list, infinite
+
+
+# Takes a vertex and connected edge and returns a set of boundary verts starting at the vert until reaching a dead end,
+# plus whether the walk came back around to the starting vert. A port of the add-on's original BMesh walker, hacks
+# and all, so it selects exactly the verts that did.
+# For a bounded selection between two vertices it also requires the two end vertices for dead end validation.
+def partial_loop_vert_boundary(topo, prefs, starting_vert, starting_edge, ends=None):
+    cur_edges = [starting_edge]
+    edge_bits = topo.walk_flags()[1]
+    visited_edges = {starting_edge}
+    visited_verts = {starting_vert}
+    infinite = False
+
+    loop = 0
+    while True:
+        edge_verts = [v for e in cur_edges for v in topo.edge_verts[e].tolist() if v not in visited_verts]
+        new_edges = []
+        for v in edge_verts:
+            for e in open_edges(topo, v):
+                dead_end, reached_start = dead_end_boundary(topo, prefs, v, e, v, starting_vert, visited_verts, ends)
+                infinite = infinite or reached_start
+                visited_verts.add(v)
+                if not dead_end and e not in visited_edges and edge_bits[e] & BOUNDARY:
+                    new_edges.append(e)
+
+        if len(new_edges) == 0:
+            break
+        cur_edges = new_edges
+        if ends is None:
+            if loop == 1:  # The first vert has to be visitable again for the walk to find its way back to it.
+                visited_verts.discard(starting_vert)
+            loop += 1
+    return visited_verts, infinite
+
+
+# Takes a vertex and connected wire edge and returns a set of wire verts starting at the vert until reaching a dead end,
+# plus whether the walk came back around to the starting vert.
+# Only works on wire loops with 1-2 edges per vertex
+def partial_loop_vert_wire(topo, prefs, starting_vert, starting_edge, ends=None):
+    cur_edge = starting_edge
+    next_vert = topo.other_vert(cur_edge, starting_vert)
+    partial_list = {starting_vert}
+
+    while True:
+        partial_list.add(next_vert)
+        linked_edges = topo.vert_edges_of(next_vert).tolist()
+        if len(linked_edges) < 2:
+            return partial_list, False
+        next_edge = [e for e in linked_edges if e != cur_edge][0]
+        dead_end, infinite = dead_end_wire(topo, prefs, next_vert, next_edge, next_vert, starting_vert,
+                                           linked_edges, ends)
+        if dead_end:
+            return partial_list, infinite
+        next_vert = topo.other_vert(next_edge, next_vert)
+        cur_edge = next_edge
+
+
+# Takes an edge and connected vertex and returns a set of boundary edges starting at the edge until reaching a dead end,
+# plus whether the walk came back around to the starting edge.
+# For a bounded selection between two edges it also requires the two end edges for dead end validation.
+def partial_loop_edge_boundary(topo, prefs, starting_edge, starting_vert, ends=None):
+    cur_edges = [starting_edge]
+    edge_bits = topo.walk_flags()[1]
+    final_selection = set()
+    visited_verts = {starting_vert}
+    infinite = False
+
+    loop = 0
+    while True:
+        edge_verts = [v for e in cur_edges for v in topo.edge_verts[e].tolist() if v not in visited_verts]
+        new_edges = []
+        for v in edge_verts:
+            for e in open_edges(topo, v):
+                dead_end, reached_start = dead_end_boundary(topo, prefs, v, e, e, starting_edge, final_selection, ends)
+                infinite = infinite or reached_start
+                visited_verts.add(v)
+                if not dead_end and e not in final_selection and edge_bits[e] & BOUNDARY:
+                    new_edges.append(e)
+        final_selection.update(new_edges)
+
+        if len(new_edges) == 0:
+            break
+        cur_edges = new_edges
+        if loop == 1:  # The first edge has to be visitable again for the walk to find its way back to it.
+            visited_verts.discard(starting_vert)
+        loop += 1
+    return final_selection, infinite
+
+
+# Takes a wire edge and connected vert and returns a set of wire edges starting at the edge until reaching a dead end,
+# plus whether the walk came back around to the starting edge.
+# Only works on wire loops with 1-2 edges per vertex
+def partial_loop_edge_wire(topo, prefs, starting_edge, starting_vert, ends=None):
+    cur_edge = starting_edge
+    next_vert = topo.other_vert(cur_edge, starting_vert)
+    partial_list = {starting_edge}
+
+    while True:
+        linked_edges = topo.vert_edges_of(next_vert).tolist()
+        if len(linked_edges) < 2:
+            return partial_list, False
+        next_edge = [e for e in linked_edges if e != cur_edge][0]
+        if len(linked_edges) <= 2:
+            partial_list.add(next_edge)
+        dead_end, infinite = dead_end_wire(topo, prefs, next_vert, next_edge, next_edge, starting_edge,
+                                           linked_edges, ends)
+        if dead_end:
+            return partial_list, infinite
+        next_vert = topo.other_vert(next_edge, next_vert)
+        cur_edge = next_edge
+
+
+# Takes a non-manifold edge (one with more than two faces) and the vertex to walk away from, and returns an ordered
+# list of edges (or with verts set, of vertices) along the chain of non-manifold edges until reaching a dead end, plus
+# whether the walk came back around to the start. Like a wire loop, the chain only continues through a vertex with
+# exactly two non-manifold edges, so it stops where extrusions and intersections branch off.
+# For a bounded selection it also requires the two end components for dead end validation.
+def walk_loop_nonmanifold(topo, prefs, starting_edge, starting_vert, ends=None, verts=False):
+    vert_bits, edge_bits, _face_bits = topo.walk_flags()
+    hidden = 0 if prefs.ignore_hidden_geometry else HIDDEN
+    cur_edge = starting_edge
+    cur_vert = topo.other_vert(starting_edge, starting_vert)
+    start = starting_vert if verts else starting_edge
+    partial_list = [starting_vert, cur_vert] if verts else [starting_edge]
+    infinite = False
+    if verts and ends is not None and cur_vert in ends:
+        return partial_list, False
+
+    while True:
+        linked_edges = nonmanifold_edges(topo, cur_vert)
+        if len(linked_edges) != 2:  # The end of the chain, or a junction.
+            break
+        next_edge = linked_edges[1] if linked_edges[0] == cur_edge else linked_edges[0]
+        next_vert = topo.other_vert(next_edge, cur_vert)
+        component = next_vert if verts else next_edge
+
+        if ends is None:
+            reached_end = infinite = component == start
+        else:
+            reached_end = component in ends
+            infinite = reached_end and component == start
+        is_hidden = (vert_bits[next_vert] | edge_bits[next_edge]) & hidden
+
+        if is_hidden:
+            break
+        if not infinite:
+            partial_list.append(component)
+        if reached_end:
+            break
+        cur_edge = next_edge
+        cur_vert = next_vert
+        yield partial_list
+    return partial_list, infinite
+
+
+# ##################### Dead End conditions ##################### #
+
+# Edges around a vertex with more than two faces, the only ones the non-manifold walker considers.
+def nonmanifold_edges(topo, vert):
+    edge_bits = topo.walk_flags()[1]
+    return [e for e in topo.vert_edges_of(vert).tolist() if edge_bits[e] & NONMANIFOLD]
+
+
+# Boundary and wire edges around a vertex, the only ones the boundary walkers consider.
+def open_edges(topo, vert):
+    edge_bits = topo.walk_flags()[1]
+    return [e for e in topo.vert_edges_of(vert).tolist() if edge_bits[e] & (BOUNDARY | WIRE)]
+
+
+# The dead end rules shared by the boundary vert and edge walkers, where component is the vert or edge just reached.
+# Returns (dead end, reached the starting component). Like the original BMesh walkers, bounded walks add the
+# component to partial_list when they reach an end.
+def dead_end_boundary(topo, prefs, vert, edge, component, start, partial_list, ends=None):
+    vert_bits, edge_bits, _face_bits = topo.walk_flags()
+    if ends is None:  # For non-bounded selections.
+        # Loop is infinite and we're done
+        reached_end = infinite = start in partial_list and component == start
+        # Self-intersecting loop and pref doesn't allow it
+        is_intersect = prefs.terminate_self_intersects and vert_bits[vert] & CROSSING
+    else:  # For bounded selections between 2 components.
+        # Looped back on self, or reached other component in a bounded selection
+        reached_end = start in partial_list and component == ends[0] or component == ends[1]
+        infinite = False
+        if reached_end:
+            partial_list.add(component)
+            infinite = start in partial_list and component == start
+        # For bounded selections, we always terminate here because it's too complicated to grok otherwise
+        is_intersect = vert_bits[vert] & CROSSING
+
+    # Vertex/edge is hidden and pref to ignore hidden geometry isn't enabled
+    is_hidden = not prefs.ignore_hidden_geometry and (vert_bits[vert] | edge_bits[edge]) & HIDDEN
+    # Vertex on the mesh boundary is connected to a wire edge and pref to ignore wires isn't enabled
+    is_wire = not prefs.ignore_boundary_wires and vert_bits[vert] & WIRE
+    return bool(reached_end or is_intersect or is_hidden or is_wire), infinite
+
+
+# The dead end rules shared by the wire vert and edge walkers, where component is the vert or edge just reached.
+# Returns (dead end, reached the starting component).
+def dead_end_wire(topo, prefs, vert, edge, component, start, linked_edges, ends=None):
+    if ends is None:  # For non-bounded selections.
+        reached_end = infinite = component == start
+    else:  # For bounded selections between 2 components.
+        reached_end = component in ends
+        infinite = reached_end and component == start
+
+    # For wire loops we can't continue if a vertex has more or less than 2 connected edges
+    cant_continue = len(linked_edges) != 2
+    # Vertex/edge is hidden and pref to ignore hidden geometry isn't enabled
+    vert_bits, edge_bits, _face_bits = topo.walk_flags()
+    is_hidden = not prefs.ignore_hidden_geometry and (vert_bits[vert] | edge_bits[edge]) & HIDDEN
+    return bool(reached_end or cant_continue or is_hidden), infinite
+
+
+# ##################### Full Loop Selections ##################### #
+
+# Takes a starting vertex and a connected reference edge and returns an ordered full loop of vertex indices.
+def full_loop_vert_manifold(topo, prefs, starting_vert, starting_edge):
+    if not prefs.ignore_hidden_geometry and topo.edge_hide[starting_edge]:
+        return None
+    if topo.vert_loop_count[starting_vert] != 4:
+        starting_vert = topo.other_vert(starting_edge, starting_vert)
+        if topo.vert_loop_count[starting_vert] != 4:  # Checking if both verts are unusable.
+            return None
+    starting_edges = [starting_edge]
+    opposite_edge = topo.opposite_edge(starting_edge, starting_vert)
+    if opposite_edge >= 0:
+        starting_edges.append(opposite_edge)
+    vert_list = []
+    reference_list = set()
+
+    for edge in starting_edges:
+        if not prefs.ignore_hidden_geometry and topo.edge_hide[edge]:
+            continue
+        partial_list, infinite = partial_loop_vert_manifold(topo, prefs, edge, starting_vert, reference_list)
+        vert_list = _join(vert_list, partial_list) if vert_list else partial_list
+        if infinite:
+            break  # Early out so we don't get the same loop twice.
+    return vert_list
+
+
+# Takes an edge and face and returns an ordered loop of face indices for the ring direction of that edge.
+def full_loop_face(topo, prefs, edge, face):
+    if topo.edge_face_count[edge] > 2:
+        return None
+    starting_loop = [loop for loop in topo.edge_loops_of(edge).tolist() if topo.loop_face[loop] == face][0]
+    loops = [starting_loop, int(topo.loop_radial_next[starting_loop])]
+    face_list = []
+    reference_list = set()
+
+    for loop in loops:
+        partial_list, infinite = partial_loop_face(topo, prefs, loop, int(topo.loop_face[loop]), reference_list)
+        face_list = _join(face_list, partial_list) if face_list else partial_list
+        if infinite:
+            break  # Early out so we don't get the same loop twice.
+    return face_list
+
+
+# Takes an edge and returns an ordered full loop of edge indices.
+def full_loop_edge_manifold(topo, prefs, edge):
+    v0, v1 = topo.edge_verts[edge].tolist()
+    if topo.vert_loop_count[v0] == 4:
+        starting_vert = v0
+    elif topo.vert_loop_count[v1] == 4:
+        starting_vert = v1
+    else:
+        return []
+    starting_edges = [edge]
+    opposite_edge = topo.opposite_edge(edge, starting_vert)
+    if opposite_edge >= 0:
+        starting_edges.append(opposite_edge)
+    edge_list = []
+    reference_list = set()
+
+    for e in starting_edges:
+        partial_list, infinite = partial_loop_edge_manifold(topo, prefs, e, starting_vert, reference_list)
+        edge_list = _join(edge_list, partial_list) if edge_list else partial_list
+        if infinite:
+            break  # Early out so we don't get the same loop twice.
+    return edge_list
+
+
+# Takes an edge and returns an ordered ring of edge indices for that edge.
+def full_ring_edge_manifold(topo, prefs, starting_edge):
+    starting_loop = int(topo.edge_loops[topo.edge_loop_offsets[starting_edge]])
+    loops = [starting_loop, int(topo.loop_radial_next[starting_loop])]
+    edge_list = []
+    reference_list = set()
+
+    for loop in loops:
+        partial_list, infinite = partial_ring_edge(topo, prefs, loop, starting_edge, reference_list)
+        edge_list = _join(edge_list, partial_list) if edge_list else partial_list
+        if infinite:
+            break  # Early out so we don't get the same loop twice.
+    return edge_list
+
+
+# Returns the edges of a vertex with face_count faces (1 for boundary, 0 for wire) that a walk may start along.
+def _starting_edges(topo, prefs, vert, face_count):
+    return [e for e in topo.vert_edges_of(vert).tolist() if topo.edge_face_count[e] == face_count
+            and (prefs.ignore_hidden_geometry or not topo.edge_hide[e])]
+
+
+# Takes a boundary vertex and returns a sorted list of the boundary loop's vertex indices.
+def full_loop_vert_boundary(topo, prefs, starting_vert):
+    vert_list = set()
+    for e in _starting_edges(topo, prefs, starting_vert, 1):
+        partial_list, infinite = partial_loop_vert_boundary(topo, prefs, starting_vert, e)
+        vert_list.update(partial_list)
+        if infinite:
+            break  # Early out so we don't get the same loop twice.
+    return sorted(vert_list)
+
+
+# Takes a wire vertex and returns a sorted list of wire vertex indices if they are part of a stand-alone loop.
+# Only works on wire loops with 1-2 edges per vertex
+def full_loop_vert_wire(topo, prefs, starting_vert):
+    edges = _starting_edges(topo, prefs, starting_vert, 0)
+    if len(edges) not in (1, 2):
+        return None
+    vert_list = set()
+    for e in edges:
+        partial_list, infinite = partial_loop_vert_wire(topo, prefs, starting_vert, e)
+        vert_list.update(partial_list)
+        if infinite:
+            break  # Early out so we don't get the same loop twice.
+    return sorted(vert_list)
+
+
+# Takes a boundary edge and returns a sorted list of boundary edge indices.
+def full_loop_edge_boundary(topo, prefs, edge):
+    edge_list = set()
+    for v in topo.edge_verts[edge].tolist():
+        partial_list, infinite = partial_loop_edge_boundary(topo, prefs, edge, v)
+        edge_list.update(partial_list)
+        if infinite:
+            break  # Early out so we don't get the same loop twice.
+    return sorted(edge_list)
+
+
+# Takes a wire edge and returns a sorted list of connected wire edges in a loop.
+# Only works on wire loops with 1-2 edges per vertex
+def full_loop_edge_wire(topo, prefs, edge):
+    edge_list = set()
+    for v in topo.edge_verts[edge].tolist():
+        partial_list, infinite = partial_loop_edge_wire(topo, prefs, edge, v)
+        edge_list.update(partial_list)
+        if infinite:
+            break  # Early out so we don't get the same loop twice.
+    return sorted(edge_list)
+
+
+# Takes a non-manifold edge and returns an ordered list of the non-manifold edges chained to it.
+def full_loop_edge_nonmanifold(topo, prefs, edge):
+    if not prefs.ignore_hidden_geometry and topo.edge_hide[edge]:
+        return None
+    edge_list = []
+    for v in topo.edge_verts[edge].tolist():
+        partial_list, infinite = run_walk(walk_loop_nonmanifold(topo, prefs, edge, v))
+        edge_list = _join(edge_list, partial_list) if edge_list else partial_list
+        if infinite:
+            break  # Early out so we don't get the same loop twice.
+    return edge_list
+
+
+# Takes a non-manifold edge and returns a sorted list of the vertices along the non-manifold edges chained to it.
+def full_loop_vert_nonmanifold(topo, prefs, edge):
+    edge_list = full_loop_edge_nonmanifold(topo, prefs, edge)
+    if edge_list is None:
+        return None
+    verts = np.unique(topo.edge_verts[edge_list])
+    if not prefs.ignore_hidden_geometry:
+        verts = verts[~topo.vert_hide[verts]]
+    return verts.tolist()
+
+
+# Takes an ordered ring of edges and returns every edge loop crossing it, or the loops through every nth ring edge
+# counted from starting_edge, as one list of edges per loop. full_loop(edge) returns the full loop through an edge.
+# Edges already collected aren't walked again, so a loop crossing the ring more than once is only returned once.
+def loops_across_ring(ring, starting_edge, nth, full_loop):
+    start = ring.index(starting_edge)
+    covered = set()
+    loops = []
+    for pos, edge in enumerate(ring):
+        if (pos - start) % nth or edge in covered:
+            continue
+        loop = full_loop(edge) or [edge]  # An edge with no loop through it still marks its place on the ring.
+        covered.update(loop)
+        loops.append(loop)
+    return loops
+
+
+# ##################### Bounded Selections ##################### #
+
+# Advances every candidate walk one step at a time and stops as soon as the shortest walks reaching both ends
+# are known, instead of walking every direction to its dead end. Walks finishing in the same step tie and are all
+# returned unless single is set. Returns a list of loop lists.
+def shortest_walks(walks, ends, single=False):
+    connected_loops = []
+    while walks and not connected_loops:
+        profiling.count('walk steps', len(walks))
+        still_walking = []
+        for walk in walks:
+            try:
+                next(walk)
+            except StopIteration as finished:
+                partial_list, _infinite = finished.value
+                if ends[0] in partial_list and ends[1] in partial_list:
+                    connected_loops.append(partial_list)
+                    if single:
+                        break
+            else:
+                still_walking.append(walk)
+        walks = still_walking
+    for walk in walks:
+        walk.close()
+    return connected_loops
+
+
+# Takes 2 separated verts, and which vert to start with, and returns a list of loop lists of vertex indices.
+def bounded_loop_vert_manifold(topo, prefs, starting_vert, ends):
+    edges = [e for e in topo.vert_edges_of(starting_vert).tolist() if topo.edge_face_count[e] >= 2]
+    if len(edges) > 4:
+        return []
+    walks = [walk_loop_vert_manifold(topo, prefs, edge, starting_vert, set(), ends) for edge in edges
+             if prefs.ignore_hidden_geometry or not topo.edge_hide[edge]]
+    return shortest_walks(walks, ends, prefs.return_single_loop)
+
+
+# Takes 2 separated faces, and which face to start with, and returns a list of loop lists of face indices.
+def bounded_loop_face(topo, prefs, starting_face, ends):
+    walks = [walk_loop_face(topo, prefs, loop, starting_face, set(), ends)
+             for loop in topo.face_loops_of(starting_face)]
+    return shortest_walks(walks, ends, prefs.return_single_loop)
+
+
+# Takes 2 separated edges, and which edge to start with, and returns a list of loop lists of edge indices.
+def bounded_loop_edge_manifold(topo, prefs, starting_edge, ends):
+    walks = [walk_loop_edge_manifold(topo, prefs, starting_edge, topo.other_vert(starting_edge, v), set(), ends)
+             for v in topo.edge_verts[starting_edge].tolist() if topo.vert_loop_count[v] == 4]
+    return shortest_walks(walks, ends, prefs.return_single_loop)
+
+
+# Takes 2 separated edges, and which edge to start with, and returns a list of ring lists of edge indices.
+def bounded_ring_edge_manifold(topo, prefs, starting_edge, ends):
+    starting_loop = int(topo.edge_loops[topo.edge_loop_offsets[starting_edge]])
+    loops = [starting_loop, int(topo.loop_radial_next[starting_loop])]
+    walks = [walk_ring_edge(topo, prefs, loop, starting_edge, set(), ends) for loop in loops]
+    return shortest_walks(walks, ends, prefs.return_single_loop)
+
+
+# Runs partial(start, ...) in each direction and returns the walks that contain both ends, stopping at the first
+# walk that comes back around to its start since that means there is no bounded selection to get.
+def _bounded_walks(partial, directions, ends):
+    connected_loops = []
+    for direction in directions:
+        partial_list, infinite = partial(direction)
+        if infinite:
+            break
+        if ends[0] in partial_list and ends[1] in partial_list:
+            connected_loops.append(sorted(partial_list))
+    return connected_loops
+
+
+# Takes 2 separated boundary vertices, and which vertex to start with, and returns a list of loop lists of vertices.
+def bounded_loop_vert_boundary(topo, prefs, starting_vert, ends):
+    return _bounded_walks(lambda e: partial_loop_vert_boundary(topo, prefs, starting_vert, e, ends),
+                          _starting_edges(topo, prefs, starting_vert, 1), ends)
+
+
+# Takes a wire vertex and a start/end vert and returns a list of wire vertex lists if they are part of a stand-alone
+# loop, or None if the vertex doesn't have 1-2 wire edges.
+def bounded_loop_vert_wire(topo, prefs, starting_vert, ends):
+    edges = _starting_edges(topo, prefs, starting_vert, 0)
+    if len(edges) not in (1, 2):
+        return None
+    return _bounded_walks(lambda e: partial_loop_vert_wire(topo, prefs, starting_vert, e, ends), edges, ends)
+
+
+# Takes 2 separated boundary edges, and which edge to start with, and returns a list of loop lists of edges.
+def bounded_loop_edge_boundary(topo, prefs, starting_edge, ends):
+    return _bounded_walks(lambda v: partial_loop_edge_boundary(topo, prefs, starting_edge, v, ends),
+                          topo.edge_verts[starting_edge].tolist(), ends)
+
+
+# Takes a wire edge and a start/end edge and returns a list of wire edge lists if they are part of a stand-alone loop.
+def bounded_loop_edge_wire(topo, prefs, starting_edge, ends):
+    return _bounded_walks(lambda v: partial_loop_edge_wire(topo, prefs, starting_edge, v, ends),
+                          topo.edge_verts[starting_edge].tolist(), ends)
+
+
+# Takes 2 separated non-manifold verts, and which vert to start with, and returns a list of loop lists of vertices.
+def bounded_loop_vert_nonmanifold(topo, prefs, starting_vert, ends):
+    walks = [walk_loop_nonmanifold(topo, prefs, edge, starting_vert, ends, verts=True)
+             for edge in nonmanifold_edges(topo, starting_vert)
+             if prefs.ignore_hidden_geometry or not topo.edge_hide[edge]]
+    return shortest_walks(walks, ends, prefs.return_single_loop)
+
+
+# Takes 2 separated non-manifold edges, and which edge to start with, and returns a list of loop lists of edges.
+def bounded_loop_edge_nonmanifold(topo, prefs, starting_edge, ends):
+    walks = [walk_loop_nonmanifold(topo, prefs, starting_edge, v, ends)
+             for v in topo.edge_verts[starting_edge].tolist()]
+    return shortest_walks(walks, ends, prefs.return_single_loop)
+
+
+# ##################### Growing Partial Loops ##################### #
+
+class LoopGrowth:
+    """A partial loop grown and shrunk a step at a time from both of its ends.
+
+    Each end keeps the live walk generator that found it, so growing picks up the walk where it stopped instead of
+    walking again from the start, and shrinking only moves the end back over what has already been walked.
+    """
+
+    def __init__(self, start, walks):
+        self.start = start
+        self.walks = [walk for walk in walks if walk is not None]
+        self.walked = [[start] for _walk in self.walks]  # Everything each end's walk has found so far, in order.
+        self.lengths = [1 for _walk in self.walks]  # How much of each end's walk is in the loop.
+        self.members = {start}
+
+    # Grows both ends for as long as is_selected(component) holds, to take over a partial loop already selected.
+    def extend_while(self, is_selected):
+        for end in range(len(self.walks)):
+            component = self._next(end)
+            while component is not None and is_selected(component):
+                self._add(end, component)
+                component = self._next(end)
+
+    # Grows each end by up to steps components and returns the components added.
+    def grow(self, steps):
+        added = []
+        for _step in range(steps):
+            for end in range(len(self.walks)):
+                component = self._next(end)
+                if component is not None:
+                    self._add(end, component)
+                    added.append(component)
+        return added
+
+    # Shrinks each end by up to steps components, never past the start, and returns the components removed.
+    def shrink(self, steps):
+        removed = []
+        for _step in range(steps):
+            for end in range(len(self.walks)):
+                if self.lengths[end] > 1:
+                    self.lengths[end] -= 1
+                    component = self.walked[end][self.lengths[end]]
+                    self.members.discard(component)
+                    removed.append(component)
+        return removed
+
+    def _add(self, end, component):
+        self.lengths[end] += 1
+        self.members.add(component)
+
+    # Returns the component after an end, walking further only if it hasn't been walked yet, or None at a dead end.
+    def _next(self, end):
+        walked = self.walked[end]
+        while self.lengths[end] == len(walked) and self.walks[end] is not None:
+            try:
+                walked = self.walked[end] = next(self.walks[end])
+            except StopIteration as finished:
+                walked = self.walked[end] = finished.value[0]
+                self.walks[end] = None
+        if self.lengths[end] == len(walked):
+            return None
+        component = walked[self.lengths[end]]
+        if component in self.members:  # The ends met going round a closed loop.
+            return None
+        return component
+
+
+# Takes a manifold edge and returns a LoopGrowth of the edge loop through it.
+def edge_loop_growth(topo, prefs, edge):
+    reference_list = set()
+    return LoopGrowth(edge, [walk_loop_edge_manifold(topo, prefs, edge, vert, reference_list)
+                             for vert in topo.edge_verts[edge].tolist()])
+
+
+# Takes a vert and one of its edges and returns a LoopGrowth of the vertex loop running along the edge.
+def vert_loop_growth(topo, prefs, vert, edge):
+    reference_list = set()
+    back_edge = topo.opposite_edge(edge, vert)
+    return LoopGrowth(vert, [walk_loop_vert_manifold(topo, prefs, edge, vert, reference_list),
+                             walk_loop_vert_manifold(topo, prefs, back_edge, vert, reference_list)
+                             if back_edge >= 0 else None])
+
+
+# Takes a face and one of its loops and returns a LoopGrowth of the face loop running across the loop's edge.
+def face_loop_growth(topo, prefs, face, loop):
+    reference_list = set()
+    walks = [walk_loop_face(topo, prefs, loop, face, reference_list)]
+    start, total = int(topo.face_loop_start[face]), int(topo.face_loop_total[face])
+    back_loop = start + (loop - start + 2) % total
+    if total == 4 and topo.is_manifold_edge(topo.loop_edge[back_loop]):
+        walks.append(walk_loop_face(topo, prefs, back_loop, face, reference_list))
+    return LoopGrowth(face, walks)
@@ -0,0 +1,164 @@
+"""UV-space topology for Context Select: the mesh split apart along its UV seams."""
+import numpy as np
+
+from . import topology
+from . import islands
+
+UV_CONNECT_LIMIT = 1e-5  # Face corners of a vertex whose UVs are this close on both axes share a UV vertex.
+
+
+class UVIndex:
+    """A topology index of the mesh as it's laid out in one UV layer.
+
+    Face corners of the same vertex whose UVs are within UV_CONNECT_LIMIT of each other, directly or through other
+    corners, share a UV vertex, as they're connected in Blender's UV editor. UV seams and other UV discontinuities
+    become boundaries and every mesh walker works in UV space unchanged. Faces and face corners keep their mesh
+    indices; UV verts and UV edges map back to mesh verts and edges through uv_vert_mesh and uv_edge_mesh.
+    """
+
+    def __init__(self, topo, loop_uv):
+        self.topo = topo
+        self.loop_uv = np.asarray(loop_uv, dtype=np.float32).reshape(-1, 2)
+
+        corner = islands.components(topo.loop_count, *_welded_corners(topo.loop_vert, self.loop_uv))
+        _corners, first, self.loop_uv_vert = np.unique(corner, return_index=True, return_inverse=True)
+        self.loop_uv_vert = self.loop_uv_vert.ravel().astype(np.int32)
+        self.uv_vert_mesh = topo.loop_vert[first]
+
+        self.uv = topology.TopologyIndex.from_loops(len(first), self.loop_uv_vert, topo.face_loop_start,
+                                                     topo.face_loop_total)
+        self.uv_edge_mesh = np.empty(self.uv.edge_count, dtype=np.int32)
+        self.uv_edge_mesh[self.uv.loop_edge] = topo.loop_edge
+        self.update_hide()
+
+    # Caches UV indexes on the topology index they were built from, one per UV layer.
+    # read_uvs() returns the layer's UV per face corner and is only called to build a new index.
+    @classmethod
+    def for_index(cls, topo, layer_name, read_uvs):
+        uv_indices = getattr(topo, 'uv_indices', None)
+        if uv_indices is None:
+            uv_indices = topo.uv_indices = {}
+        if layer_name not in uv_indices:
+            uv_indices[layer_name] = cls(topo, read_uvs())
+        return uv_indices[layer_name]
+
+    # Copies the mesh's hidden flags onto the UV components.
+    def update_hide(self):
+        topo = self.topo
+        self.uv.update_hide(topo.vert_hide[self.uv_vert_mesh], topo.edge_hide[self.uv_edge_mesh], topo.face_hide)
+
+    # ##################### Picking ##################### #
+
+    # Returns the UV edge closest to a point in UV space, optionally only among the edges of some faces, and its
+    # squared distance. The edge is -1 if every face is hidden.
+    def nearest_edge(self, point, faces=None):
+        loops = self._visible_loops(faces)
+        if len(loops) == 0:
+            return -1, np.inf
+        point = np.asarray(point, dtype=np.float32)
+        start = self.loop_uv[loops]
+        end = self.loop_uv[self.uv.loop_next[loops]]
+        span = end - start
+        length = np.maximum((span * span).sum(axis=1), 1e-12)
+        t = np.clip(((point - start) * span).sum(axis=1) / length, 0.0, 1.0)
+        distance = ((start + span * t[:, None] - point) ** 2).sum(axis=1)
+        nearest = np.argmin(distance)
+        return int(self.uv.loop_edge[loops[nearest]]), float(distance[nearest])
+
+    # Returns the UV vert closest to a point in UV space and its squared distance, or -1 if every face is hidden.
+    def nearest_vert(self, point):
+        loops = self._visible_loops()
+        if len(loops) == 0:
+            return -1, np.inf
+        distance = ((self.loop_uv[loops] - np.asarray(point, dtype=np.float32)) ** 2).sum(axis=1)
+        nearest = np.argmin(distance)
+        return int(self.loop_uv_vert[loops[nearest]]), float(distance[nearest])
+
+    # Returns the face under a point in UV space, or the face of the nearest UV edge if there's none under it.
+    def face_at(self, point):
+        faces = np.flatnonzero(~self.topo.face_hide)
+        # Fan triangulate every face from its first corner and test the point against each triangle.
+        counts = self.topo.face_loop_total[faces] - 2
+        starts = self.topo.face_loop_start[faces]
+        tri_face = np.repeat(faces, counts)
+        first = np.repeat(starts, counts)
+        second = topology.ranges(starts + 1, counts)
+        a, b, c = self.loop_uv[first], self.loop_uv[second], self.loop_uv[second + 1]
+        inside = _same_side(a, b, c, point) & _same_side(b, c, a, point) & _same_side(c, a, b, point)
+        if inside.any():
+            return int(tri_face[np.argmax(inside)])
+        edge, _distance = self.nearest_edge(point)
+        return int(self.uv.loop_face[self.uv.edge_loops_of(edge)[0]]) if edge >= 0 else -1
+
+    def _visible_loops(self, faces=None):
+        if faces is not None:
+            return self.topo.loops_of_faces(np.asarray(faces, dtype=np.int64))[0]
+        return np.flatnonzero(~self.topo.face_hide[self.uv.loop_face])
+
+    # ##################### Selections ##################### #
+
+    # Takes a UV edge and returns its UV edge loop (following UV boundaries along seams), or its ring.
+    def edge_loop(self, prefs, uv_edge, ring=False):
+        uv = self.uv
+        if ring:
+            return topology.full_ring_edge_manifold(uv, prefs, uv_edge) if uv.edge_face_count[uv_edge] else []
+        if uv.edge_face_count[uv_edge] == 2:
+            return topology.full_loop_edge_manifold(uv, prefs, uv_edge)
+        if uv.edge_face_count[uv_edge] == 1:
+            return topology.full_loop_edge_boundary(uv, prefs, uv_edge)
+        return []
+
+    # Takes a UV edge and one of its faces and returns the face loop crossing it, stopping at UV seams.
+    def face_loop(self, prefs, uv_edge, face):
+        if self.uv.edge_face_count[uv_edge] != 2:
+            return [face]
+        return topology.full_loop_face(self.uv, prefs, uv_edge, face)
+
+    # Takes faces and returns every face on the same UV islands.
+    def island_faces(self, faces):
+        island = islands.IslandIndex.for_index(self.uv)
+        uv_verts = island.linked(self.loop_uv_vert[self.topo.face_loop_start[faces]])
+        in_island = np.zeros(self.uv.vert_count, dtype=bool)
+        in_island[uv_verts] = True
+        return np.flatnonzero(in_island[self.loop_uv_vert[self.topo.face_loop_start]] & ~self.topo.face_hide)
+
+    # Takes UV verts and returns the face corners using them.
+    def loops_of_uv_verts(self, uv_verts):
+        return _with_labels(self.loop_uv_vert, self.uv.vert_count, uv_verts)
+
+    # Takes UV edges and returns the face corners whose edge (to the next corner) they are.
+    def loops_of_uv_edges(self, uv_edges):
+        return topology.csr_gather(self.uv.edge_loop_offsets, self.uv.edge_loops, uv_edges)
+
+
+# Returns pairs of face corners of the same vertex whose UVs are within UV_CONNECT_LIMIT on both axes. With every
+# vertex's corners sorted by UV, each corner only has to be compared with the ones after it until U is out of reach.
+def _welded_corners(loop_vert, loop_uv):
+    order = np.lexsort((loop_uv[:, 1], loop_uv[:, 0], loop_vert))
+    vert, uv = loop_vert[order], loop_uv[order]
+    firsts, seconds = [], []
+    for step in range(1, len(order)):
+        reach = (vert[step:] == vert[:-step]) & (uv[step:, 0] - uv[:-step, 0] <= UV_CONNECT_LIMIT)
+        if not reach.any():
+            break
+        pairs = np.flatnonzero(reach & (np.abs(uv[step:, 1] - uv[:-step, 1]) <= UV_CONNECT_LIMIT))
+        firsts.append(order[pairs])
+        seconds.append(order[pairs + step])
+    if not firsts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+# Takes a label per item and returns the items with any of the given labels.
+def _with_labels(labels, label_count, wanted):
+    mask = np.zeros(label_count, dtype=bool)
+    mask[np.asarray(wanted, dtype=np.int64)] = True
+    return np.flatnonzero(mask[labels])
+
+
+# Whether point lies on the same side of each line a-b as the triangle's third corner c.
+def _same_side(a, b, c, point):
+    edge = b - a
+    cross_point = edge[:, 0] * (point[1] - a[:, 1]) - edge[:, 1] * (point[0] - a[:, 0])
+    cross_corner = edge[:, 0] * (c[:, 1] - a[:, 1]) - edge[:, 1] * (c[:, 0] - a[:, 0])
+    return cross_point * cross_corner >= 0
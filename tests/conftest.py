@@ -0,0 +1,15 @@
+"""Loads Context Select's Blender-free modules as a package of their own, so they can be tested in plain CPython.
+
+The add-on's __init__ registers Blender operators and needs bpy, so the package is set up without running it. The
+engine modules (topology, edge_labels, parallel_labels, selection_history, api, ...) only import each other.
+"""
+import os
+import sys
+import types
+
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'context_select')
+
+if 'context_select' not in sys.modules:
+    package = types.ModuleType('context_select')
+    package.__path__ = [PACKAGE_DIR]
+    sys.modules['context_select'] = package
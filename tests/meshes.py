@@ -0,0 +1,60 @@
+"""Small generated meshes for the tests, as topology indexes built with TopologyIndex.from_pydata."""
+from context_select import topology
+
+
+# A flat grid of rows x cols quads. Vert (r, c) is r * (cols + 1) + c.
+def grid(rows, cols):
+    width = cols + 1
+    faces = [(r * width + c, r * width + c + 1, (r + 1) * width + c + 1, (r + 1) * width + c)
+             for r in range(rows) for c in range(cols)]
+    return topology.TopologyIndex.from_pydata((rows + 1) * width, [], faces)
+
+
+# A torus of rows x cols quads, where every loop and ring is cyclic. Vert (r, c) is r * cols + c.
+def torus(rows, cols):
+    faces = [(r * cols + c, r * cols + (c + 1) % cols,
+              (r + 1) % rows * cols + (c + 1) % cols, (r + 1) % rows * cols + c)
+             for r in range(rows) for c in range(cols)]
+    return topology.TopologyIndex.from_pydata(rows * cols, [], faces)
+
+
+# A cylinder of rows x segments quads capped by triangle fans around two poles, the last two verts.
+def capped_cylinder(rows, segments):
+    vert_count = (rows + 1) * segments
+    faces = [(r * segments + c, r * segments + (c + 1) % segments,
+              (r + 1) * segments + (c + 1) % segments, (r + 1) * segments + c)
+             for r in range(rows) for c in range(segments)]
+    bottom, top = vert_count, vert_count + 1
+    faces += [(bottom, (c + 1) % segments, c) for c in range(segments)]
+    faces += [(top, rows * segments + c, rows * segments + (c + 1) % segments) for c in range(segments)]
+    return topology.TopologyIndex.from_pydata(vert_count + 2, [], faces)
+
+
+# A grid of rows x cols quads with a row of fins standing on the verts of row fin_row, so the edges along that row
+# have three faces each. The fin's top verts come after the grid's.
+def finned_grid(rows, cols, fin_row):
+    width = cols + 1
+    faces = [(r * width + c, r * width + c + 1, (r + 1) * width + c + 1, (r + 1) * width + c)
+             for r in range(rows) for c in range(cols)]
+    top = (rows + 1) * width
+    faces += [(fin_row * width + c, fin_row * width + c + 1, top + c + 1, top + c) for c in range(cols)]
+    return topology.TopologyIndex.from_pydata(top + width, [], faces)
+
+
+# Four triangles around vert 0 with four edges, three of them on the non-manifold edge 0-1. Stepping through vert 0
+# from edge 0-1 reaches 0-3 from the first triangle, 0-2 from the second and nothing from the third.
+def nonmanifold_fan():
+    return topology.TopologyIndex.from_pydata(5, [], [(0, 1, 2), (1, 0, 3), (0, 1, 4), (0, 2, 3)])
+
+
+# A circle of count verts joined by wire edges, with no faces.
+def wire_circle(count):
+    return topology.TopologyIndex.from_pydata(count, [(v, (v + 1) % count) for v in range(count)], [])
+
+
+# Returns the edge between two verts.
+def edge_between(topo, v0, v1):
+    for edge in topo.vert_edges_of(v0).tolist():
+        if topo.other_vert(edge, v0) == v1:
+            return edge
+    raise KeyError((v0, v1))
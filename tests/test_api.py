@@ -0,0 +1,154 @@
+"""The scripting API and the whole-mesh loop report."""
+import numpy as np
+import pytest
+
+from context_select import api
+from context_select import topology
+
+import meshes
+
+ROWS, COLS = 4, 6
+WIDTH = COLS + 1
+
+
+def vert(r, c):
+    return r * WIDTH + c
+
+
+@pytest.fixture
+def grid():
+    return meshes.grid(ROWS, COLS)
+
+
+def edge_verts(topo, edges):
+    return set(topo.edge_verts[edges].ravel().tolist())
+
+
+def test_index_mesh_takes_an_index_and_nothing_else(grid):
+    assert api.index_mesh(grid) is grid
+    with pytest.raises(TypeError):
+        api.index_mesh([0, 1, 2])
+
+
+def test_edge_loop_and_ring(grid):
+    edge = meshes.edge_between(grid, vert(1, 2), vert(1, 3))
+    assert edge_verts(grid, api.edge_loop(grid, edge)) == {vert(1, c) for c in range(WIDTH)}
+    ring = api.edge_ring(grid, edge)
+    assert len(ring) == ROWS + 1
+    assert edge in ring.tolist()
+
+
+def test_boundary_edge_loop_runs_around_the_grid(grid):
+    edge = meshes.edge_between(grid, vert(0, 2), vert(0, 3))
+    assert len(api.edge_loop(grid, edge)) == 2 * (ROWS + COLS)
+
+
+def test_wire_edges_loop_and_have_no_ring():
+    topo = meshes.wire_circle(9)
+    assert len(api.edge_loop(topo, 4)) == 9
+    assert len(api.edge_ring(topo, 4)) == 0
+
+
+def test_vert_loop(grid):
+    edge = meshes.edge_between(grid, vert(2, 3), vert(2, 4))
+    assert sorted(api.vert_loop(grid, vert(2, 3), edge).tolist()) == [vert(2, c) for c in range(WIDTH)]
+    with pytest.raises(ValueError):
+        api.vert_loop(grid, vert(0, 0), edge)
+
+
+def test_face_loop(grid):
+    edge = meshes.edge_between(grid, vert(1, 2), vert(2, 2))
+    assert sorted(api.face_loop(grid, COLS + 2, edge).tolist()) == list(range(COLS, 2 * COLS))
+    with pytest.raises(ValueError):
+        api.face_loop(grid, 0, edge)
+
+
+def test_out_of_range_components_raise(grid):
+    with pytest.raises(IndexError):
+        api.edge_loop(grid, grid.edge_count)
+    with pytest.raises(IndexError):
+        api.face_loop(grid, -1, 0)
+
+
+def test_loops_across_ring_every_other_edge(grid):
+    edge = meshes.edge_between(grid, vert(1, 1), vert(2, 1))
+    columns = [sorted({v % WIDTH for v in edge_verts(grid, loop)}) for loop in api.loops_across_ring(grid, edge, nth=2)]
+    assert sorted(columns) == [[1], [3], [5]]
+
+
+def test_all_edge_loops_and_rings_cover_the_torus():
+    topo = meshes.torus(5, 7)
+    loops, cyclic = api.all_edge_loops(topo)
+    assert sorted(map(len, loops)) == [5] * 7 + [7] * 5
+    assert cyclic.all()
+    np.testing.assert_array_equal(np.sort(np.concatenate(loops)), np.arange(topo.edge_count))
+    rings, cyclic = api.all_edge_rings(topo)
+    assert sorted(map(len, rings)) == [5] * 7 + [7] * 5
+    assert cyclic.all()
+
+
+def test_bounded_selections(grid):
+    start = meshes.edge_between(grid, vert(1, 1), vert(1, 2))
+    end = meshes.edge_between(grid, vert(1, 5), vert(1, 6))
+    loops = api.bounded_edge_loops(grid, start, end)
+    assert len(loops) == 1
+    assert edge_verts(grid, loops[0]) == {vert(1, c) for c in range(1, WIDTH)}
+
+    assert [loop.tolist() for loop in api.bounded_vert_loops(grid, vert(1, 1), vert(1, 5))] == \
+        [[vert(1, c) for c in range(1, 6)]]
+    assert [loop.tolist() for loop in api.bounded_face_loops(grid, 0, 4)] == [[0, 1, 2, 3, 4]]
+    with pytest.raises(ValueError):
+        api.bounded_face_loops(grid, 3, 3)
+
+
+def test_bounded_ring_between_parallel_edges(grid):
+    start = meshes.edge_between(grid, vert(1, 2), vert(2, 2))
+    end = meshes.edge_between(grid, vert(1, 5), vert(2, 5))
+    loops = api.bounded_edge_loops(grid, start, end)
+    assert len(loops) == 1
+    assert edge_verts(grid, loops[0]) == {vert(r, c) for r in (1, 2) for c in range(2, 6)}
+
+
+def test_loop_report_on_a_torus():
+    report = api.loop_report(meshes.torus(5, 7))
+    assert report['face_types'] == {'triangles': 0, 'quads': 35, 'ngons': 0}
+    assert report['poles'] == {}
+    assert report['edge_loops'] == {'count': 12, 'cyclic': 12, 'lengths': {5: 7, 7: 5}, 'self_intersecting': []}
+    assert report['face_loops'] == {'count': 12, 'cyclic': 12, 'lengths': {5: 7, 7: 5}, 'self_intersecting': []}
+
+
+def test_loop_report_on_a_grid(grid):
+    report = api.loop_report(grid)
+    assert (report['verts'], report['edges'], report['faces']) == (35, 58, 24)
+    assert report['edge_loops']['count'] == 8
+    assert report['edge_loops']['cyclic'] == 0
+    assert report['face_loops']['lengths'] == {ROWS: COLS, COLS: ROWS}
+
+
+def test_loop_report_counts_poles_and_triangles():
+    report = api.loop_report(meshes.capped_cylinder(3, 8))
+    assert report['face_types'] == {'triangles': 16, 'quads': 24, 'ngons': 0}
+    assert report['poles'] == {8: 2}
+    assert report['edge_loops']['lengths'] == {5: 8, 8: 4}
+    assert report['face_loops']['lengths'] == {3: 8, 8: 3}
+    assert report['face_loops']['cyclic'] == 3
+
+
+def test_wire_only_meshes_have_no_loops_or_rings():
+    topo = meshes.wire_circle(9)
+    assert api.all_edge_loops(topo)[0] == []
+    assert api.all_edge_rings(topo)[0] == []
+    report = api.loop_report(topo)
+    assert report['edge_loops']['count'] == report['face_loops']['count'] == 0
+
+
+def test_loops_across_ring_returns_each_loop_once():
+    # Edges 0 and 2 are on one loop, which crosses the ring twice.
+    loops = topology.loops_across_ring([0, 1, 2, 3], 1, 1, lambda edge: [0, 2] if edge in (0, 2) else [edge])
+    assert loops == [[0, 2], [1], [3]]
+
+
+def test_loops_across_ring_on_a_torus():
+    topo = meshes.torus(5, 7)
+    loops = api.loops_across_ring(topo, meshes.edge_between(topo, 0, 1))
+    assert sorted(map(len, loops)) == [7] * 5
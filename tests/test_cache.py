@@ -0,0 +1,39 @@
+"""The LRU cache of walk results."""
+from context_select import api
+from context_select import cache
+
+
+def test_fetch_computes_once_then_hits():
+    results = cache.ResultCache()
+    calls = []
+    for _ in range(3):
+        assert list(results.fetch('key', lambda: calls.append(1) or [1, 2, 3])) == [1, 2, 3]
+    assert len(calls) == 1
+    assert results.stats()['hits'] == 2 and results.stats()['misses'] == 1
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    results = cache.ResultCache(max_components=8)
+    results.put('a', [0, 1, 2])
+    results.put('b', [0, 1, 2])
+    results.fetch('a', list)
+    results.put('c', [0, 1, 2])
+    assert set(results.entries) == {'a', 'c'}
+    assert results.size == 8 and results.evictions == 1
+
+
+def test_results_bigger_than_the_cache_are_not_stored():
+    results = cache.ResultCache(max_components=4)
+    results.put('a', [0])
+    results.put('b', list(range(10)))
+    assert set(results.entries) == {'a'}
+
+
+def test_walk_keys_only_depend_on_the_walk_preferences():
+    options = api.Options()
+    key = cache.walk_key('EDGE_RING', 'mesh', 1, (5,), options)
+    options.allow_non_quads_at_ends = not options.allow_non_quads_at_ends
+    assert cache.walk_key('EDGE_RING', 'mesh', 1, (5,), options) == key
+    face_key = cache.walk_key('FACE_LOOP', 'mesh', 1, (5,), api.Options())
+    assert cache.walk_key('FACE_LOOP', 'mesh', 1, (5,), options) != face_key
+    assert cache.walk_key('EDGE_RING', 'mesh', 2, (5,), options) != key
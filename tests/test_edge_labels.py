@@ -0,0 +1,75 @@
+"""Whole-mesh loop and ring labels against the walkers they stand in for."""
+import numpy as np
+import pytest
+
+from context_select import api
+from context_select import edge_labels
+from context_select import topology
+
+import meshes
+
+MESHES = {
+    'grid': lambda: meshes.grid(4, 6),
+    'torus': lambda: meshes.torus(5, 7),
+    'poles': lambda: meshes.capped_cylinder(3, 8),
+    'fin': lambda: meshes.finned_grid(4, 5, 2),
+    'tall fin': lambda: meshes.finned_grid(6, 7, 3),
+}
+
+
+@pytest.mark.parametrize('name', sorted(MESHES))
+def test_loops_match_the_walker(name):
+    topo = MESHES[name]()
+    labels = edge_labels.EdgeLabels(topo)
+    for edge in np.flatnonzero(topo.edge_face_count == 2).tolist():
+        walked = topology.full_loop_edge_manifold(topo, api.Options(), edge) or [edge]
+        assert sorted(labels.loop_edges(edge).tolist()) == sorted(walked), edge
+
+
+@pytest.mark.parametrize('name', sorted(MESHES))
+def test_rings_match_the_walker(name):
+    topo = MESHES[name]()
+    labels = edge_labels.EdgeLabels(topo)
+    for edge in np.flatnonzero((topo.edge_face_count == 1) | (topo.edge_face_count == 2)).tolist():
+        walked = topology.full_ring_edge_manifold(topo, api.Options(), edge) or [edge]
+        assert sorted(labels.ring_edges(edge).tolist()) == sorted(walked), edge
+
+
+@pytest.mark.parametrize('chain_walker, kind', [(edge_labels._loop_chain, 'LOOP'), (edge_labels._ring_chain, 'RING')])
+@pytest.mark.parametrize('name', sorted(MESHES))
+def test_labels_are_the_walkers_labels(name, chain_walker, kind):
+    topo = MESHES[name]()
+    mask = topo.edge_face_count == 2 if kind == 'LOOP' else (topo.edge_face_count == 1) | (topo.edge_face_count == 2)
+    chain_id, chain_pos, chains = edge_labels._label(topo, mask, chain_walker, kind)
+    walked_id, walked_pos, walked_chains = edge_labels._label_chains(topo, mask, chain_walker)
+    np.testing.assert_array_equal(chain_id, walked_id)
+    np.testing.assert_array_equal(chain_pos, walked_pos)
+    for array, walked_array in zip(chains, walked_chains):
+        np.testing.assert_array_equal(array, walked_array)
+
+
+def test_every_edge_is_on_one_chain():
+    topo = meshes.torus(5, 7)
+    labels = edge_labels.EdgeLabels(topo)
+    assert sorted(labels.loop_members.tolist()) == list(range(topo.edge_count))
+    assert labels.loop_count == 5 + 7
+    assert labels.loop_cyclic.all()
+    assert not labels.loop_self_intersects.any()
+
+
+def test_hidden_flags_follow_update_hide():
+    topo = meshes.grid(4, 6)
+    labels = edge_labels.EdgeLabels.for_index(topo)
+    assert not labels.loop_hidden.any()
+    edge = meshes.edge_between(topo, 9, 16)
+    edge_hide = np.zeros(topo.edge_count, dtype=bool)
+    edge_hide[edge] = True
+    topo.update_hide(None, edge_hide, None)
+    assert labels.loop_hidden[labels.loop_id[edge]] and labels.ring_hidden[labels.ring_id[edge]]
+    assert np.count_nonzero(labels.loop_hidden) == 1
+
+
+def test_wire_only_meshes_have_no_loops_or_rings():
+    labels = edge_labels.EdgeLabels(meshes.wire_circle(9))
+    assert (labels.loop_count, labels.ring_count) == (0, 0)
+    assert len(labels.loop_edges(0)) == 0
@@ -0,0 +1,51 @@
+"""Island labels for select linked."""
+import numpy as np
+
+from context_select import islands
+from context_select import topology
+
+import meshes
+
+
+# Two separate quads, verts 0-3 and 4-7.
+def two_quads():
+    return topology.TopologyIndex.from_pydata(8, [], [(0, 1, 2, 3), (4, 5, 6, 7)])
+
+
+def test_components_label_each_node_with_the_lowest_in_it():
+    label = islands.components(7, [5, 1, 3, 6], [2, 2, 5, 3])
+    assert label.tolist() == [0, 1, 1, 1, 4, 1, 1]
+
+
+def test_linked_verts_stay_on_their_island():
+    island = islands.IslandIndex(two_quads())
+    assert sorted(island.linked([2])) == [0, 1, 2, 3]
+    assert sorted(island.linked([0, 6])) == list(range(8))
+
+
+def test_hidden_edges_split_islands():
+    topo = meshes.grid(1, 2)
+    edge_hide = np.zeros(topo.edge_count, dtype=bool)
+    edge_hide[topo.vert_edges_of(1)] = True
+    edge_hide[topo.vert_edges_of(4)] = True
+    topo.update_hide(None, edge_hide, None)
+    assert sorted(islands.IslandIndex(topo).linked([0])) == [0, 3]
+
+
+def test_delimiting_edges_split_face_islands():
+    topo = meshes.grid(2, 4)
+    delimit = np.zeros(topo.edge_count, dtype=bool)
+    delimit[[meshes.edge_between(topo, 2 + 5 * r, 2 + 5 * (r + 1)) for r in range(2)]] = True
+    island = islands.IslandIndex(topo, delimit)
+    assert sorted(island.linked([0])) == [0, 1, 4, 5]
+    assert sorted(island.linked([7])) == [2, 3, 6, 7]
+
+
+def test_island_indexes_are_cached_per_delimiter():
+    topo = two_quads()
+    built = []
+    no_seams = np.zeros(topo.edge_count, dtype=bool)
+    seam = islands.IslandIndex.for_index(topo, ('SEAM',), lambda: built.append(1) or no_seams)
+    assert islands.IslandIndex.for_index(topo, ('SEAM',), lambda: built.append(1)) is seam
+    assert islands.IslandIndex.for_index(topo) is not seam
+    assert built == [1]
@@ -0,0 +1,52 @@
+"""Link table labeling, in one process and split across several, against the chain walkers."""
+import numpy as np
+import pytest
+
+from context_select import edge_labels
+from context_select import parallel_labels
+
+import meshes
+
+MESHES = {
+    'grid': lambda: meshes.grid(7, 9),
+    'torus': lambda: meshes.torus(8, 11),
+    'poles': lambda: meshes.capped_cylinder(5, 12),
+}
+KINDS = {
+    parallel_labels.LOOP: (lambda topo: topo.edge_face_count == 2, edge_labels._loop_chain),
+    parallel_labels.RING: (lambda topo: (topo.edge_face_count == 1) | (topo.edge_face_count == 2),
+                           edge_labels._ring_chain),
+}
+PROCESS_COUNTS = [1, 3] if parallel_labels.can_start_workers() else [1]
+
+
+@pytest.mark.parametrize('process_count', PROCESS_COUNTS)
+@pytest.mark.parametrize('kind', sorted(KINDS))
+@pytest.mark.parametrize('name', sorted(MESHES))
+def test_link_table_labels_match_the_walkers(name, kind, process_count):
+    topo = MESHES[name]()
+    mask_of, chain_walker = KINDS[kind]
+    serial_id, serial_pos, serial_chains = edge_labels._label_chains(topo, mask_of(topo), chain_walker)
+    chain_id, chain_pos, chains, walk = parallel_labels.label_chains(topo, mask_of(topo), kind, process_count)
+    assert not walk.any()
+    np.testing.assert_array_equal(chain_id, serial_id)
+    np.testing.assert_array_equal(chain_pos, serial_pos)
+    for array, serial_array in zip(chains, serial_chains):
+        np.testing.assert_array_equal(array, serial_array)
+
+
+def test_only_chains_through_unanswered_links_are_left_to_the_walkers():
+    topo = meshes.finned_grid(4, 5, 2)  # The fin's edges end rings from one side only.
+    mask_of, _chain_walker = KINDS[parallel_labels.RING]
+    chain_id, _chain_pos, _chains, walk = parallel_labels.label_chains(topo, mask_of(topo), parallel_labels.RING)
+    assert walk.any() and not walk.all()
+    assert (chain_id[walk] == -1).all()
+    assert (chain_id[mask_of(topo) & ~walk] >= 0).all()
+
+
+@pytest.mark.parametrize('kind', sorted(KINDS))
+def test_meshes_without_faces_have_no_chains(kind):
+    topo = meshes.wire_circle(9)
+    mask_of, _chain_walker = KINDS[kind]
+    chain_id, _chain_pos, _chains, _walk = parallel_labels.label_chains(topo, mask_of(topo), kind)
+    assert (chain_id == -1).all()
@@ -0,0 +1,57 @@
+"""Per-phase timing of selections."""
+import json
+
+import pytest
+
+from context_select import profiling
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    profiler = profiling.Profiler(size=2)
+    profiler.enabled = True
+    monkeypatch.setattr(profiling, 'profiler', profiler)
+    return profiler
+
+
+@profiling.phase('inner')
+def inner():
+    profiling.count('steps', 3)
+
+
+@profiling.phase('outer')
+def outer():
+    inner()
+    inner()
+
+
+@profiling.entry_point
+def select():
+    outer()
+
+
+def test_phases_add_up_to_the_total(profiler):
+    with profiler.record():
+        select()
+    record = profiler.last()
+    assert record.name == 'select'
+    assert set(record.phases) == {profiling.OTHER, 'outer', 'inner'}
+    assert sum(record.phases.values()) == pytest.approx(record.total)
+    assert record.counts == {'steps': 6}
+
+
+def test_nothing_is_recorded_while_disabled(profiler):
+    profiler.enabled = False
+    with profiler.record() as record:
+        select()
+    assert record is None and profiler.last() is None
+
+
+def test_only_the_last_records_are_kept(profiler, tmp_path):
+    for _ in range(3):
+        with profiler.record():
+            select()
+    path = str(tmp_path / 'records.json')
+    assert profiler.dump(path) == [path]
+    with open(path) as file:
+        assert len(json.load(file)) == 2
@@ -0,0 +1,73 @@
+"""Recording and stepping through a mesh's selection history."""
+import numpy as np
+
+from context_select.selection_history import SelectionHistory
+
+COUNTS = (6, 8, 3)
+
+
+def selection(verts=(), edges=(), faces=()):
+    selected = [np.zeros(count, dtype=bool) for count in COUNTS]
+    for flags, indices in zip(selected, (verts, edges, faces)):
+        flags[list(indices)] = True
+    return selected
+
+
+def assert_selection(history, expected):
+    for selected, wanted in zip(history.selection(), expected):
+        np.testing.assert_array_equal(selected, wanted)
+
+
+def test_record_only_keeps_changes():
+    history = SelectionHistory(0, COUNTS, selection(), 10)
+    assert not history.record(selection())
+    assert history.record(selection(verts=[1, 2], edges=[3]))
+    assert not history.record(selection(verts=[1, 2], edges=[3]))
+    assert len(history) == 2
+    assert [selected.tolist() for selected in history.selected()] == [[1, 2], [3], []]
+
+
+def test_step_back_and_forward():
+    states = [selection(), selection(verts=[0]), selection(verts=[0, 5], faces=[2]), selection(edges=[7])]
+    history = SelectionHistory(0, COUNTS, states[0], 10)
+    for state in states[1:]:
+        history.record(state)
+
+    changes = history.step(-2)
+    assert_selection(history, states[1])
+    assert [(deselect.tolist(), select.tolist()) for deselect, select in changes] == [([], [0]), ([7], []), ([], [])]
+    history.step(1)
+    assert_selection(history, states[2])
+    history.step(1)
+    assert_selection(history, states[3])
+
+
+def test_step_out_of_range_leaves_the_state_alone():
+    history = SelectionHistory(0, COUNTS, selection(), 10)
+    history.record(selection(faces=[0]))
+    assert history.step(1) is None
+    assert history.step(-2) is None
+    assert history.step(0) is None
+    assert_selection(history, selection(faces=[0]))
+
+
+def test_recording_after_stepping_back_drops_the_states_ahead():
+    history = SelectionHistory(0, COUNTS, selection(), 10)
+    history.record(selection(verts=[1]))
+    history.record(selection(verts=[2]))
+    history.step(-1)
+    history.record(selection(verts=[3]))
+    assert len(history) == 3
+    assert history.step(1) is None
+    history.step(-1)
+    assert_selection(history, selection(verts=[1]))
+
+
+def test_limit_drops_the_oldest_states():
+    history = SelectionHistory(0, COUNTS, selection(), 2)
+    for edge in range(5):
+        history.record(selection(edges=[edge]))
+    assert len(history) == 3
+    history.step(-2)
+    assert_selection(history, selection(edges=[2]))
+    assert history.step(-1) is None
@@ -0,0 +1,59 @@
+"""Saving topology indexes next to the .blend and loading them back."""
+import numpy as np
+import pytest
+
+from context_select import edge_labels
+from context_select import sidecar
+from context_select import topology
+
+import meshes
+
+
+@pytest.fixture
+def small_min_faces(monkeypatch):
+    monkeypatch.setattr(sidecar, 'MIN_FACES', 10)
+
+
+def mesh_topology(topo):
+    return (topo.vert_count, *(getattr(topo, name) for name in topology.BASE_ARRAYS))
+
+
+def hide(topo):
+    return topo.vert_hide.copy(), topo.edge_hide.copy(), topo.face_hide.copy()
+
+
+def test_nothing_is_hashed_without_a_directory(small_min_faces, monkeypatch):
+    monkeypatch.setattr(topology, 'topology_hash', pytest.fail)
+    topo = meshes.torus(6, 8)
+    assert sidecar.load_or_build(None, mesh_topology(topo), hide(topo)).topology_hash is None
+
+
+def test_small_meshes_are_not_hashed(tmp_path, monkeypatch):
+    monkeypatch.setattr(topology, 'topology_hash', pytest.fail)
+    topo = meshes.torus(6, 8)
+    index = sidecar.load_or_build(str(tmp_path), mesh_topology(topo), hide(topo))
+    assert index.topology_hash is None
+    assert not sidecar.save(str(tmp_path), index, 'Torus')
+
+
+def test_saved_index_loads_back(small_min_faces, tmp_path):
+    topo = meshes.torus(6, 8)
+    built = sidecar.load_or_build(None, mesh_topology(topo), hide(topo))
+    edge_labels.EdgeLabels.for_index(built)
+    assert sidecar.save(str(tmp_path), built, 'Torus')
+    assert built.topology_hash is not None
+
+    loaded = sidecar.load_or_build(str(tmp_path), mesh_topology(topo), hide(topo))
+    assert loaded.topology_hash == built.topology_hash
+    assert loaded.saved_labels
+    for name in topology.DERIVED_ARRAYS:
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(built, name))
+    assert not sidecar.save(str(tmp_path), loaded, 'Torus')
+
+
+def test_prune_deletes_indexes_no_mesh_uses(small_min_faces, tmp_path):
+    topo = meshes.torus(6, 8)
+    index = sidecar.load_or_build(None, mesh_topology(topo), hide(topo))
+    sidecar.save(str(tmp_path), index, 'Torus')
+    sidecar.prune(str(tmp_path), {'Cube'})
+    assert not (tmp_path / index.topology_hash).exists()
@@ -0,0 +1,65 @@
+"""UV indexes: welding face corners into UV verts and walking in UV space."""
+import numpy as np
+
+from context_select import api
+from context_select import uv
+
+import meshes
+
+ROWS, COLS = 4, 6
+WIDTH = COLS + 1
+
+
+def vert(r, c):
+    return r * WIDTH + c
+
+
+# The grid laid out flat in UV space, one UV per face corner.
+def grid_uvs(topo):
+    loop_vert = topo.loop_vert
+    return np.stack([loop_vert % WIDTH / COLS, loop_vert // WIDTH / ROWS], axis=1).astype(np.float32)
+
+
+def uv_edge_between(uv_index, v0, v1):
+    topo = uv_index.topo
+    loops = np.flatnonzero((topo.loop_vert == v0) & (topo.loop_vert[topo.loop_next] == v1))
+    return int(uv_index.uv.loop_edge[loops[0]])
+
+
+def test_corners_with_equal_uvs_share_a_uv_vert():
+    topo = meshes.grid(ROWS, COLS)
+    uv_index = uv.UVIndex(topo, grid_uvs(topo))
+    assert uv_index.uv.vert_count == topo.vert_count
+    assert np.array_equal(uv_index.uv_vert_mesh[uv_index.loop_uv_vert], topo.loop_vert)
+
+
+def test_corners_within_the_limit_are_welded():
+    topo = meshes.grid(ROWS, COLS)
+    loop_uv = grid_uvs(topo)
+    loop_uv[::3] += 2e-6
+    uv_index = uv.UVIndex(topo, loop_uv)
+    assert uv_index.uv.vert_count == topo.vert_count
+
+    edge = uv_edge_between(uv_index, vert(1, 2), vert(2, 2))
+    loop = uv_index.edge_loop(api.Options(), edge)
+    assert len(loop) == ROWS
+
+
+def test_corners_past_the_limit_split_into_a_seam():
+    topo = meshes.grid(ROWS, COLS)
+    loop_uv = grid_uvs(topo)
+    right = topo.loop_face % COLS >= 3
+    loop_uv[right, 0] += 0.01
+    uv_index = uv.UVIndex(topo, loop_uv)
+    assert uv_index.uv.vert_count == topo.vert_count + ROWS + 1
+
+    edge = uv_edge_between(uv_index, vert(2, 1), vert(2, 2))
+    loop = uv_index.edge_loop(api.Options(), edge)
+    assert sorted(uv_index.uv_edge_mesh[loop].tolist()) == sorted(
+        meshes.edge_between(topo, vert(2, c), vert(2, c + 1)) for c in range(3))
+
+
+def test_matching_uvs_of_different_verts_stay_apart():
+    topo = meshes.grid(ROWS, COLS)
+    uv_index = uv.UVIndex(topo, np.zeros((topo.loop_count, 2), dtype=np.float32))
+    assert uv_index.uv.vert_count == topo.vert_count
@@ -0,0 +1,177 @@
+"""The index walkers on small generated meshes."""
+import numpy as np
+
+from context_select import api
+from context_select import topology
+
+import meshes
+
+ROWS, COLS = 4, 6
+WIDTH = COLS + 1
+
+
+def vert(r, c):
+    return r * WIDTH + c
+
+
+def verts_of(topo, edges):
+    return set(topo.edge_verts[list(edges)].ravel().tolist())
+
+
+def test_grid_edge_loop_runs_across_the_grid():
+    topo = meshes.grid(ROWS, COLS)
+    edge = meshes.edge_between(topo, vert(1, 2), vert(2, 2))
+    loop = topology.full_loop_edge_manifold(topo, api.Options(), edge)
+    assert verts_of(topo, loop) == {vert(r, 2) for r in range(ROWS + 1)}
+
+
+def test_grid_edge_ring_crosses_every_column():
+    topo = meshes.grid(ROWS, COLS)
+    edge = meshes.edge_between(topo, vert(1, 2), vert(2, 2))
+    ring = topology.full_ring_edge_manifold(topo, api.Options(), edge)
+    assert sorted(ring) == sorted(meshes.edge_between(topo, vert(1, c), vert(2, c)) for c in range(WIDTH))
+
+
+def test_torus_loops_and_rings_are_cyclic():
+    topo = meshes.torus(5, 7)
+    edge = meshes.edge_between(topo, 0, 1)
+    assert len(topology.full_loop_edge_manifold(topo, api.Options(), edge)) == 7
+    assert len(topology.full_ring_edge_manifold(topo, api.Options(), edge)) == 5
+
+
+def test_grid_vert_loop_is_ordered():
+    topo = meshes.grid(ROWS, COLS)
+    edge = meshes.edge_between(topo, vert(1, 2), vert(2, 2))
+    loop = topology.full_loop_vert_manifold(topo, api.Options(), vert(1, 2), edge)
+    assert loop in ([vert(r, 2) for r in range(ROWS + 1)], [vert(r, 2) for r in reversed(range(ROWS + 1))])
+
+
+def test_grid_face_loop_runs_along_a_row():
+    topo = meshes.grid(ROWS, COLS)
+    face = 1 * COLS + 2
+    edge = meshes.edge_between(topo, vert(1, 3), vert(2, 3))
+    assert sorted(topology.full_loop_face(topo, api.Options(), edge, face)) == list(range(COLS, 2 * COLS))
+
+
+def test_grid_boundary_loop_is_the_whole_border():
+    topo = meshes.grid(ROWS, COLS)
+    loop = topology.full_loop_edge_boundary(topo, api.Options(), meshes.edge_between(topo, vert(0, 0), vert(0, 1)))
+    assert sorted(loop) == np.flatnonzero(topo.edge_face_count == 1).tolist()
+
+
+def test_wire_circle_loop():
+    topo = meshes.wire_circle(6)
+    assert sorted(topology.full_loop_edge_wire(topo, api.Options(), 0)) == list(range(6))
+    assert sorted(topology.full_loop_vert_wire(topo, api.Options(), 0)) == list(range(6))
+
+
+def test_fin_edges_make_a_nonmanifold_loop():
+    topo = meshes.finned_grid(ROWS, COLS, 2)
+    edge = meshes.edge_between(topo, vert(2, 2), vert(2, 3))
+    assert topo.edge_face_count[edge] == 3
+    loop = topology.full_loop_edge_nonmanifold(topo, api.Options(), edge)
+    assert verts_of(topo, loop) == {vert(2, c) for c in range(WIDTH)}
+
+
+def test_loop_stops_at_poles():
+    segments = 8
+    topo = meshes.capped_cylinder(3, segments)
+    poles = {topo.vert_count - 2, topo.vert_count - 1}
+    edge = meshes.edge_between(topo, segments, 2 * segments)
+    loop_verts = verts_of(topo, topology.full_loop_edge_manifold(topo, api.Options(), edge))
+    assert poles <= loop_verts
+    assert loop_verts - poles == {r * segments for r in range(4)}
+
+
+def test_hidden_vert_cuts_the_loop_unless_ignored():
+    topo = meshes.grid(ROWS, COLS)
+    vert_hide = np.zeros(topo.vert_count, dtype=bool)
+    vert_hide[vert(3, 2)] = True
+    topo.update_hide(vert_hide, None, None)
+    edge = meshes.edge_between(topo, vert(0, 2), vert(1, 2))
+    cut = verts_of(topo, topology.full_loop_edge_manifold(topo, api.Options(), edge))
+    assert vert(4, 2) not in cut
+    whole = topology.full_loop_edge_manifold(topo, api.Options(ignore_hidden_geometry=True), edge)
+    assert verts_of(topo, whole) == {vert(r, 2) for r in range(ROWS + 1)}
+
+
+def test_bounded_loop_between_two_edges():
+    topo = meshes.grid(ROWS, COLS)
+    ends = [meshes.edge_between(topo, vert(1, c), vert(2, c)) for c in (1, 4)]
+    loops = topology.bounded_ring_edge_manifold(topo, api.Options(), ends[0], ends)
+    assert [sorted(loop) for loop in loops] == [sorted(meshes.edge_between(topo, vert(1, c), vert(2, c))
+                                                       for c in range(1, 5))]
+
+
+def test_bounded_face_loop_takes_the_short_way_round():
+    topo = meshes.torus(4, 10)
+    loops = topology.bounded_loop_face(topo, api.Options(), 0, [0, 3])
+    assert [sorted(loop) for loop in loops] == [[0, 1, 2, 3]]
+
+
+def test_walk_flags_follow_hiding():
+    topo = meshes.grid(ROWS, COLS)
+    assert not any(topo.walk_flags()[2][face] & topology.HIDDEN for face in range(topo.face_count))
+    face_hide = np.zeros(topo.face_count, dtype=bool)
+    face_hide[5] = True
+    topo.update_hide(None, None, face_hide)
+    assert topo.walk_flags()[2][5] & topology.HIDDEN
+
+
+# get_opposite_edge as the BMesh walkers ran it, on the index's loops, stepping from the given face of the edge:
+# BM_vert_step_fan_loop, BM_edge_other_loop and fan_loop_extension's retry from the radial loop.
+def bmesh_opposite_edge(topo, edge, vert, face):
+    if topo.vert_edge_count[vert] != 4:  # The callers only stepped through valence 4 verts.
+        return -1
+    step_loop = next(loop for loop in topo.face_loops_of(face)
+                     if vert in topo.edge_verts[topo.loop_edge[loop]] and topo.loop_edge[loop] != edge)
+    for loop in (step_loop, int(topo.loop_radial_next[step_loop])):
+        opposite = bmesh_step_fan_loop(topo, edge, loop, vert)
+        if opposite is not None:
+            return int(topo.loop_edge[opposite])
+    return -1
+
+
+def bmesh_step_fan_loop(topo, e_prev, loop, vert):
+    if topo.vert_loop_count[vert] != 4:
+        return None
+    if topo.loop_edge[loop] == e_prev:
+        e_next = topo.loop_edge[topo.loop_prev[loop]]
+    elif e_prev in (topo.loop_edge[topo.loop_prev[loop]], topo.loop_edge[topo.loop_next[loop]]):
+        e_next = topo.loop_edge[loop]
+    else:
+        return None
+    if topo.edge_face_count[e_next] != 2:
+        return None
+    l_other = loop if topo.loop_edge[loop] == e_next else topo.loop_prev[loop]
+    l_other = topo.loop_radial_next[l_other]
+    prev_verts = topo.edge_verts[e_prev]
+    if topo.loop_vert[l_other] == topo.loop_vert[loop]:
+        l_other = topo.loop_next[l_other]
+        if topo.loop_vert[l_other] not in prev_verts:
+            l_other = topo.loop_prev[topo.loop_prev[l_other]]
+    elif topo.loop_vert[topo.loop_next[l_other]] == topo.loop_vert[loop]:
+        l_other = topo.loop_prev[l_other] if topo.loop_vert[l_other] in prev_verts else topo.loop_next[l_other]
+    else:
+        return None
+    return l_other
+
+
+def test_fan_table_matches_the_bmesh_walker():
+    for topo in (meshes.torus(5, 7), meshes.grid(ROWS, COLS), meshes.capped_cylinder(3, 6),
+                 meshes.finned_grid(ROWS, COLS, 2), meshes.nonmanifold_fan()):
+        for edge in np.flatnonzero(topo.edge_face_count > 0).tolist():
+            faces = topo.loop_face[topo.edge_loops_of(edge)].tolist()
+            for vert in topo.edge_verts[edge].tolist():
+                steps = {bmesh_opposite_edge(topo, edge, vert, face) for face in faces}
+                # The walker's answer depended on which face it met first; with more than one there is none.
+                assert topo.opposite_edge(edge, vert) == (steps.pop() if len(steps) == 1 else -1)
+
+
+def test_fan_table_does_not_pick_a_face_of_a_nonmanifold_edge():
+    topo = meshes.nonmanifold_fan()
+    edge = meshes.edge_between(topo, 0, 1)
+    faces = topo.loop_face[topo.edge_loops_of(edge)].tolist()
+    assert [bmesh_opposite_edge(topo, edge, 0, face) for face in faces] == [
+        meshes.edge_between(topo, 0, 3), meshes.edge_between(topo, 0, 2), -1]
+    assert topo.opposite_edge(edge, 0) == -1